@@ -0,0 +1,203 @@
+"""
+Precomputed analytics rollups for /api/analytics/*
+AnalyticsRollup keeps complaint counts per category and per day and forward
+counts per department and SLA status. Every write endpoint updates them as
+it stores a record, and every SLA transition does the same, so a page view
+reads a few counters (O(buckets)) instead of scanning every complaint and
+forward.
+
+The counters are built from the repository's aggregate counts the first time
+they are read (or at startup). For the in-memory store this is one vectorized
+pass over the ComplaintStore columns plus a pandas group-by over the
+forwards. SQL backends use GROUP BY queries. Counters only see the writes of
+their own process, so deployments with several workers on one database
+rebuild them every ANALYTICS_REFRESH_SECONDS.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from storage import ComplaintStore, ForwardStore
+
+logger = logging.getLogger(__name__)
+
+SLA_STATUSES = ("On-Track", "At-Risk", "Breached")
+# sla_status values that a scheduled transition can still move on from
+OPEN_SLA_STATUSES = ("On-Track", "At-Risk")
+
+_EPOCH_DATE = date(1970, 1, 1)
+_DAY_MICROSECONDS = 86400 * 10 ** 6
+_NO_TIMESTAMP = np.iinfo(np.int64).min
+
+EMPTY_COUNTS = {"complaints_by_category": {}, "complaints_by_day": {}, "forwards": [], "open_forwards": []}
+
+
+def store_counts(complaints: ComplaintStore, forwards: ForwardStore) -> dict:
+    """Aggregate counts of the in-memory stores, in the shape AnalyticsRollup.load takes"""
+    codes, values = complaints.interned_column("category")
+    per_code = np.bincount(np.frombuffer(codes, dtype=np.dtype(codes.typecode)), minlength=len(values))
+    by_category = {values[code]: int(count) for code, count in enumerate(per_code)
+                   if count and values[code] is not None}
+
+    micros = np.frombuffer(complaints.timestamp_column("created_at"), dtype=np.int64)
+    days, per_day = np.unique(micros[micros != _NO_TIMESTAMP] // _DAY_MICROSECONDS, return_counts=True)
+    by_day = {_EPOCH_DATE + timedelta(days=int(day)): int(count) for day, count in zip(days, per_day)}
+
+    frame = pd.DataFrame.from_records(
+        [(record["forward_id"], record["recipient_department"], record["sla_status"])
+         for record in forwards.values()],
+        columns=["forward_id", "department", "sla_status"],
+    )
+    sizes = frame.groupby(["department", "sla_status"]).size()
+    open_frame = frame[frame["sla_status"].isin(OPEN_SLA_STATUSES)]
+    return {
+        "complaints_by_category": by_category,
+        "complaints_by_day": by_day,
+        "forwards": [(department, sla_status, int(count)) for (department, sla_status), count in sizes.items()],
+        "open_forwards": list(open_frame.itertuples(index=False, name=None)),
+    }
+
+
+def _rate(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+class AnalyticsRollup:
+    """Incrementally maintained complaint/forward counters"""
+
+    def __init__(self, refresh_seconds: float = 0.0):
+        self.refresh_seconds = refresh_seconds
+        self.built = False
+        self.rebuilds = 0
+        self._task: Optional[asyncio.Task] = None
+        self.load(EMPTY_COUNTS)
+
+    def load(self, counts: dict):
+        """Replace every counter with ``counts`` (see store_counts)"""
+        self.by_category = Counter(counts["complaints_by_category"])
+        self.by_day = Counter(counts["complaints_by_day"])
+        self.by_department: Dict[str, Counter] = {}
+        self.by_sla_status = Counter()
+        for department, sla_status, count in counts["forwards"]:
+            self.by_department.setdefault(department, Counter())[sla_status] += count
+            self.by_sla_status[sla_status] += count
+        # forward_id -> (department, sla_status) while a transition can still move it
+        self._open: Dict[str, Tuple[str, str]] = {
+            forward_id: (department, sla_status) for forward_id, department, sla_status in counts["open_forwards"]
+        }
+        self.complaints = sum(self.by_category.values())
+        self.forwards = sum(self.by_sla_status.values())
+
+    async def rebuild(self, repository):
+        self.load(await repository.rollup_counts())
+        self.built = True
+        self.rebuilds += 1
+
+    async def ensure_built(self, repository):
+        if not self.built:
+            await self.rebuild(repository)
+
+    # Incremental updates; until the first rebuild the store itself is the source
+    def add_complaint(self, record: dict):
+        if not self.built:
+            return
+        self.by_category[record["category"]] += 1
+        if record.get("created_at") is not None:
+            self.by_day[record["created_at"].date()] += 1
+        self.complaints += 1
+
+    def add_complaints(self, records: List[dict]):
+        for record in records:
+            self.add_complaint(record)
+
+    def add_forward(self, record: dict):
+        if not self.built:
+            return
+        department, sla_status = record["recipient_department"], record["sla_status"]
+        self.by_department.setdefault(department, Counter())[sla_status] += 1
+        self.by_sla_status[sla_status] += 1
+        self.forwards += 1
+        if sla_status in OPEN_SLA_STATUSES:
+            self._open[record["forward_id"]] = (department, sla_status)
+
+    def add_forwards(self, records: List[dict]):
+        for record in records:
+            self.add_forward(record)
+
+    def apply_sla_transitions(self, updates: List[Tuple[str, str]]):
+        """Move forwards between SLA status buckets; ``updates`` as SLAScheduler produces them"""
+        for forward_id, sla_status in updates:
+            entry = self._open.get(forward_id)
+            if entry is None or entry[1] == sla_status:
+                continue
+            department, previous = entry
+            by_status = self.by_department[department]
+            by_status[previous] -= 1
+            by_status[sla_status] += 1
+            self.by_sla_status[previous] -= 1
+            self.by_sla_status[sla_status] += 1
+            if sla_status in OPEN_SLA_STATUSES:
+                self._open[forward_id] = (department, sla_status)
+            else:
+                del self._open[forward_id]
+
+    # Reads
+    def summary(self) -> dict:
+        return {
+            "complaints": self.complaints,
+            "forwards": self.forwards,
+            "by_sla_status": {status: self.by_sla_status[status] for status in SLA_STATUSES},
+            "breach_rate": _rate(self.by_sla_status["Breached"], self.forwards),
+        }
+
+    def categories(self) -> List[dict]:
+        return [{"category": category, "complaints": count}
+                for category, count in self.by_category.most_common() if count]
+
+    def daily(self, start: date, end: date) -> List[dict]:
+        """Complaints per day from ``start`` to ``end`` inclusive, zero-filled"""
+        return [{"day": day, "complaints": self.by_day.get(day, 0)}
+                for day in (start + timedelta(days=offset) for offset in range((end - start).days + 1))]
+
+    def departments(self) -> List[dict]:
+        rows = []
+        for department, by_status in self.by_department.items():
+            forwards = sum(by_status.values())
+            if not forwards:
+                continue
+            rows.append({
+                "department": department,
+                "forwards": forwards,
+                "by_sla_status": {status: by_status[status] for status in SLA_STATUSES},
+                "breach_rate": _rate(by_status["Breached"], forwards),
+            })
+        rows.sort(key=lambda row: (-row["forwards"], row["department"]))
+        return rows
+
+    # Periodic rebuilds, for several workers sharing one database
+    async def _run(self, repository):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.rebuild(repository)
+            except Exception:
+                logger.exception("Analytics rollup rebuild failed")
+
+    def start(self, repository):
+        if self.refresh_seconds > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run(repository))
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
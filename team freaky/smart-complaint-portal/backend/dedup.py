@@ -0,0 +1,370 @@
+"""
+Duplicate / recurrence detection for complaints
+Each description is embedded once and added to an incrementally updated FAISS
+HNSW index (inner product on L2-normalised vectors, i.e. cosine similarity).
+A new complaint whose nearest neighbour is above the similarity threshold
+joins that neighbour's cluster, or opens a new cluster with it.
+
+Embeddings come from sentence-transformers when DEDUP_EMBEDDING_MODEL is set,
+otherwise from HashingEmbedder: hashed term frequencies that need no model
+download. Both are stateless, so a description gets the same vector whenever
+(and in whichever worker) it is embedded and stored vectors stay comparable
+with new queries.
+
+Complaints with a location are only compared against earlier complaints
+within a radius and time window (see geo_index.GeoGridIndex), and cluster
+centroids are maintained incrementally from member locations.
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+import uuid
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from geo_index import METERS_PER_DEGREE, GeoGridIndex, location_coordinates
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - faiss-cpu is in requirements.txt
+    faiss = None
+
+
+class HashingEmbedder:
+    """Hashed term-frequency embeddings (sublinear tf, stop words dropped, L2-normalised)
+
+    No document frequencies are learned: IDF weights that moved as complaints
+    arrived would leave indexed vectors and new queries on different scales,
+    so the similarity threshold would mean something different over time.
+    """
+
+    def __init__(self, dim: int = 512):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.dim = dim
+        self.vectorizer = HashingVectorizer(
+            n_features=dim, alternate_sign=False, norm=None, stop_words="english"
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        counts = self.vectorizer.transform(texts).tocsr()
+        counts.data = 1.0 + np.log(counts.data)  # sublinear tf
+        dense = counts.toarray().astype(np.float32)
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        return dense / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    """Embeddings from a sentence-transformers model (downloaded on first use)"""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+class _NumpyIndex:
+    """Exact inner-product search, used only when faiss is not installed"""
+
+    def __init__(self, dim: int):
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+
+    @property
+    def ntotal(self) -> int:
+        return self._vectors.shape[0]
+
+    def add(self, vectors: np.ndarray):
+        self._vectors = np.vstack([self._vectors, vectors])
+
+    def search(self, vectors: np.ndarray, k: int):
+        scores = vectors @ self._vectors.T
+        order = np.argsort(-scores, axis=1)[:, :k]
+        return np.take_along_axis(scores, order, axis=1), order
+
+
+def build_index(dim: int, hnsw_m: int = 32, ef_search: int = 64):
+    if faiss is None:
+        return _NumpyIndex(dim)
+    index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efSearch = ef_search
+    return index
+
+
+def cluster_severity(complaint_count: int) -> str:
+    if complaint_count >= 20:
+        return "High"
+    if complaint_count >= 5:
+        return "Medium"
+    return "Low"
+
+
+def text_key(text: str) -> int:
+    """Identity of a description up to case and whitespace; a 64-bit digest rather
+    than hash(), which is salted per process"""
+    normalised = " ".join(text.lower().split())
+    return int.from_bytes(hashlib.blake2b(normalised.encode(), digest_size=8).digest(), "big")
+
+
+class DuplicateDetector:
+    """Nearest-neighbour duplicate search plus cluster assignment
+
+    With ``radius_m`` set, complaints that carry a location are only compared
+    with earlier complaints inside that radius (and ``window_seconds``, if
+    given), found through a GeoGridIndex, instead of the whole corpus.
+    Complaints without a location fall back to the global FAISS search.
+
+    Complaints are rows; the FAISS index only holds one vector (label) per
+    distinct description. Repeated identical vectors make HNSW construction
+    very slow and hurt its recall, and identical text needs no new embedding.
+    """
+
+    def __init__(self, embedder, threshold: float = 0.85, radius_m: Optional[float] = None,
+                 window_seconds: Optional[float] = None):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.index = build_index(embedder.dim)
+        self.radius_m = radius_m
+        self.window_seconds = window_seconds
+        # Cells roughly one radius wide keep a query to about 3x3 cells
+        self.geo = GeoGridIndex(cell_degrees=radius_m / METERS_PER_DEGREE) if radius_m else None
+        self.complaint_ids: List[str] = []           # row -> complaint_id
+        self.row_clusters: List[Optional[str]] = []  # row -> cluster_id
+        self.row_labels = array("q")                 # row -> index label of its description
+        self.row_lats = array("d")                   # row -> lat (nan if unknown)
+        self.row_lons = array("d")
+        self.label_rows = array("q")                 # index label -> first row with that description
+        self._labels: Dict[int, int] = {}            # text_key -> index label
+        self.cluster_sizes = Counter()
+        self._centroid_sums: Dict[str, List[float]] = {}  # cluster -> [sum_lat, sum_lon, located]
+        # FAISS indexes are not safe for concurrent add/search; one thread owns it
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dedup")
+
+    def __len__(self) -> int:
+        return len(self.complaint_ids)
+
+    def _label_vectors(self, labels) -> np.ndarray:
+        if isinstance(self.index, _NumpyIndex):
+            return self.index._vectors[labels]
+        # View over the HNSW index's flat storage; re-read because add() may reallocate it
+        storage = faiss.downcast_index(self.index.storage)
+        stored = faiss.rev_swig_ptr(storage.get_xb(), self.index.ntotal * self.embedder.dim)
+        return stored.reshape(-1, self.embedder.dim)[labels]
+
+    def _row_vectors(self, rows: np.ndarray) -> np.ndarray:
+        return self._label_vectors(np.frombuffer(self.row_labels, dtype=np.int64)[rows])
+
+    def _vectors(self, texts: List[str]) -> Tuple[np.ndarray, List[int], List[int]]:
+        """Vectors for ``texts``, their text keys, and the positions whose description is new
+
+        Only the first occurrence of each unseen description is embedded.
+        """
+        keys = [text_key(text) for text in texts]
+        first: Dict[int, int] = {}
+        for i, key in enumerate(keys):
+            if key not in self._labels and key not in first:
+                first[key] = i
+        new = list(first.values())
+        vectors = np.empty((len(texts), self.embedder.dim), dtype=np.float32)
+        if new:
+            embedded = self.embedder.embed([texts[i] for i in new])
+            for n, i in enumerate(new):
+                vectors[i] = embedded[n]
+        known = [i for i, key in enumerate(keys) if key in self._labels]
+        if known:
+            vectors[known] = self._label_vectors([self._labels[keys[i]] for i in known])
+        for i, key in enumerate(keys):
+            if key in first and first[key] != i:
+                vectors[i] = vectors[first[key]]
+        return vectors, keys, new
+
+    def _add_vectors(self, vectors: np.ndarray, keys: List[int], new: List[int], first_row: int):
+        """Index the new descriptions; ``first_row`` is the row of position 0"""
+        if not new:
+            return
+        self.index.add(vectors[new])
+        for i in new:
+            self._labels[keys[i]] = len(self.label_rows)
+            self.label_rows.append(first_row + i)
+
+    def _nearest(self, vector: np.ndarray, point: Optional[Tuple[float, float]],
+                 timestamp: Optional[float]) -> Tuple[float, int]:
+        """(similarity, row) of the closest earlier complaint, or (0.0, -1)"""
+        if not self.index.ntotal:
+            return 0.0, -1
+        if self.geo is not None and point is not None:
+            since = None
+            if self.window_seconds is not None and timestamp is not None:
+                since = timestamp - self.window_seconds
+            rows, _ = self.geo.query(point[0], point[1], self.radius_m, since=since)
+            if not len(rows):
+                return 0.0, -1
+            scores = self._row_vectors(rows) @ vector[0]
+            best = int(np.argmax(scores))
+            return float(scores[best]), int(rows[best])
+        scores, labels = self.index.search(vector, 1)
+        return self._indexed_match(scores[0][0], labels[0][0])
+
+    def _indexed_match(self, score: float, label: int) -> Tuple[float, int]:
+        if label < 0:
+            return 0.0, -1
+        return float(score), self.label_rows[label]
+
+    def _add_to_centroid(self, cluster_id: str, row: int):
+        lat, lon = self.row_lats[row], self.row_lons[row]
+        sums = self._centroid_sums.setdefault(cluster_id, [0.0, 0.0, 0])
+        if not math.isnan(lat):
+            sums[0] += lat
+            sums[1] += lon
+            sums[2] += 1
+
+    def centroid(self, cluster_id: str) -> Optional[dict]:
+        sums = self._centroid_sums.get(cluster_id)
+        if not sums or not sums[2]:
+            return None
+        return {"lat": sums[0] / sums[2], "lon": sums[1] / sums[2]}
+
+    def _append(self, complaint_id: str, key: int, point: Optional[Tuple[float, float]],
+                timestamp: Optional[float], cluster_id: Optional[str]) -> int:
+        row = len(self.complaint_ids)
+        self.complaint_ids.append(complaint_id)
+        self.row_clusters.append(cluster_id)
+        self.row_labels.append(self._labels[key])
+        self.row_lats.append(point[0] if point else math.nan)
+        self.row_lons.append(point[1] if point else math.nan)
+        if self.geo is not None and point is not None:
+            self.geo.add(row, point[0], point[1], timestamp if timestamp is not None else time.time())
+        return row
+
+    def _match(self, similarity: float, neighbour_row: int) -> dict:
+        """Cluster assignment for a complaint whose nearest earlier complaint is ``neighbour_row``"""
+        result = {
+            "similarity": max(0.0, min(1.0, similarity)),
+            "neighbour_id": None,
+            "cluster_id": None,
+            "cluster_size": 0,
+            "centroid": None,
+            "new_cluster": False,
+        }
+        if neighbour_row >= 0 and similarity >= self.threshold:
+            cluster_id = self.row_clusters[neighbour_row]
+            if cluster_id is None:
+                cluster_id = str(uuid.uuid4())
+                self.row_clusters[neighbour_row] = cluster_id
+                self.cluster_sizes[cluster_id] = 1
+                self._add_to_centroid(cluster_id, neighbour_row)
+                result["new_cluster"] = True
+            self.cluster_sizes[cluster_id] += 1
+            result.update(neighbour_id=self.complaint_ids[neighbour_row], cluster_id=cluster_id)
+        return result
+
+    def _record(self, result: dict, complaint_id: str, key: int, point: Optional[Tuple[float, float]],
+                timestamp: Optional[float]):
+        cluster_id = result["cluster_id"]
+        row = self._append(complaint_id, key, point, timestamp, cluster_id)
+        if cluster_id is not None:
+            self._add_to_centroid(cluster_id, row)
+            result.update(cluster_size=self.cluster_sizes[cluster_id], centroid=self.centroid(cluster_id))
+
+    def assign_sync(self, complaint_id: str, text: str, location: Optional[dict] = None,
+                    timestamp: Optional[float] = None) -> dict:
+        """Find the nearest earlier complaint, assign a cluster and index this one"""
+        vectors, keys, new = self._vectors([text])
+        point = location_coordinates(location)
+        result = self._match(*self._nearest(vectors, point, timestamp))
+        self._add_vectors(vectors, keys, new, len(self))
+        self._record(result, complaint_id, keys[0], point, timestamp)
+        return result
+
+    def assign_batch_sync(self, complaint_ids: List[str], texts: List[str],
+                          locations: Optional[List[Optional[dict]]] = None,
+                          timestamps: Optional[List[Optional[float]]] = None) -> List[dict]:
+        """assign_sync for many complaints: one embedding pass, one index search and one index add
+
+        As with one-by-one assignment in order, each complaint is compared
+        with the existing index and with the earlier complaints of the batch.
+        """
+        count = len(complaint_ids)
+        if not count:
+            return []
+        locations = locations or [None] * count
+        timestamps = timestamps or [None] * count
+        vectors, keys, new = self._vectors(texts)
+        points = [location_coordinates(location) for location in locations]
+
+        base = len(self)
+        unlocated = [i for i, point in enumerate(points) if self.geo is None or point is None]
+        indexed = {}
+        if unlocated and self.index.ntotal:
+            scores, labels = self.index.search(vectors[unlocated], 1)
+            indexed = {i: self._indexed_match(scores[n][0], labels[n][0]) for n, i in enumerate(unlocated)}
+        # Geo lookups read candidate vectors from the index, and the grid only
+        # ever holds rows already recorded, i.e. earlier complaints
+        self._add_vectors(vectors, keys, new, base)
+
+        results = []
+        for i in range(count):
+            if self.geo is not None and points[i] is not None:
+                similarity, neighbour_row = self._nearest(vectors[i:i + 1], points[i], timestamps[i])
+            else:
+                similarity, neighbour_row = indexed.get(i, (0.0, -1))
+                if i:
+                    batch_scores = vectors[:i] @ vectors[i]
+                    best = int(np.argmax(batch_scores))
+                    if neighbour_row < 0 or batch_scores[best] > similarity:
+                        similarity, neighbour_row = float(batch_scores[best]), base + best
+            result = self._match(similarity, neighbour_row)
+            self._record(result, complaint_ids[i], keys[i], points[i], timestamps[i])
+            results.append(result)
+        return results
+
+    def add_bulk(self, complaint_ids: List[str], texts: List[str], cluster_ids: Optional[List[Optional[str]]] = None,
+                 locations: Optional[List[Optional[dict]]] = None, timestamps: Optional[List[Optional[float]]] = None):
+        """Index already-clustered complaints in one pass (warm-up, bulk loads)"""
+        count = len(complaint_ids)
+        cluster_ids = cluster_ids or [None] * count
+        locations = locations or [None] * count
+        timestamps = timestamps or [None] * count
+        vectors, keys, new = self._vectors(texts)
+        self._add_vectors(vectors, keys, new, len(self))
+        for complaint_id, key, cluster_id, location, timestamp in zip(complaint_ids, keys, cluster_ids,
+                                                                      locations, timestamps):
+            row = self._append(complaint_id, key, location_coordinates(location), timestamp, cluster_id)
+            if cluster_id is not None:
+                self.cluster_sizes[cluster_id] += 1
+                self._add_to_centroid(cluster_id, row)
+
+    async def add_existing(self, complaint_ids: List[str], texts: List[str],
+                           cluster_ids: Optional[List[Optional[str]]] = None,
+                           locations: Optional[List[Optional[dict]]] = None,
+                           timestamps: Optional[List[Optional[float]]] = None):
+        """add_bulk on the detector thread, for complaints stored before this process started"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.add_bulk, complaint_ids, texts, cluster_ids,
+                                   locations, timestamps)
+
+    async def assign(self, complaint_id: str, text: str, location: Optional[dict] = None,
+                     timestamp: Optional[float] = None) -> dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.assign_sync, complaint_id, text, location, timestamp)
+
+    async def assign_batch(self, complaint_ids: List[str], texts: List[str],
+                           locations: Optional[List[Optional[dict]]] = None,
+                           timestamps: Optional[List[Optional[float]]] = None) -> List[dict]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.assign_batch_sync, complaint_ids, texts,
+                                          locations, timestamps)
+
+
+def create_detector(model_name: Optional[str] = None, dim: int = 512, threshold: float = 0.85,
+                    radius_m: Optional[float] = None, window_seconds: Optional[float] = None) -> DuplicateDetector:
+    """Use sentence-transformers when a model name is configured, hashed term frequencies otherwise"""
+    embedder = SentenceTransformerEmbedder(model_name) if model_name else HashingEmbedder(dim)
+    return DuplicateDetector(embedder, threshold=threshold, radius_m=radius_m, window_seconds=window_seconds)
@@ -0,0 +1,161 @@
+"""
+Streaming CSV/Parquet exports for /api/admin/exports/*
+An export is an async iterator of record chunks (the repository's
+export_complaints/export_forwards keyset walks). Each chunk is encoded and
+handed to the response as soon as it arrives, so the server holds about one
+chunk of records and its encoded bytes however many rows the export has:
+  - CSV: the header, then one block of lines per chunk
+  - Parquet: one row group per chunk, written through a sink that is drained
+    after every row group, then the footer
+gzip_stream compresses either one on the fly. Chunks are encoded on a
+worker thread, so other requests keep being served while a large export runs.
+
+pyarrow is only needed for Parquet.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Callable, List, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is in requirements.txt
+    pa = pq = None
+
+# (column, type) pairs; types are "string", "float64", "int64", "bool" or "timestamp"
+COMPLAINT_EXPORT_COLUMNS = (
+    ("complaint_id", "string"), ("title", "string"), ("description", "string"), ("category", "string"),
+    ("location_lat", "float64"), ("location_lon", "float64"), ("attachments", "string"),
+    ("language_tag", "string"), ("spam_score", "float64"), ("predicted_class", "string"),
+    ("ml_confidence_score", "float64"), ("recurrence_flag", "bool"), ("cluster_id", "string"),
+    ("duplicate_similarity_score", "float64"), ("created_at", "timestamp"), ("updated_at", "timestamp"),
+    ("submitted_by", "string"),
+)
+
+# Everything a report needs; undo tokens are left out
+FORWARD_EXPORT_COLUMNS = (
+    ("forward_id", "string"), ("complaint_id", "string"), ("recipient_department", "string"),
+    ("recipient_officer_id", "string"), ("recipient_officer_name", "string"), ("remarks", "string"),
+    ("follow_up_date", "timestamp"), ("priority_level", "string"), ("status", "string"),
+    ("sla_deadline", "timestamp"), ("sla_status", "string"), ("recurrence_flag", "bool"),
+    ("previous_occurrences_count", "int64"), ("cluster_id", "string"), ("duplicate_similarity_score", "float64"),
+    ("ml_confidence_score", "float64"), ("forwarded_by", "string"), ("created_at", "timestamp"),
+    ("updated_at", "timestamp"),
+)
+
+FORWARD_EXPORT_FIELDS = tuple(name for name, _ in FORWARD_EXPORT_COLUMNS)
+
+Columns = Tuple[Tuple[str, str], ...]
+Values = Callable[[dict], tuple]
+
+
+def complaint_values(record: dict) -> tuple:
+    """A complaint record as a COMPLAINT_EXPORT_COLUMNS row"""
+    location = record.get("location") or {}
+    attachments = record.get("attachments")
+    return (
+        record["complaint_id"], record.get("title"), record.get("description"), record.get("category"),
+        location.get("lat"), location.get("lon"), json.dumps(attachments) if attachments else None,
+        record.get("language_tag"), record.get("spam_score"), record.get("predicted_class"),
+        record.get("ml_confidence_score"), record.get("recurrence_flag"), record.get("cluster_id"),
+        record.get("duplicate_similarity_score"), record.get("created_at"), record.get("updated_at"),
+        record.get("submitted_by"),
+    )
+
+
+def forward_values(record: dict) -> tuple:
+    """A forward record as a FORWARD_EXPORT_COLUMNS row"""
+    return tuple(record.get(field) for field in FORWARD_EXPORT_FIELDS)
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+async def csv_stream(chunks: AsyncIterator[List[dict]], columns: Columns, values: Values) -> AsyncIterator[bytes]:
+    """UTF-8 CSV: the header line, then the lines of each chunk as one block"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    timestamps = [i for i, (_, kind) in enumerate(columns) if kind == "timestamp"]
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    def encode(records: List[dict]) -> bytes:
+        for record in records:
+            row = list(values(record))
+            for i in timestamps:
+                if row[i] is not None:
+                    row[i] = row[i].isoformat()
+            writer.writerow(row)
+        return drain()
+
+    writer.writerow([name for name, _ in columns])
+    yield drain()
+    async for records in chunks:
+        yield await asyncio.to_thread(encode, records)
+
+
+class _ParquetSink:
+    """Write-only file object that hands back what was written since the last drain"""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _arrow_schema(columns: Columns):
+    types = {"string": pa.string(), "float64": pa.float64(), "int64": pa.int64(), "bool": pa.bool_(),
+             "timestamp": pa.timestamp("us")}
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+async def parquet_stream(chunks: AsyncIterator[List[dict]], columns: Columns, values: Values) -> AsyncIterator[bytes]:
+    """A Parquet file with one row group per chunk"""
+    schema = _arrow_schema(columns)
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def encode(records: List[dict]) -> bytes:
+        rows = [values(record) for record in records]
+        arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*rows), schema)]
+        writer.write_batch(pa.record_batch(arrays, schema=schema))
+        return sink.drain()
+
+    async for records in chunks:
+        yield await asyncio.to_thread(encode, records)
+    writer.close()
+    yield sink.drain()
+
+
+async def gzip_stream(stream: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """``stream`` compressed into one gzip member as it is produced"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
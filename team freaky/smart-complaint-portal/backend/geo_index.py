@@ -0,0 +1,135 @@
+"""
+Spatial index over complaint locations
+Points are bucketed into a uniform lat/lon grid; a radius query only visits
+the cells overlapping the query circle and filters them with a vectorised
+haversine distance and an optional time window. Cell size should be close to
+the typical query radius so a query touches a handful of cells. Near the
+poles the longitude span of a query is capped at the whole row of cells, and
+spans crossing the antimeridian wrap around to the other side.
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = 111320.0
+
+
+def location_coordinates(location) -> Optional[Tuple[float, float]]:
+    """(lat, lon) from a complaint location dict, or None if it has no usable point"""
+    if not location:
+        return None
+    try:
+        lat, lon = float(location["lat"]), float(location["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        return None
+    return lat, lon
+
+
+def haversine_m(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class _Cell:
+    """Points of one grid cell in parallel typed arrays"""
+
+    __slots__ = ("keys", "lats", "lons", "times")
+
+    def __init__(self):
+        self.keys = array("q")
+        self.lats = array("d")
+        self.lons = array("d")
+        self.times = array("d")
+
+
+class GeoGridIndex:
+    """Integer-keyed points bucketed by a lat/lon grid, with radius + time queries"""
+
+    def __init__(self, cell_degrees: float = 0.005):
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Tuple[int, int], _Cell] = {}
+        # grid row -> columns with a cell, for queries spanning more columns than exist
+        self._row_columns: Dict[int, List[int]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def add(self, key: int, lat: float, lon: float, timestamp: float = 0.0):
+        i, j = self._cell_of(lat, lon)
+        cell = self._cells.get((i, j))
+        if cell is None:
+            cell = self._cells[i, j] = _Cell()
+            self._row_columns.setdefault(i, []).append(j)
+        cell.keys.append(key)
+        cell.lats.append(lat)
+        cell.lons.append(lon)
+        cell.times.append(timestamp)
+        self._size += 1
+
+    def _column_ranges(self, west: float, east: float) -> List[Tuple[int, int]]:
+        """Grid column ranges covering longitudes west..east, split at the antimeridian"""
+        if east - west >= 360.0:
+            spans = [(-180.0, 180.0)]
+        elif west < -180.0:
+            spans = [(west + 360.0, 180.0), (-180.0, east)]
+        elif east > 180.0:
+            spans = [(west, 180.0), (-180.0, east - 360.0)]
+        else:
+            spans = [(west, east)]
+        return [(math.floor(w / self.cell_degrees), math.floor(e / self.cell_degrees)) for w, e in spans]
+
+    def query(self, lat: float, lon: float, radius_m: float,
+              since: Optional[float] = None, until: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Keys and distances (metres) of points within ``radius_m``, optionally inside [since, until]"""
+        dlat = radius_m / METERS_PER_DEGREE
+        dlon = min(radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)), 180.0)
+        i0 = math.floor((lat - dlat) / self.cell_degrees)
+        i1 = math.floor((lat + dlat) / self.cell_degrees)
+
+        parts = []
+        for j0, j1 in self._column_ranges(lon - dlon, lon + dlon):
+            for i in range(i0, i1 + 1):
+                columns = self._row_columns.get(i)
+                if not columns:
+                    continue
+                if j1 - j0 + 1 > len(columns):
+                    # Wider than the row's occupied cells (near a pole): visit those instead
+                    parts.extend(self._cells[i, j] for j in columns if j0 <= j <= j1)
+                    continue
+                for j in range(j0, j1 + 1):
+                    cell = self._cells.get((i, j))
+                    if cell is not None:
+                        parts.append(cell)
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        lats = np.concatenate([np.frombuffer(c.lats) for c in parts])
+        lons = np.concatenate([np.frombuffer(c.lons) for c in parts])
+        # Equirectangular pre-filter (exact enough at complaint radii), then
+        # haversine only for the survivors
+        scale = math.cos(math.radians(lat))
+        dy = lats - lat
+        dx = ((lons - lon + 180.0) % 360.0 - 180.0) * scale
+        mask = dx * dx + dy * dy <= (dlat * 1.01) ** 2
+        if since is not None or until is not None:
+            times = np.concatenate([np.frombuffer(c.times) for c in parts])
+            if since is not None:
+                mask &= times >= since
+            if until is not None:
+                mask &= times <= until
+        keys = np.concatenate([np.frombuffer(c.keys, dtype=np.int64) for c in parts])[mask]
+        distances = haversine_m(lat, lon, lats[mask], lons[mask])
+        inside = distances <= radius_m
+        return keys[inside], distances[inside]
@@ -0,0 +1,155 @@
+"""
+Liveness and readiness probes
+Readiness pings every configured dependency (the complaint database, Redis,
+MongoDB) in parallel, each under its own timeout, and reports per-dependency
+status and latency. Reports are cached for ``ttl`` seconds and concurrent
+callers share one in-flight check, so load balancers polling every second do
+not turn into a probe per request against each backend.
+
+Redis and MongoDB are pinged over their wire protocols directly (RESP PING,
+OP_MSG ping) so a probe never borrows a connection pool the app is using.
+"""
+
+import asyncio
+import struct
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import bson
+
+Probe = Callable[[], Awaitable[None]]
+
+OP_MSG = 2013
+
+
+class ProbeError(RuntimeError):
+    pass
+
+
+def _host_port(netloc: str, default_port: int) -> Tuple[str, int]:
+    host = netloc.rsplit("@", 1)[-1].split(",")[0]  # first seed of a replica set URI
+    if host.startswith("["):
+        address, _, port = host[1:].partition("]")
+        port = port.lstrip(":")
+    else:
+        address, _, port = host.partition(":")
+    return address or "localhost", int(port) if port else default_port
+
+
+async def _read_resp_line(reader: asyncio.StreamReader) -> bytes:
+    line = await reader.readline()
+    if not line:
+        raise ProbeError("connection closed")
+    return line.rstrip(b"\r\n")
+
+
+def redis_probe(url: str) -> Probe:
+    """PING over RESP (AUTH first when the URL carries a password)"""
+    parts = urlsplit(url)
+    host, port = _host_port(parts.netloc, 6379)
+    password = unquote(parts.password) if parts.password else None
+    username = unquote(parts.username) if parts.username else None
+    ssl = parts.scheme == "rediss"
+
+    def command(*args: str) -> bytes:
+        encoded = [arg.encode() for arg in args]
+        return b"*%d\r\n" % len(encoded) + b"".join(b"$%d\r\n%s\r\n" % (len(arg), arg) for arg in encoded)
+
+    async def probe():
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl or None)
+        try:
+            if password:
+                writer.write(command("AUTH", username, password) if username else command("AUTH", password))
+                reply = await _read_resp_line(reader)
+                if not reply.startswith(b"+"):
+                    raise ProbeError(reply.decode(errors="replace"))
+            writer.write(command("PING"))
+            reply = await _read_resp_line(reader)
+            if reply != b"+PONG":
+                raise ProbeError(f"unexpected reply {reply.decode(errors='replace')!r}")
+        finally:
+            writer.close()
+    return probe
+
+
+def mongo_probe(uri: str) -> Probe:
+    """``{ping: 1}`` against the admin database as a single OP_MSG"""
+    parts = urlsplit(uri)
+    if parts.scheme != "mongodb":
+        raise ValueError(f"Unsupported MongoDB URI scheme for probing: {parts.scheme}")
+    host, port = _host_port(parts.netloc, 27017)
+    ssl = "tls=true" in parts.query.lower() or "ssl=true" in parts.query.lower()
+
+    async def probe():
+        body = struct.pack("<iB", 0, 0) + bson.encode({"ping": 1, "$db": "admin"})
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl or None)
+        try:
+            writer.write(struct.pack("<iiii", 16 + len(body), 1, 0, OP_MSG) + body)
+            length, _, _, opcode = struct.unpack("<iiii", await reader.readexactly(16))
+            payload = await reader.readexactly(length - 16)
+        finally:
+            writer.close()
+        if opcode != OP_MSG or payload[4] != 0:
+            raise ProbeError(f"unexpected reply opcode {opcode}")
+        reply = bson.decode(payload[5:])
+        if reply.get("ok") != 1:
+            raise ProbeError(reply.get("errmsg", "ping failed"))
+    return probe
+
+
+class HealthChecker:
+    """Runs named probes in parallel with a timeout and caches the report"""
+
+    def __init__(self, probes: Optional[Dict[str, Probe]] = None, timeout: float = 2.0, ttl: float = 5.0):
+        self.probes: Dict[str, Probe] = dict(probes or {})
+        self.timeout = timeout
+        self.ttl = ttl
+        self._report: Optional[dict] = None
+        self._checked_at = 0.0
+        self._inflight: Optional[asyncio.Future] = None
+
+    def add(self, name: str, probe: Probe):
+        self.probes[name] = probe
+        self._report = None
+
+    async def _run_probe(self, probe: Probe) -> dict:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), self.timeout)
+            result = {"status": "up"}
+        except asyncio.TimeoutError:
+            result = {"status": "down", "error": f"timed out after {self.timeout:g}s"}
+        except Exception as exc:
+            result = {"status": "down", "error": str(exc) or type(exc).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return result
+
+    async def _check(self) -> dict:
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._run_probe(self.probes[name]) for name in names))
+        dependencies = dict(zip(names, results))
+        return {
+            "status": "ready" if all(r["status"] == "up" for r in results) else "not_ready",
+            "checked_at": datetime.now().isoformat(),
+            "dependencies": dependencies,
+        }
+
+    async def check(self) -> dict:
+        """Cached readiness report; ``cached`` tells whether the probes ran for this call"""
+        if self._report is not None and time.monotonic() - self._checked_at < self.ttl:
+            return {**self._report, "cached": True}
+        started = self._inflight is None
+        if started:
+            self._inflight = asyncio.ensure_future(self._check())
+            self._inflight.add_done_callback(self._store)
+        # Shielded: a caller that disconnects must not cancel the check others wait on
+        report = await asyncio.shield(self._inflight)
+        return {**report, "cached": not started}
+
+    def _store(self, future: asyncio.Future):
+        self._inflight = None
+        if not future.cancelled() and future.exception() is None:
+            self._report = future.result()
+            self._checked_at = time.monotonic()
@@ -0,0 +1,63 @@
+"""
+Helpers for streaming NDJSON ingestion
+The request body is split into lines as it arrives, so memory stays bounded by
+one chunk of records no matter how large the upload is. Progress is streamed
+back as NDJSON while the body is still being read.
+"""
+
+from typing import AsyncIterator, Tuple
+
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+
+
+class LineTooLong(ValueError):
+    pass
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = 1 << 20) -> AsyncIterator[Tuple[int, bytes]]:
+    """(line number, line) for every non-blank line of a chunked byte stream"""
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        if len(buffer) > max_line_bytes:
+            raise LineTooLong(f"line {number + len(lines) + 1} exceeds {max_line_bytes} bytes")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+    if buffer.strip():
+        yield number + 1, buffer
+
+
+def validation_message(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """StreamingResponse for endpoints that read the request body while streaming
+
+    StreamingResponse normally listens on ``receive`` for a disconnect, which
+    would swallow the request body messages the endpoint is still consuming;
+    a client disconnect surfaces as ClientDisconnect from request.stream() instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def chunk_summary(lines: int, committed: int, failed: int, elapsed: float) -> dict:
+    return {
+        "lines": lines,
+        "committed": committed,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "records_per_minute": round(committed / elapsed * 60) if elapsed > 0 else 0,
+    }
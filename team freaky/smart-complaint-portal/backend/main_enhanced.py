@@ -1,11 +1,34 @@
-from fastapi import FastAPI, Depends, HTTPException, Header, Body
+from fastapi import FastAPI, Depends, HTTPException, Header, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Tuple
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
 import os
+import asyncio
+import secrets
+import time
+
+from analytics import AnalyticsRollup
+from batching import MicroBatcher
+from dedup import cluster_severity, create_detector
+from exports import (COMPLAINT_EXPORT_COLUMNS, FORWARD_EXPORT_COLUMNS, complaint_values, csv_stream,
+                     forward_values, gzip_stream, parquet_available, parquet_stream)
+from health import HealthChecker, mongo_probe, redis_probe
+from ingest import LineTooLong, NDJSONStreamingResponse, chunk_summary, iter_lines, validation_message
+from metrics import CONTENT_TYPE, LoopLagMonitor, MetricsMiddleware, Registry
+from model_registry import ModelRegistry
+from model_server import CategoryModelServer, ModelWatcher, SpamModelServer
+from pagination import InvalidCursor, clamp_limit, decode_cursor, encode_cursor
+from passwords import PasswordHasher, PasswordHasherBusy
+from repository import complaint_filters, create_repository, forward_filters
+from responses import RecordResponse
+from sessions import InvalidSession, SessionManager, VerifiedTokenCache
+from sla import SLAScheduler, calculate_sla_deadline, calculate_sla_deadlines, get_sla_status, get_sla_statuses
+from storage import ComplaintStore, ForwardStore
+from users import UserExists, create_user_repository, user_filters
 
 app = FastAPI(title="Smart Complaint Portal API", version="1.0.0")
 
@@ -18,11 +41,143 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mock database storage
-COMPLAINTS_DB = {}
-FORWARDS_DB = {}
+# Prometheus metrics served at /metrics
+METRICS = Registry()
+app.add_middleware(MetricsMiddleware, registry=METRICS)
+
+# In-memory storage, used when DATABASE_URL is not set
+COMPLAINTS_DB = ComplaintStore()  # columnar; reads return lazy ComplaintRow views
+FORWARDS_DB = ForwardStore()  # indexed by complaint_id, cluster_id and sla_status
 CLUSTERS_DB = {}
 
+# DATABASE_URL selects the backend: sqlite:///path.db or postgresql://...
+REPOSITORY = create_repository(
+    os.getenv("DATABASE_URL"),
+    pool_size=int(os.getenv("DATABASE_POOL_SIZE", "4")),
+    complaints=COMPLAINTS_DB,
+    forwards=FORWARDS_DB,
+    clusters=CLUSTERS_DB,
+)
+
+# User accounts: MongoDB when MONGO_URI is set, otherwise in-memory
+USERS = create_user_repository(
+    os.getenv("MONGO_URI"),
+    pool_size=int(os.getenv("MONGO_POOL_SIZE", "10")),
+)
+
+# bcrypt off the event loop; outdated cost factors are re-hashed at login
+PASSWORDS = PasswordHasher(
+    rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None,
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "0")) or None,
+)
+
+# Signed session tokens, persisted in the sessions table. Without JWT_SECRET
+# tokens are only valid in this process until it restarts.
+SESSIONS = SessionManager(
+    REPOSITORY,
+    secret=os.getenv("JWT_SECRET") or secrets.token_urlsafe(32),
+    session_ttl=timedelta(hours=float(os.getenv("SESSION_TTL_HOURS", "24"))),
+    cache=VerifiedTokenCache(
+        max_size=int(os.getenv("SESSION_CACHE_SIZE", "10000")),
+        ttl=float(os.getenv("SESSION_CACHE_TTL", "30")),
+    ),
+)
+
+# Versioned artifacts published by the trainers (--registry). When set, the
+# models below load the registry's current versions and are hot-swapped when
+# a new version is activated; the *_PATH files are only a fallback.
+MODEL_REGISTRY = ModelRegistry(os.environ["MODEL_REGISTRY_DIR"]) if os.getenv("MODEL_REGISTRY_DIR") else None
+INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "64"))
+
+# Artifacts written by ml/train_spam_classifier.py
+SPAM_MODEL = SpamModelServer(
+    model_path=os.getenv("SPAM_MODEL_PATH", "spam_classifier_model.pkl"),
+    vectorizer_path=os.getenv("SPAM_VECTORIZER_PATH", "tfidf_vectorizer.pkl"),
+    registry=MODEL_REGISTRY,
+    warmup_batch=INFERENCE_MAX_BATCH,
+)
+
+# Written by ml/train_category_classifier.py; without it the submitted category is kept
+CATEGORY_MODEL = CategoryModelServer(
+    os.getenv("CATEGORY_MODEL_PATH", "category_classifier.npz"),
+    registry=MODEL_REGISTRY,
+    warmup_batch=INFERENCE_MAX_BATCH,
+)
+
+# Concurrent create_complaint calls share one transform/predict_proba pass
+SPAM_BATCHER = MicroBatcher(
+    SPAM_MODEL.predict_spam_batch,
+    max_batch_size=INFERENCE_MAX_BATCH,
+    max_wait_ms=float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "2")),
+    name="spam",
+)
+
+# ...and share one hashing/scoring pass for the category model
+CATEGORY_BATCHER = MicroBatcher(
+    CATEGORY_MODEL.predict_batch,
+    max_batch_size=INFERENCE_MAX_BATCH,
+    max_wait_ms=float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "2")),
+    name="category",
+)
+
+# Duplicate/recurrence detection; hashed term-frequency embeddings unless a
+# sentence-transformers model is configured
+DEDUP = create_detector(
+    model_name=os.getenv("DEDUP_EMBEDDING_MODEL") or None,
+    dim=int(os.getenv("DEDUP_EMBEDDING_DIM", "512")),
+    threshold=float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.85")),
+    # Located complaints are only compared within this radius/time window
+    radius_m=float(os.getenv("DEDUP_RADIUS_M", "500")) or None,
+    window_seconds=float(os.getenv("DEDUP_WINDOW_DAYS", "30")) * 86400 or None,
+)
+
+# Counters behind /api/analytics/*, updated on every complaint/forward write
+ANALYTICS = AnalyticsRollup(refresh_seconds=float(os.getenv("ANALYTICS_REFRESH_SECONDS", "0")))
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "366"))
+
+# Rows read per export chunk; an export holds about one chunk in memory
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+async def apply_sla_transitions(updates):
+    await REPOSITORY.update_sla_statuses(updates, datetime.now())
+    ANALYTICS.apply_sla_transitions(updates)
+
+# Flips stored forwards to At-Risk/Breached as their deadlines approach
+SLA_SCHEDULER = SLAScheduler(
+    apply_sla_transitions,
+    max_sleep=float(os.getenv("SLA_SCHEDULER_MAX_SLEEP", "60")),
+)
+
+ML_INFERENCE = METRICS.histogram(
+    "ml_inference_seconds", "Model call latency, including micro-batching wait", ("model",))
+ML_ITEMS = METRICS.counter("ml_inference_items_total", "Texts processed per model", ("model",))
+STORE_RECORDS = METRICS.gauge("store_records", "Records held in process", ("store",))
+STORE_RECORDS.set_function(lambda: len(COMPLAINTS_DB), "complaints")
+STORE_RECORDS.set_function(lambda: len(FORWARDS_DB), "forwards")
+STORE_RECORDS.set_function(lambda: len(CLUSTERS_DB), "clusters")
+STORE_RECORDS.set_function(lambda: len(DEDUP), "dedup_index")
+STORE_RECORDS.set_function(lambda: len(SLA_SCHEDULER), "sla_schedule")
+LOOP_LAG = LoopLagMonitor(METRICS)
+MODEL_WATCHER = ModelWatcher(
+    MODEL_REGISTRY, [SPAM_MODEL, CATEGORY_MODEL], METRICS,
+    interval=float(os.getenv("MODEL_REGISTRY_POLL_SECONDS", "5")),
+) if MODEL_REGISTRY is not None else None
+
+# Dependencies checked by /health/ready; Redis and MongoDB only when configured
+HEALTH = HealthChecker(
+    {"database": REPOSITORY.ping},
+    timeout=float(os.getenv("HEALTH_PROBE_TIMEOUT", "2")),
+    ttl=float(os.getenv("HEALTH_CACHE_TTL", "5")),
+)
+if os.getenv("REDIS_URL"):
+    HEALTH.add("redis", redis_probe(os.environ["REDIS_URL"]))
+if os.getenv("MONGO_URI"):
+    HEALTH.add("mongodb", mongo_probe(os.environ["MONGO_URI"]))
+
+# Records per transaction for POST /api/complaints/ingest
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "1000"))
+
 # Models
 class ComplaintCreate(BaseModel):
     title: str
@@ -32,6 +187,11 @@ class ComplaintCreate(BaseModel):
     attachments: List[str] = []
     language_tag: str = "en"
 
+class ComplaintImport(ComplaintCreate):
+    # Kept from the source system when migrating existing complaints
+    complaint_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
 class ComplaintResponse(BaseModel):
     complaint_id: str
     title: str
@@ -45,8 +205,10 @@ class ComplaintResponse(BaseModel):
     ml_confidence_score: float
     recurrence_flag: bool
     cluster_id: Optional[str]
+    duplicate_similarity_score: float = 0.0
     created_at: datetime
     updated_at: datetime
+    submitted_by: Optional[str] = None  # user_id, for complaints filed through /api/citizen/complaints
 
 class ForwardRequest(BaseModel):
     complaint_id: str
@@ -88,8 +250,9 @@ class FeedbackRequest(BaseModel):
     comments: str
 
 class AuthRequest(BaseModel):
-    username: str
+    username: str  # or email
     password: str
+    role: Optional[str] = None  # role to sign in as; defaults to the account's role
 
 class AuthResponse(BaseModel):
     token: str
@@ -104,144 +267,458 @@ class UserRegister(BaseModel):
     phone_number: Optional[str] = None
 
 # Helper functions
-def get_current_user(x_user_id: str = Header(None)):
-    if not x_user_id:
-        raise HTTPException(status_code=401, detail="X-User-Id header required")
-    return x_user_id
+def unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+async def get_current_session(authorization: Optional[str] = Header(None)) -> dict:
+    """Claims (sub, sid, role) of the request's bearer token"""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise unauthorized("Bearer token required")
+    try:
+        return await SESSIONS.authenticate(token)
+    except InvalidSession as exc:
+        raise unauthorized(str(exc))
+
+async def get_current_user(session: dict = Depends(get_current_session)) -> str:
+    return session["sub"]
+
+async def require_admin(session: dict = Depends(get_current_session)) -> str:
+    if session["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin role required")
+    return session["sub"]
+
+async def start_session(user: dict, request: Request, role: Optional[str] = None) -> AuthResponse:
+    token, _ = await SESSIONS.create(
+        user,
+        selected_role=role,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+    )
+    return AuthResponse(token=token, user_id=user["user_id"])
+
+# Verified when the user does not exist, so unknown usernames take as long as wrong passwords
+DUMMY_PASSWORD_HASH: Optional[str] = None
+
+async def dummy_password_hash() -> str:
+    global DUMMY_PASSWORD_HASH
+    if DUMMY_PASSWORD_HASH is None:
+        DUMMY_PASSWORD_HASH = await PASSWORDS.hash(secrets.token_urlsafe(16))
+    return DUMMY_PASSWORD_HASH
+
+def password_pool_busy() -> HTTPException:
+    return HTTPException(status_code=503, detail="Too many concurrent logins, retry shortly",
+                         headers={"Retry-After": "1"})
+
+def build_forward_record(forward: ForwardRequest, user_id: str, sla_deadline: datetime, sla_status: str,
+                         complaint: dict, cluster: Optional[dict] = None, now: Optional[datetime] = None) -> dict:
+    """Build the stored forward record (ForwardResponse fields) for a request"""
+    now = now or datetime.now()
+    return {
+        "forward_id": str(uuid.uuid4()),
+        "complaint_id": forward.complaint_id,
+        "recipient_department": forward.recipient_department,
+        "recipient_officer_id": forward.recipient_officer_id,
+        "recipient_officer_name": forward.recipient_officer_name,
+        "remarks": forward.remarks,
+        "follow_up_date": forward.follow_up_date,
+        "priority_level": forward.priority_level,
+        "status": forward.status,
+        "sla_deadline": sla_deadline,
+        "sla_status": sla_status,
+        "undo_token": str(uuid.uuid4()),
+        "undo_expires_at": now + timedelta(minutes=5),
+        "recurrence_flag": complaint["recurrence_flag"],
+        "previous_occurrences_count": max(cluster["complaint_count"] - 1, 0) if cluster else 0,
+        "cluster_id": complaint["cluster_id"],
+        "duplicate_similarity_score": complaint.get("duplicate_similarity_score") or 0.0,
+        "ml_confidence_score": complaint["ml_confidence_score"],
+        "forwarded_by": user_id,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+async def record_duplicate_match(complaint_id: str, match: dict, now: datetime):
+    """Persist the cluster a new complaint joined (and tag its neighbour if the cluster is new)"""
+    if match["cluster_id"] is None:
+        return
+    if match["new_cluster"]:
+        await REPOSITORY.update_complaint(
+            match["neighbour_id"], cluster_id=match["cluster_id"], recurrence_flag=True, updated_at=now
+        )
+    await REPOSITORY.upsert_cluster(cluster_record(match, now))
+
+def cluster_record(match: dict, last_seen: datetime) -> dict:
+    return {
+        "cluster_id": match["cluster_id"],
+        "centroid_location": match["centroid"],
+        "complaint_count": match["cluster_size"],
+        "severity": cluster_severity(match["cluster_size"]),
+        "last_seen": last_seen,
+    }
+
+async def timed(model: str, awaitable, items: int = 1):
+    """Await a model call, recording it under ml_inference_seconds{model=...}"""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        ML_INFERENCE.labels(model).observe(time.perf_counter() - start)
+        ML_ITEMS.labels(model).inc(items)
+
+async def predict_categories(texts: List[str], submitted: List[str]) -> List[Tuple[str, float]]:
+    """(predicted_class, ml_confidence_score) for each complaint text; the
+    submitted category with confidence 0.0 when no model is deployed. A
+    single text (one new complaint) goes through CATEGORY_BATCHER so
+    concurrent submissions are scored together; an ingest chunk is already
+    a batch and runs as one call"""
+    if not CATEGORY_MODEL.load():
+        return [(category, 0.0) for category in submitted]
+    if len(texts) == 1:
+        return [await timed("classification", CATEGORY_BATCHER.submit(texts[0]))]
+    loop = asyncio.get_running_loop()
+    return await timed("classification", loop.run_in_executor(None, CATEGORY_MODEL.predict_batch, texts),
+                       len(texts))
+
+async def score_spam_batch(texts: List[str]) -> List[float]:
+    """Spam scores for a whole chunk in one model call (0.0 when no model is deployed)"""
+    if not SPAM_MODEL.load():
+        return [0.0] * len(texts)
+    loop = asyncio.get_running_loop()
+    return await timed("spam", loop.run_in_executor(None, SPAM_MODEL.predict_spam_batch, texts), len(texts))
+
+async def ingest_chunk(pending: List[Tuple[int, ComplaintImport]]) -> Tuple[int, List[dict]]:
+    """Score, deduplicate and commit one chunk; returns (committed, rejected lines)"""
+    existing = await REPOSITORY.get_complaints({item.complaint_id for _, item in pending if item.complaint_id})
+    rejected, accepted, seen = [], [], set()
+    for number, item in pending:
+        complaint_id = item.complaint_id or str(uuid.uuid4())
+        if complaint_id in existing or complaint_id in seen:
+            rejected.append({"line": number, "error": f"Complaint {complaint_id} already exists"})
+            continue
+        seen.add(complaint_id)
+        accepted.append((complaint_id, item))
+    if not accepted:
+        return 0, rejected
 
-def calculate_sla_deadline(priority_level: str) -> datetime:
-    now = datetime.now()
-    if priority_level == "Urgent":
-        return now + timedelta(hours=24)
-    elif priority_level == "High":
-        return now + timedelta(days=3)
-    else:  # Normal
-        return now + timedelta(days=7)
-
-def get_sla_status(deadline: datetime) -> str:
     now = datetime.now()
-    time_left = deadline - now
-    total_time = deadline - (deadline - timedelta(days=7))  # Simplified
-    
-    if time_left.total_seconds() <= 0:
-        return "Breached"
-    elif time_left.total_seconds() <= total_time.total_seconds() * 0.2:
-        return "At-Risk"
-    else:
-        return "On-Track"
+    ids = [complaint_id for complaint_id, _ in accepted]
+    items = [item for _, item in accepted]
+    created = [item.created_at or now for item in items]
+    descriptions = [item.description for item in items]
+    spam_scores, matches, categories = await asyncio.gather(
+        score_spam_batch([f"{item.title} {item.description}" for item in items]),
+        timed("dedup", DEDUP.assign_batch(
+            ids, descriptions, [item.location for item in items],
+            [created_at.timestamp() for created_at in created],
+        ), len(ids)),
+        predict_categories(descriptions, [item.category for item in items]),
+    )
+
+    records, tagged, clusters = {}, [], {}
+    for complaint_id, item, created_at, spam_score, match, (predicted_class, confidence) in zip(
+            ids, items, created, spam_scores, matches, categories):
+        # Stored records built directly, as in submit_complaint: each line was validated on parsing
+        records[complaint_id] = {
+            "complaint_id": complaint_id,
+            "title": item.title,
+            "description": item.description,
+            "category": item.category,
+            "location": item.location,
+            "attachments": item.attachments,
+            "language_tag": item.language_tag,
+            "spam_score": float(spam_score),
+            "predicted_class": predicted_class,
+            "ml_confidence_score": float(confidence),
+            "recurrence_flag": match["cluster_id"] is not None,
+            "cluster_id": match["cluster_id"],
+            "duplicate_similarity_score": float(match["similarity"]),
+            "created_at": created_at,
+            "updated_at": now,
+            "submitted_by": None,
+        }
+        if match["cluster_id"] is None:
+            continue
+        if match["new_cluster"]:
+            neighbour = records.get(match["neighbour_id"])
+            if neighbour is not None:
+                neighbour.update(cluster_id=match["cluster_id"], recurrence_flag=True)
+            else:
+                tagged.append(match)
+        previous = clusters.get(match["cluster_id"])
+        last_seen = max(created_at, previous["last_seen"]) if previous else created_at
+        clusters[match["cluster_id"]] = cluster_record(match, last_seen)
+
+    await REPOSITORY.add_complaints(list(records.values()))
+    ANALYTICS.add_complaints(list(records.values()))
+    for match in tagged:
+        await REPOSITORY.update_complaint(
+            match["neighbour_id"], cluster_id=match["cluster_id"], recurrence_flag=True, updated_at=now
+        )
+    await REPOSITORY.upsert_clusters(list(clusters.values()))
+    return len(records), rejected
 
 # API Endpoints
 @app.post("/api/auth/register", response_model=AuthResponse)
-async def register(user_data: UserRegister):
+async def register(user_data: UserRegister, request: Request):
     """Register new citizen user account"""
-    # In a real app, you would:
-    # 1. Hash the password
-    # 2. Check if username/email already exists
-    # 3. Save user to database
-    # 4. Return auth token
-    
-    # For this demo, we'll just return a mock response
-    return AuthResponse(token=str(uuid.uuid4()), user_id=str(uuid.uuid4()))
+    try:
+        password_hash = await PASSWORDS.hash(user_data.password)
+    except PasswordHasherBusy:
+        raise password_pool_busy()
+    now = datetime.now()
+    user = {
+        "user_id": str(uuid.uuid4()),
+        "username": user_data.username,
+        "email": user_data.email,
+        "password_hash": password_hash,
+        "full_name": user_data.full_name,
+        "phone_number": user_data.phone_number,
+        "role": "user",
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+    try:
+        await USERS.create_user(user)
+    except UserExists:
+        raise HTTPException(status_code=409, detail="Username or email already registered")
+    return await start_session(user, request)
 
 @app.post("/api/auth/login", response_model=AuthResponse)
-async def login(credentials: AuthRequest):
+async def login(credentials: AuthRequest, request: Request):
     """Authenticate user with role selection"""
-    # Mock authentication - in real app, verify credentials
-    return AuthResponse(token=str(uuid.uuid4()), user_id=str(uuid.uuid4()))
+    user = await USERS.find_by_login(credentials.username)
+    try:
+        valid, new_hash = await PASSWORDS.verify_and_update(
+            credentials.password, user["password_hash"] if user else await dummy_password_hash())
+    except PasswordHasherBusy:
+        raise password_pool_busy()
+    if user is None or not valid:
+        raise unauthorized("Invalid username or password")
+    if not user["is_active"]:
+        raise HTTPException(status_code=403, detail="Account is disabled")
+    # Any account may sign in as a plain user; other roles must be its own
+    role = credentials.role or user["role"]
+    if role not in (user["role"], "user"):
+        raise HTTPException(status_code=403, detail=f"Account cannot sign in as {role}")
+    now = datetime.now()
+    changes = {"last_login": now}
+    if new_hash is not None:
+        changes.update(password_hash=new_hash, updated_at=now)
+    await USERS.update_user(user["user_id"], **changes)
+    return await start_session(user, request, role)
 
-@app.post("/api/complaints", response_model=ComplaintResponse)
-async def create_complaint(complaint: ComplaintCreate):
+@app.post("/api/auth/logout", status_code=204)
+async def logout(session: dict = Depends(get_current_session)):
+    """Revoke the session of the presented token"""
+    await SESSIONS.revoke(session["sid"])
+    return Response(status_code=204)
+
+async def submit_complaint(complaint: ComplaintCreate, submitted_by: Optional[str] = None) -> dict:
+    """Score, deduplicate and store a new complaint; returns its record"""
     complaint_id = str(uuid.uuid4())
     
-    # Simulate ML processing
-    import random
-    spam_score = random.uniform(0.01, 0.99)
-    predicted_class = random.choice(["Sanitation", "Traffic", "Infrastructure", "Public Safety"])
-    ml_confidence_score = random.uniform(0.60, 0.99)
-    recurrence_flag = random.choice([True, False])
-    cluster_id = str(uuid.uuid4()) if recurrence_flag else None
-    
-    complaint_data = ComplaintResponse(
-        complaint_id=complaint_id,
-        title=complaint.title,
-        description=complaint.description,
-        category=complaint.category,
-        location=complaint.location,
-        attachments=complaint.attachments,
-        language_tag=complaint.language_tag,
-        spam_score=spam_score,
-        predicted_class=predicted_class,
-        ml_confidence_score=ml_confidence_score,
-        recurrence_flag=recurrence_flag,
-        cluster_id=cluster_id,
-        created_at=datetime.now(),
-        updated_at=datetime.now()
-    )
-    
-    COMPLAINTS_DB[complaint_id] = complaint_data.dict()
-    return complaint_data
+    # Spam score from the trained classifier (0.0 when no model is deployed)
+    spam_score = 0.0
+    if SPAM_MODEL.load():
+        spam_score = await timed("spam", SPAM_BATCHER.submit(f"{complaint.title} {complaint.description}"))
+
+    # Nearest earlier complaint (nearby and recent, when located) decides recurrence and cluster
+    now = datetime.now()
+    match = await timed("dedup", DEDUP.assign(complaint_id, complaint.description, complaint.location, now.timestamp()))
+
+    (predicted_class, ml_confidence_score), = await predict_categories([complaint.description], [complaint.category])
+
+    # Built as the stored record directly: every value is already validated or computed here
+    record = {
+        "complaint_id": complaint_id,
+        "title": complaint.title,
+        "description": complaint.description,
+        "category": complaint.category,
+        "location": complaint.location,
+        "attachments": complaint.attachments,
+        "language_tag": complaint.language_tag,
+        "spam_score": float(spam_score),
+        "predicted_class": predicted_class,
+        "ml_confidence_score": float(ml_confidence_score),
+        "recurrence_flag": match["cluster_id"] is not None,
+        "cluster_id": match["cluster_id"],
+        "duplicate_similarity_score": float(match["similarity"]),
+        "created_at": now,
+        "updated_at": now,
+        "submitted_by": submitted_by,
+    }
+    await REPOSITORY.create_complaint(record)
+    ANALYTICS.add_complaint(record)
+    await record_duplicate_match(complaint_id, match, now)
+    return record
+
+async def complaint_listing_filters(category: Optional[str] = None, predicted_class: Optional[str] = None,
+                                    recurrence_flag: Optional[bool] = None, min_spam_score: Optional[float] = None,
+                                    max_spam_score: Optional[float] = None, created_after: Optional[datetime] = None,
+                                    created_before: Optional[datetime] = None) -> dict:
+    """Listing filters shared by the admin and citizen complaint listings"""
+    return complaint_filters(category=category, predicted_class=predicted_class, recurrence_flag=recurrence_flag,
+                             min_spam_score=min_spam_score, max_spam_score=max_spam_score,
+                             created_after=created_after, created_before=created_before)
+
+async def complaint_page(cursor: Optional[str], limit: int, include_total: bool, filters: dict) -> RecordResponse:
+    """One keyset page of complaints, newest first; pass ``next_cursor`` back as ``cursor``"""
+    try:
+        after = decode_cursor(cursor)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    limit = clamp_limit(limit)
+    # One extra row tells whether another page follows
+    complaints = await REPOSITORY.list_complaints(limit + 1, after, **filters)
+    page = complaints[:limit]
+    next_cursor = None
+    if len(complaints) > limit:
+        next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["complaint_id"])
+    result = {"items": page, "next_cursor": next_cursor}
+    if include_total:
+        result["total"] = await REPOSITORY.count_complaints(**filters)
+    return RecordResponse(result)
+
+@app.post("/api/complaints", response_model=ComplaintResponse)
+async def create_complaint(complaint: ComplaintCreate):
+    return RecordResponse(await submit_complaint(complaint))
+
+@app.post("/api/citizen/complaints", response_model=ComplaintResponse)
+async def create_citizen_complaint(complaint: ComplaintCreate, user_id: str = Depends(get_current_user)):
+    """Submit a complaint as the signed-in user, so it appears in their own listing"""
+    return RecordResponse(await submit_complaint(complaint, submitted_by=user_id))
+
+@app.get("/api/citizen/complaints")
+async def list_citizen_complaints(cursor: Optional[str] = None, limit: int = 100, include_total: bool = False,
+                                  filters: dict = Depends(complaint_listing_filters),
+                                  user_id: str = Depends(get_current_user)):
+    """The signed-in user's complaints, keyset-paginated newest first"""
+    return await complaint_page(cursor, limit, include_total, dict(filters, submitted_by=user_id))
+
+@app.post("/api/complaints/ingest")
+async def ingest_complaints(request: Request, chunk_size: int = INGEST_CHUNK_SIZE,
+                            user_id: str = Depends(require_admin)):
+    """Bulk-load complaints from an NDJSON body shaped like data/complaints.jsonl.
+
+    Lines are parsed as the body arrives and committed every ``chunk_size``
+    records, with spam scoring and duplicate detection run once per chunk.
+    The NDJSON response carries one object per rejected line, a progress
+    object per committed chunk and a final summary with ``"done": true``.
+    Records keep any ``complaint_id`` and ``created_at`` they carry, so this
+    needs an admin session.
+    """
+    chunk_size = max(1, min(chunk_size, 10000))
+
+    async def progress():
+        started = time.perf_counter()
+        lines = committed = failed = 0
+        pending = []
+
+        async def flush():
+            nonlocal committed, failed
+            count, rejected = await ingest_chunk(pending)
+            pending.clear()
+            committed += count
+            failed += len(rejected)
+            return rejected
+
+        try:
+            async for number, line in iter_lines(request.stream()):
+                lines += 1
+                try:
+                    pending.append((number, ComplaintImport(**json.loads(line))))
+                except ValidationError as exc:
+                    failed += 1
+                    yield json.dumps({"line": number, "error": validation_message(exc)}) + "\n"
+                except (ValueError, TypeError) as exc:
+                    failed += 1
+                    yield json.dumps({"line": number, "error": f"Invalid record: {exc}"}) + "\n"
+                if len(pending) >= chunk_size:
+                    for rejected in await flush():
+                        yield json.dumps(rejected) + "\n"
+                    yield json.dumps(chunk_summary(lines, committed, failed, time.perf_counter() - started)) + "\n"
+        except LineTooLong as exc:
+            failed += 1
+            yield json.dumps({"error": str(exc)}) + "\n"
+        if pending:
+            for rejected in await flush():
+                yield json.dumps(rejected) + "\n"
+        summary = chunk_summary(lines, committed, failed, time.perf_counter() - started)
+        yield json.dumps(dict(summary, done=True)) + "\n"
+
+    return NDJSONStreamingResponse(progress())
 
 @app.get("/api/complaints/{complaint_id}", response_model=ComplaintResponse)
 async def get_complaint(complaint_id: str):
-    if complaint_id not in COMPLAINTS_DB:
+    record = await REPOSITORY.get_complaint(complaint_id)
+    if record is None:
         raise HTTPException(status_code=404, detail="Complaint not found")
-    return ComplaintResponse(**COMPLAINTS_DB[complaint_id])
+    return RecordResponse(record)
 
 @app.post("/api/complaints/forward", response_model=ForwardResponse)
 async def forward_complaint(forward: ForwardRequest, user_id: str = Depends(get_current_user)):
-    if forward.complaint_id not in COMPLAINTS_DB:
+    complaint = await REPOSITORY.get_complaint(forward.complaint_id)
+    if complaint is None:
         raise HTTPException(status_code=404, detail="Complaint not found")
-    
-    forward_id = str(uuid.uuid4())
-    undo_token = str(uuid.uuid4())
-    undo_expires_at = datetime.now() + timedelta(minutes=5)
+    cluster = await REPOSITORY.get_cluster(complaint["cluster_id"]) if complaint["cluster_id"] else None
     
     # Calculate SLA
     sla_deadline = calculate_sla_deadline(forward.priority_level)
-    sla_status = get_sla_status(sla_deadline)
-    
-    # Simulate ML data
-    import random
-    recurrence_flag = random.choice([True, False])
-    previous_occurrences_count = random.randint(0, 10)
-    cluster_id = str(uuid.uuid4()) if recurrence_flag else None
-    duplicate_similarity_score = random.uniform(0.0, 1.0)
-    ml_confidence_score = random.uniform(0.60, 0.99)
-    
-    forward_data = ForwardResponse(
-        forward_id=forward_id,
-        complaint_id=forward.complaint_id,
-        recipient_department=forward.recipient_department,
-        recipient_officer_id=forward.recipient_officer_id,
-        recipient_officer_name=forward.recipient_officer_name,
-        remarks=forward.remarks,
-        follow_up_date=forward.follow_up_date,
-        priority_level=forward.priority_level,
-        status=forward.status,
-        sla_deadline=sla_deadline,
-        sla_status=sla_status,
-        undo_token=undo_token,
-        undo_expires_at=undo_expires_at,
-        recurrence_flag=recurrence_flag,
-        previous_occurrences_count=previous_occurrences_count,
-        cluster_id=cluster_id,
-        duplicate_similarity_score=duplicate_similarity_score,
-        ml_confidence_score=ml_confidence_score,
-        forwarded_by=user_id,
-        created_at=datetime.now(),
-        updated_at=datetime.now()
-    )
-    
-    FORWARDS_DB[forward_id] = forward_data.dict()
-    return forward_data
+    sla_status = get_sla_status(sla_deadline, forward.priority_level)
+
+    forward_data = build_forward_record(forward, user_id, sla_deadline, sla_status, complaint, cluster)
+    await REPOSITORY.add_forward(forward_data)
+    ANALYTICS.add_forward(forward_data)
+    SLA_SCHEDULER.track(forward_data)
+    return RecordResponse(forward_data)
 
 @app.post("/api/complaints/forward/batch")
-async def batch_forward(complaint_ids: List[str] = Body(...), user_id: str = Depends(get_current_user)):
-    results = []
-    for complaint_id in complaint_ids:
-        # For this demo, we'll just return a simple success response
-        results.append({"complaint_id": complaint_id, "success": True})
-    return {"results": results}
+async def batch_forward(forwards: List[ForwardRequest] = Body(...), user_id: str = Depends(get_current_user)):
+    """Forward many complaints in one round trip.
+
+    Complaint ids are checked with a single bulk lookup, SLA deadlines are
+    computed in one vectorized pass and every accepted forward is written in
+    one transaction. Per-item results are streamed back as they are encoded.
+    """
+    existing = await REPOSITORY.get_complaints({f.complaint_id for f in forwards})
+    clusters = await REPOSITORY.get_clusters({c["cluster_id"] for c in existing.values() if c["cluster_id"]})
+    accepted = [f for f in forwards if f.complaint_id in existing]
+
+    now = datetime.now()
+    deadlines = calculate_sla_deadlines([f.priority_level for f in accepted], now)
+    statuses = get_sla_statuses(deadlines, [f.priority_level for f in accepted], now)
+    records = [
+        build_forward_record(forward, user_id, deadline, status, existing[forward.complaint_id],
+                             clusters.get(existing[forward.complaint_id]["cluster_id"]), now)
+        for forward, deadline, status in zip(accepted, deadlines, statuses)
+    ]
+    await REPOSITORY.add_forwards(records)
+    ANALYTICS.add_forwards(records)
+    for record in records:
+        SLA_SCHEDULER.track(record)
+
+    def results():
+        yield '{"results": ['
+        stored = iter(records)
+        for i, forward in enumerate(forwards):
+            if forward.complaint_id in existing:
+                record = next(stored)
+                item = {
+                    "complaint_id": forward.complaint_id,
+                    "success": True,
+                    "forward_id": record["forward_id"],
+                    "sla_deadline": record["sla_deadline"].isoformat(),
+                    "sla_status": record["sla_status"],
+                    "undo_token": record["undo_token"],
+                }
+            else:
+                item = {"complaint_id": forward.complaint_id, "success": False, "error": "Complaint not found"}
+            yield ("," if i else "") + json.dumps(item)
+        yield "]}"
+
+    return StreamingResponse(results(), media_type="application/json")
 
 @app.post("/api/complaints/{complaint_id}/feedback")
 async def submit_feedback(complaint_id: str, feedback: FeedbackRequest):
@@ -254,15 +731,194 @@ async def get_complaint_history(complaint_id: str):
     # Return audit trail and forward history
     history = {
         "audit_trail": [],
-        "forward_history": [f for f in FORWARDS_DB.values() if f["complaint_id"] == complaint_id]
+        "forward_history": await REPOSITORY.forwards_for_complaint(complaint_id)
     }
     return history
 
+@app.get("/api/sla/alerts")
+async def sla_alerts(limit: int = 100, user_id: str = Depends(require_admin)):
+    """Up to ``limit`` Breached and up to ``limit`` At-Risk forwards, read from the sla_status index"""
+    limit = clamp_limit(limit)
+    return {
+        "breached": await REPOSITORY.forwards_by_sla_status("Breached", limit),
+        "at_risk": await REPOSITORY.forwards_by_sla_status("At-Risk", limit),
+    }
+
+@app.get("/api/admin/users")
+async def list_users(cursor: Optional[str] = None, limit: int = 100, role: Optional[str] = None,
+                     volunteer_status: Optional[str] = None, include_total: bool = False,
+                     user_id: str = Depends(require_admin)):
+    """Keyset-paginated user listing, newest first; pass ``next_cursor`` back as ``cursor``"""
+    try:
+        after = decode_cursor(cursor)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    limit = clamp_limit(limit)
+    filters = user_filters(role=role, volunteer_status=volunteer_status)
+    # One extra row tells whether another page follows
+    users = await USERS.list_users(limit + 1, after, **filters)
+    page = users[:limit]
+    next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["user_id"]) if len(users) > limit else None
+    result = {"items": page, "next_cursor": next_cursor}
+    if include_total:
+        result["total"] = await USERS.count_users(**filters)
+    return result
+
+@app.get("/api/admin/complaints")
+async def list_complaints(cursor: Optional[str] = None, limit: int = 100, include_total: bool = False,
+                          filters: dict = Depends(complaint_listing_filters), user_id: str = Depends(require_admin)):
+    """Keyset-paginated complaint listing, newest first; every filter is served by an index"""
+    return await complaint_page(cursor, limit, include_total, filters)
+
+async def forward_export_filters(recipient_department: Optional[str] = None, sla_status: Optional[str] = None,
+                                 priority_level: Optional[str] = None, status: Optional[str] = None,
+                                 created_after: Optional[datetime] = None,
+                                 created_before: Optional[datetime] = None) -> dict:
+    return forward_filters(recipient_department=recipient_department, sla_status=sla_status,
+                           priority_level=priority_level, status=status,
+                           created_after=created_after, created_before=created_before)
+
+def export_response(name: str, chunks, columns, values, format: str, gzip: bool) -> StreamingResponse:
+    """Stream ``chunks`` as a CSV or Parquet download, gzip-compressed on request"""
+    if format == "csv":
+        body, media_type = csv_stream(chunks, columns, values), "text/csv; charset=utf-8"
+    elif format == "parquet":
+        if not parquet_available():
+            raise HTTPException(status_code=400, detail="Parquet export needs pyarrow installed")
+        body, media_type = parquet_stream(chunks, columns, values), "application/vnd.apache.parquet"
+    else:
+        raise HTTPException(status_code=400, detail="format must be csv or parquet")
+    filename = f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    if gzip:
+        body, media_type, filename = gzip_stream(body), "application/gzip", filename + ".gz"
+    return StreamingResponse(body, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@app.get("/api/admin/exports/complaints")
+async def export_complaints(format: str = "csv", gzip: bool = False,
+                            filters: dict = Depends(complaint_listing_filters), user_id: str = Depends(require_admin)):
+    """Every complaint matching the listing filters, newest first, streamed in EXPORT_CHUNK_SIZE chunks"""
+    chunks = REPOSITORY.export_complaints(EXPORT_CHUNK_SIZE, **filters)
+    return export_response("complaints", chunks, COMPLAINT_EXPORT_COLUMNS, complaint_values, format, gzip)
+
+@app.get("/api/admin/exports/forwards")
+async def export_forwards(format: str = "csv", gzip: bool = False,
+                          filters: dict = Depends(forward_export_filters), user_id: str = Depends(require_admin)):
+    """Every forward matching the filters, newest first, streamed in EXPORT_CHUNK_SIZE chunks"""
+    chunks = REPOSITORY.export_forwards(EXPORT_CHUNK_SIZE, **filters)
+    return export_response("forwards", chunks, FORWARD_EXPORT_COLUMNS, forward_values, format, gzip)
+
+async def analytics_rollup() -> AnalyticsRollup:
+    await ANALYTICS.ensure_built(REPOSITORY)
+    return ANALYTICS
+
+@app.get("/api/analytics/summary")
+async def analytics_summary(rollup: AnalyticsRollup = Depends(analytics_rollup)):
+    """Complaint and forward totals, forwards per SLA status and the overall breach rate"""
+    return rollup.summary()
+
+@app.get("/api/analytics/categories")
+async def analytics_categories(rollup: AnalyticsRollup = Depends(analytics_rollup)):
+    """Complaints per category, most common first"""
+    return {"categories": rollup.categories()}
+
+@app.get("/api/analytics/daily")
+async def analytics_daily(start: Optional[date] = None, end: Optional[date] = None,
+                          rollup: AnalyticsRollup = Depends(analytics_rollup)):
+    """Complaints per day between ``start`` and ``end`` (inclusive; the last 30 days by default)"""
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days >= ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400,
+                            detail=f"start must not be after end, and the range is at most {ANALYTICS_MAX_DAYS} days")
+    return {"days": rollup.daily(start, end)}
+
+@app.get("/api/analytics/departments")
+async def analytics_departments(rollup: AnalyticsRollup = Depends(analytics_rollup)):
+    """Forwards per recipient department with their SLA status counts and breach rate"""
+    return {"departments": rollup.departments()}
+
+@app.get("/api/ml/metrics")
+async def ml_metrics():
+    """Inference latency (p50/p99) for the served models"""
+    return {
+        "spam": dict(SPAM_MODEL.stats(), batching=SPAM_BATCHER.stats()),
+        "category": dict(CATEGORY_MODEL.stats(), batching=CATEGORY_BATCHER.stats()),
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, ML, store and event-loop metrics"""
+    return Response(METRICS.render(), media_type=CONTENT_TYPE)
+
+@app.on_event("startup")
+async def load_models():
+    SPAM_MODEL.load()
+    CATEGORY_MODEL.load()
+    if MODEL_WATCHER is not None:
+        MODEL_WATCHER.start()
+
+@app.on_event("startup")
+async def create_user_indexes():
+    await USERS.ensure_indexes()
+
+@app.on_event("startup")
+async def build_analytics():
+    await ANALYTICS.rebuild(REPOSITORY)
+    ANALYTICS.start(REPOSITORY)
+
+@app.on_event("startup")
+async def rebuild_dedup_index():
+    # Complaints stored by earlier runs (or other workers) stay duplicate
+    # candidates, and their clusters keep counting from their stored size
+    if len(DEDUP):
+        return
+    async for chunk in REPOSITORY.export_complaints(EXPORT_CHUNK_SIZE):
+        await DEDUP.add_existing(
+            [record["complaint_id"] for record in chunk], [record["description"] for record in chunk],
+            [record["cluster_id"] for record in chunk], [record["location"] for record in chunk],
+            [record["created_at"].timestamp() if record["created_at"] else None for record in chunk],
+        )
+
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    LOOP_LAG.start()
+
+@app.on_event("startup")
+async def start_sla_scheduler():
+    # Forwards persisted by earlier runs still have transitions ahead of them
+    for sla_status in ("On-Track", "At-Risk"):
+        for record in await REPOSITORY.forwards_by_sla_status(sla_status):
+            SLA_SCHEDULER.track(record)
+    SLA_SCHEDULER.start()
+
+@app.on_event("shutdown")
+async def close_repository():
+    await LOOP_LAG.stop()
+    if MODEL_WATCHER is not None:
+        await MODEL_WATCHER.stop()
+    await SLA_SCHEDULER.stop()
+    await ANALYTICS.stop()
+    await SPAM_BATCHER.stop()
+    await CATEGORY_BATCHER.stop()
+    await REPOSITORY.close()
+    await USERS.close()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/live")
+async def liveness():
+    # Only proves the process and its event loop respond; dependencies are /health/ready
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    report = await HEALTH.check()
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
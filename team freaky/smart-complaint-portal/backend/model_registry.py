@@ -0,0 +1,145 @@
+"""
+Versioned model registry shared by the trainers in ml/ and the API
+
+Layout (MODEL_REGISTRY_DIR):
+    <root>/<model>/v000001/<artifact files>
+    <root>/<model>/v000001/metadata.json    version, created_at, sha256 of every file, trainer details
+    <root>/<model>/CURRENT                   name of the version being served
+
+A version is written into a temporary directory and renamed into place, and
+CURRENT is replaced with os.replace, so a reader sees either the old version
+or the complete new one, never a partial copy. Published versions are never
+modified, which also keeps the memory-mapped arrays of a served model valid
+while a newer version is published next to it.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+METADATA_FILE = "metadata.json"
+CURRENT_FILE = "CURRENT"
+
+
+class RegistryError(RuntimeError):
+    """A model or version is missing, or an artifact does not match its checksum"""
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelVersion:
+    """One published version: its directory and metadata"""
+
+    def __init__(self, name: str, version: str, path: str, metadata: dict):
+        self.name = name
+        self.version = version
+        self.path = path
+        self.metadata = metadata
+
+    def file(self, filename: str) -> str:
+        if filename not in self.metadata["files"]:
+            raise RegistryError(f"{self.name} {self.version} has no artifact {filename!r}")
+        return os.path.join(self.path, filename)
+
+    def verify(self):
+        """Raise RegistryError unless every artifact matches the checksum recorded at publish time"""
+        for filename, expected in self.metadata["files"].items():
+            path = os.path.join(self.path, filename)
+            if not os.path.exists(path):
+                raise RegistryError(f"{self.name} {self.version}: {filename} is missing")
+            if file_sha256(path) != expected:
+                raise RegistryError(f"{self.name} {self.version}: checksum mismatch for {filename}")
+
+    def __repr__(self):
+        return f"ModelVersion({self.name!r}, {self.version!r})"
+
+
+class ModelRegistry:
+    def __init__(self, root: str):
+        self.root = root
+
+    def _model_dir(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def versions(self, name: str) -> List[str]:
+        """Published versions of a model, oldest first"""
+        directory = self._model_dir(name)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(entry for entry in os.listdir(directory)
+                      if entry.startswith("v") and os.path.exists(os.path.join(directory, entry, METADATA_FILE)))
+
+    def current(self, name: str) -> Optional[str]:
+        """The version being served, or None before anything is activated"""
+        try:
+            with open(os.path.join(self._model_dir(name), CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def get(self, name: str, version: Optional[str] = None, verify: bool = True) -> ModelVersion:
+        """A published version (default: the current one), checksummed unless verify=False"""
+        version = version or self.current(name)
+        if version is None:
+            raise RegistryError(f"no active version of {name!r} in {self.root}")
+        path = os.path.join(self._model_dir(name), version)
+        try:
+            with open(os.path.join(path, METADATA_FILE)) as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            raise RegistryError(f"{name} {version} is not in {self.root}") from None
+        model_version = ModelVersion(name, version, path, metadata)
+        if verify:
+            model_version.verify()
+        return model_version
+
+    def publish(self, name: str, files: Dict[str, str], metadata: Optional[dict] = None,
+                activate: bool = True) -> ModelVersion:
+        """Copy ``{artifact filename: source path}`` into a new version and (by default) make it current"""
+        directory = self._model_dir(name)
+        os.makedirs(directory, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=directory)
+        try:
+            checksums = {}
+            for filename, source in files.items():
+                shutil.copyfile(source, os.path.join(staging, filename))
+                checksums[filename] = file_sha256(os.path.join(staging, filename))
+            while True:
+                existing = self.versions(name)
+                version = f"v{int(existing[-1][1:]) + 1 if existing else 1:06d}"
+                record = dict(metadata or {}, name=name, version=version,
+                              created_at=datetime.now().isoformat(), files=checksums)
+                with open(os.path.join(staging, METADATA_FILE), "w") as f:
+                    json.dump(record, f, indent=2)
+                try:
+                    os.rename(staging, os.path.join(directory, version))
+                    break
+                except OSError:
+                    # Another publisher took this number first
+                    if not os.path.exists(os.path.join(directory, version)):
+                        raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if activate:
+            self.activate(name, version)
+        return ModelVersion(name, version, os.path.join(directory, version), record)
+
+    def activate(self, name: str, version: str):
+        """Point CURRENT at a published version (also used to roll back)"""
+        self.get(name, version)
+        directory = self._model_dir(name)
+        fd, temporary = tempfile.mkstemp(prefix=".current-", dir=directory)
+        with os.fdopen(fd, "w") as f:
+            f.write(version + "\n")
+        os.replace(temporary, os.path.join(directory, CURRENT_FILE))
@@ -0,0 +1,332 @@
+"""
+Model serving for the Smart Complaint Portal
+Loads the artifacts written by ml/train_spam_classifier.py and
+ml/train_category_classifier.py once per process and scores complaint text
+without reloading anything per request.
+
+The spam artifacts are opened with mmap_mode="r", so the NumPy arrays inside them
+(IDF weights, coefficients) are mapped read-only from the file instead of
+copied onto the heap. Every uvicorn worker that maps the same file shares
+those pages through the OS page cache.
+
+With a ModelRegistry (MODEL_REGISTRY_DIR) the servers load the registry's
+current version instead of the fixed paths, and ModelWatcher swaps in newly
+activated versions while the API keeps serving: the new version is loaded,
+checksummed and warmed with a sample batch on a worker thread, then replaces
+a single reference. Requests that already picked up the old version finish
+on it.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model_registry import ModelRegistry, ModelVersion, RegistryError
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyRecorder:
+    """Keeps the most recent inference latencies for percentile reporting"""
+
+    def __init__(self, window: int = 4096):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> dict:
+        if not self._samples:
+            return {"count": self.count, "p50_ms": None, "p99_ms": None}
+        p50, p99 = np.percentile(np.fromiter(self._samples, dtype=float), [50, 99]) * 1000
+        return {"count": self.count, "p50_ms": round(float(p50), 3), "p99_ms": round(float(p99), 3)}
+
+
+# Scored by a freshly loaded model before it goes live, so the first real
+# requests don't pay for lazy imports, page faults on mapped arrays or
+# first-call allocations
+WARMUP_TEXTS = [
+    "Garbage not collected for weeks near the market",
+    "Street light not working near the metro station",
+    "Water supply issue in residential area near sector 4",
+    "Traffic signal malfunctioning at MG road",
+    "Open manhole without cover at lane 3",
+    "Congratulations! You have won a lottery prize, click the link to claim",
+    "Buy cheap medicines online now, visit our website",
+    "Power outage in apartment complex at ward 7",
+]
+
+
+class ModelServer:
+    """A model loaded once per process and swapped without downtime
+
+    Subclasses describe their artifacts (ARTIFACTS: registry filename per
+    role), how to build a loaded model from them and how to score a batch
+    with one. Everything a prediction needs lives on the loaded model object,
+    so replacing ``_active`` is the whole swap.
+    """
+
+    kind = "model"
+    ARTIFACTS: Dict[str, str] = {}
+
+    def __init__(self, paths: Dict[str, str], registry: Optional[ModelRegistry] = None,
+                 name: Optional[str] = None, warmup_batch: int = 64):
+        self.paths = paths
+        self.registry = registry
+        self.name = name or self.kind
+        self.warmup_batch = warmup_batch
+        self.latency = LatencyRecorder()
+        self.swaps = 0
+        self._active = None
+        self._load_attempted = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._active is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        active = self._active
+        return None if active is None else active.version
+
+    def _build(self, paths: Dict[str, str], version: Optional[str]):
+        raise NotImplementedError
+
+    def _score(self, active, texts: List[str]):
+        raise NotImplementedError
+
+    def load(self) -> bool:
+        """Load the current model; safe to call repeatedly, only the first call does work"""
+        if self._load_attempted:
+            return self.loaded
+        with self._lock:
+            if self._load_attempted:
+                return self.loaded
+            self._load_attempted = True
+            if self.registry is not None and self.registry.current(self.name):
+                try:
+                    self._activate(self.registry.get(self.name))
+                    return True
+                except Exception:
+                    logger.exception("Could not load %s from the model registry; trying %s",
+                                     self.name, ", ".join(self.paths.values()))
+            missing = [path for path in self.paths.values() if not os.path.exists(path)]
+            if missing:
+                logger.warning("%s model artifacts not found (%s); %s disabled",
+                               self.kind, ", ".join(missing), self.kind)
+                return False
+            self._activate_built(self._build(self.paths, None))
+            logger.info("Loaded %s model from %s", self.kind, ", ".join(self.paths.values()))
+            return True
+
+    def swap(self, model_version: ModelVersion):
+        """Load, warm and activate a registry version; the previous model keeps
+        serving until this returns, and on error nothing changes"""
+        with self._lock:
+            self._load_attempted = True
+            self._activate(model_version)
+        logger.info("Serving %s %s", self.name, model_version.version)
+
+    def _activate(self, model_version: ModelVersion):
+        paths = {role: model_version.file(filename) for role, filename in self.ARTIFACTS.items()}
+        self._activate_built(self._build(paths, model_version.version))
+
+    def _activate_built(self, active):
+        batch = (WARMUP_TEXTS * (self.warmup_batch // len(WARMUP_TEXTS) + 1))[:max(self.warmup_batch, 1)]
+        self._score(active, batch)
+        if self._active is not None:
+            self.swaps += 1
+        self._active = active
+
+    def stats(self) -> dict:
+        return dict(self.latency.summary(), loaded=self.loaded, version=self.version, swaps=self.swaps,
+                    model_path=self.paths["model"])
+
+
+class _LoadedSpamModel:
+    def __init__(self, model, vectorizer, version: Optional[str]):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.spam_column = list(model.classes_).index(1)
+        self.version = version
+
+
+class SpamModelServer(ModelServer):
+    """Spam classifier + vectorizer loaded once and shared by every request"""
+
+    kind = "spam"
+    ARTIFACTS = {"model": "model.pkl", "vectorizer": "vectorizer.pkl"}
+
+    def __init__(self, model_path: str, vectorizer_path: str, registry: Optional[ModelRegistry] = None,
+                 name: Optional[str] = None, warmup_batch: int = 64):
+        super().__init__({"model": model_path, "vectorizer": vectorizer_path}, registry, name, warmup_batch)
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+
+    @property
+    def model(self):
+        active = self._active
+        return None if active is None else active.model
+
+    def _build(self, paths: Dict[str, str], version: Optional[str]) -> _LoadedSpamModel:
+        import joblib
+        return _LoadedSpamModel(joblib.load(paths["model"], mmap_mode="r"),
+                                joblib.load(paths["vectorizer"], mmap_mode="r"), version)
+
+    def _score(self, active: _LoadedSpamModel, texts: List[str]) -> List[float]:
+        probabilities = active.model.predict_proba(active.vectorizer.transform(texts))
+        return probabilities[:, active.spam_column].tolist()
+
+    def predict_spam_batch(self, texts: List[str]) -> Optional[List[float]]:
+        """Spam probability for each text, or None when no model is available"""
+        if not self.load():
+            return None
+        active = self._active
+        start = time.perf_counter()
+        scores = self._score(active, texts)
+        self.latency.observe(time.perf_counter() - start)
+        return scores
+
+    def predict_spam(self, text: str) -> Optional[float]:
+        scores = self.predict_spam_batch([text])
+        return None if scores is None else scores[0]
+
+
+class _LoadedCategoryModel:
+    def __init__(self, vectorizer, classes: List[str], coef_t: np.ndarray, intercept: np.ndarray,
+                 version: Optional[str]):
+        self.vectorizer = vectorizer
+        self.classes = classes
+        self.coef_t = coef_t
+        self.intercept = intercept
+        self.version = version
+
+
+class CategoryModelServer(ModelServer):
+    """Category classifier written by ml/train_category_classifier.py
+
+    The .npz artifact holds only arrays (class names, float32 coefficients and
+    the hashing parameters); the HashingVectorizer is stateless and rebuilt
+    here exactly as the trainer built it.
+    """
+
+    kind = "category"
+    ARTIFACTS = {"model": "model.npz"}
+
+    def __init__(self, model_path: str, registry: Optional[ModelRegistry] = None, name: Optional[str] = None,
+                 warmup_batch: int = 64):
+        super().__init__({"model": model_path}, registry, name, warmup_batch)
+        self.model_path = model_path
+
+    @property
+    def classes(self) -> Optional[List[str]]:
+        active = self._active
+        return None if active is None else active.classes
+
+    def _build(self, paths: Dict[str, str], version: Optional[str]) -> _LoadedCategoryModel:
+        from sklearn.feature_extraction.text import HashingVectorizer
+        with np.load(paths["model"]) as artifact:
+            # Must match hashing_vectorizer() in ml/train_category_classifier.py
+            vectorizer = HashingVectorizer(
+                n_features=int(artifact["n_features"]), ngram_range=(1, int(artifact["ngram_max"])),
+                alternate_sign=False, norm="l2", dtype=np.float32,
+            )
+            # Transposed once so scoring is a sparse (n, features) x dense (features, classes) product
+            return _LoadedCategoryModel(vectorizer, artifact["classes"].tolist(),
+                                        np.ascontiguousarray(artifact["coef"].T), artifact["intercept"], version)
+
+    def _score(self, active: _LoadedCategoryModel, texts: List[str]) -> List[Tuple[str, float]]:
+        scores = active.vectorizer.transform(texts) @ active.coef_t + active.intercept
+        if len(active.classes) == 2:
+            # Binary SGD models have one coefficient row, for classes[1]
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            probabilities = np.column_stack([1.0 - positive, positive])
+        else:
+            # One-vs-rest log-loss models: normalised logistic scores, as predict_proba does
+            probabilities = 1.0 / (1.0 + np.exp(-scores))
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return [(active.classes[i], float(probabilities[row, i])) for row, i in enumerate(best)]
+
+    def predict_batch(self, texts: List[str]) -> Optional[List[Tuple[str, float]]]:
+        """(category, probability) for each text, or None when no model is available"""
+        if not self.load():
+            return None
+        active = self._active
+        start = time.perf_counter()
+        predictions = self._score(active, texts)
+        self.latency.observe(time.perf_counter() - start)
+        return predictions
+
+
+class ModelWatcher:
+    """Polls the registry and hot-swaps servers whose CURRENT version changed
+
+    Loading and warming happen on the default executor, so the event loop and
+    the old model keep serving meanwhile. A version the registry rejects
+    (missing artifact, checksum mismatch) or that fails to load is logged and
+    skipped until CURRENT moves again; the old model stays live.
+    """
+
+    def __init__(self, models: ModelRegistry, servers: List[ModelServer], metrics=None, interval: float = 5.0):
+        self.models = models
+        self.servers = servers
+        self.interval = interval
+        self.reloads = None if metrics is None else metrics.counter(
+            "model_reloads_total", "Model registry hot-swaps by outcome", ("model", "outcome"))
+        self._failed: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self):
+        """Swap in any newly activated version; one pass of the watch loop"""
+        loop = asyncio.get_running_loop()
+        for server in self.servers:
+            version = self.models.current(server.name)
+            if version is None or version == server.version or self._failed.get(server.name) == version:
+                continue
+            try:
+                model_version = await loop.run_in_executor(None, self.models.get, server.name, version)
+                await loop.run_in_executor(None, server.swap, model_version)
+            except RegistryError as exc:
+                logger.warning("Keeping %s %s; %s", server.name, server.version, exc)
+                self._failed[server.name] = version
+                outcome = "rejected"
+            except Exception:
+                logger.exception("Keeping %s %s; could not load %s", server.name, server.version, version)
+                self._failed[server.name] = version
+                outcome = "failed"
+            else:
+                self._failed.pop(server.name, None)
+                outcome = "swapped"
+            if self.reloads is not None:
+                self.reloads.labels(server.name, outcome).inc()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Model registry check failed")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -3,39 +3,43 @@ MongoDB Integration for Smart Complaint Portal
 This script demonstrates how to integrate MongoDB for persistent user storage
 """
 
-from pymongo import MongoClient
-from passlib.context import CryptContext
 from datetime import datetime
+import asyncio
 import os
+import uuid
 from typing import Optional
 
-# Security configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from passwords import PasswordHasher
+from users import UserExists, create_user_repository
 
-# MongoDB connection
+# Security configuration: bcrypt runs on a bounded worker pool, never on the
+# event loop. Stored hashes made with another BCRYPT_ROUNDS are replaced on the
+# next successful login.
+PASSWORDS = PasswordHasher(
+    rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None,
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "0")) or None,
+)
+
+# MongoDB connection: pooled and opened on first use, not at import time
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URI)
-db = client.smartcomplaint
-users_collection = db.users
+USERS = create_user_repository(MONGO_URI, pool_size=int(os.getenv("MONGO_POOL_SIZE", "10")))
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    return await PASSWORDS.hash(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await PASSWORDS.verify(plain_password, hashed_password)
 
-def register_user(username: str, email: str, password: str, full_name: str, phone_number: Optional[str] = None):
+async def register_user(username: str, email: str, password: str, full_name: str, phone_number: Optional[str] = None):
     """Register a new user in MongoDB"""
-    # Check if user already exists
-    if users_collection.count_documents({'$or': [{'username': username}, {'email': email}]}) > 0:
-        return {"error": "User already exists"}
-    
     # Hash password
-    password_hash = hash_password(password)
-    
+    password_hash = await hash_password(password)
+
     # Create user document
+    now = datetime.now()
     user_doc = {
-        'user_id': str(datetime.now().timestamp()),  # Simple ID generation
+        'user_id': str(uuid.uuid4()),
         'username': username,
         'email': email,
         'password_hash': password_hash,
@@ -43,60 +47,64 @@ def register_user(username: str, email: str, password: str, full_name: str, phon
         'phone_number': phone_number,
         'role': 'user',
         'is_active': True,
-        'created_at': datetime.now(),
-        'updated_at': datetime.now()
+        'created_at': now,
+        'updated_at': now
     }
-    
-    # Insert user into MongoDB
-    result = users_collection.insert_one(user_doc)
-    
-    if result.inserted_id:
-        return {"success": True, "user_id": user_doc['user_id']}
-    else:
-        return {"error": "Failed to register user"}
-
-def authenticate_user(username_or_email: str, password: str):
+
+    # The unique username/email indexes reject an existing user atomically
+    try:
+        await USERS.create_user(user_doc)
+    except UserExists:
+        return {"error": "User already exists"}
+    return {"success": True, "user_id": user_doc['user_id']}
+
+async def authenticate_user(username_or_email: str, password: str):
     """Authenticate user against MongoDB"""
-    # Find user
-    user = users_collection.find_one({
-        '$or': [
-            {'username': username_or_email},
-            {'email': username_or_email}
-        ]
-    })
-    
+    # Find user (one indexed lookup, only the fields a login needs)
+    user = await USERS.find_by_login(username_or_email)
+
     if not user:
         return {"error": "User not found"}
-    
-    # Verify password
-    if verify_password(password, user['password_hash']):
-        return {"success": True, "user": user}
-    else:
+
+    # Verify password, upgrading hashes made with an outdated cost factor
+    valid, new_hash = await PASSWORDS.verify_and_update(password, user['password_hash'])
+    if not valid:
         return {"error": "Invalid password"}
+    if new_hash is not None:
+        await USERS.update_user(user['user_id'], password_hash=new_hash, updated_at=datetime.now())
+    user.pop('password_hash')
+    return {"success": True, "user": user}
 
-def get_all_users():
-    """Get all users from MongoDB"""
-    users = list(users_collection.find({}))
-    # Remove password hashes for security
-    for user in users:
-        user.pop('password_hash', None)
-    return users
+async def get_all_users(page_size: int = 500, **filters):
+    """Stream users from MongoDB a keyset page at a time, newest first
+    (password hashes are never fetched)"""
+    after = None
+    while True:
+        page = await USERS.list_users(page_size, after, **filters)
+        for user in page:
+            yield user
+        if len(page) < page_size:
+            return
+        after = (page[-1]['created_at'], page[-1]['user_id'])
 
-# Example usage
-if __name__ == "__main__":
+async def demo():
     print("MongoDB Integration Test")
     print("=" * 30)
-    
+    await USERS.ensure_indexes()
+
     # Test registration
-    result = register_user("testuser", "test@example.com", "password123", "Test User")
+    result = await register_user("testuser", "test@example.com", "password123", "Test User")
     print(f"Registration result: {result}")
-    
+
     # Test authentication
-    auth_result = authenticate_user("testuser", "password123")
+    auth_result = await authenticate_user("testuser", "password123")
     print(f"Authentication result: {auth_result}")
-    
+
     # Show all users
-    users = get_all_users()
-    print(f"Total users: {len(users)}")
-    for user in users:
-        print(f"  - {user['username']} ({user['email']})")
\ No newline at end of file
+    print(f"Total users: {await USERS.count_users()}")
+    async for user in get_all_users():
+        print(f"  - {user['username']} ({user['email']})")
+
+# Example usage
+if __name__ == "__main__":
+    asyncio.run(demo())
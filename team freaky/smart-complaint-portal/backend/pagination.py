@@ -0,0 +1,40 @@
+"""
+Keyset pagination cursors
+A listing sorted newest first by (created_at, id) resumes strictly after the
+last row of the previous page, so every page is an index range scan of
+``limit`` rows however deep the client pages, and concurrent inserts never
+shift or repeat rows the way OFFSET does. Cursors are opaque URL-safe tokens
+carrying that last sort key.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, key: str) -> str:
+    raw = json.dumps([created_at.isoformat(), key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """(created_at, id) the next page starts after; None for the first page"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, key = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(key)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
@@ -0,0 +1,74 @@
+"""
+Password hashing off the event loop
+bcrypt is deliberately slow (~80 ms at cost 10, ~300 ms at cost 12), so hashing
+and verifying run on a bounded thread pool; the bcrypt extension releases the
+GIL while it works, so the threads hash in parallel and the event loop keeps
+serving other requests. At most ``max_pending`` operations may be running or
+queued: further callers wait up to ``queue_timeout`` for a slot and then get
+PasswordHasherBusy, so a login burst turns into fast 503s instead of an
+unbounded queue of requests that time out anyway.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+
+class PasswordHasherBusy(RuntimeError):
+    pass
+
+
+class PasswordHasher:
+    """Async bcrypt hash/verify with a configurable cost factor"""
+
+    def __init__(self, rounds: int = 12, max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, queue_timeout: float = 5.0):
+        self.rounds = rounds
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 8
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.rejected = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to the loop running the app; recreate on a new loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def _run(self, fn, *args):
+        slots = self._semaphore()
+        try:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordHasherBusy(f"{self.max_pending} password operations already pending") from None
+        try:
+            return await self._loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(self.context.verify, password, password_hash)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """(valid, replacement hash); the replacement is set when the stored hash
+        was made with a different cost factor and should be saved in its place"""
+        return await self._run(self.context.verify_and_update, password, password_hash)
+
+    def needs_update(self, password_hash: str) -> bool:
+        return self.context.needs_update(password_hash)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
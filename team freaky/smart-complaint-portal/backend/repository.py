@@ -0,0 +1,856 @@
+"""
+Repository layer for complaints, forwards and clusters
+One async interface with three backends:
+  - InMemoryRepository: the module-level ComplaintStore/ForwardStore/dicts (default, used by tests)
+  - SQLiteRepository: a WAL-mode database file shared by every uvicorn worker
+  - PostgresRepository: the docker-compose PostgreSQL service
+The SQL backends follow the tables and indexes in database_schema.sql, with the
+SQLite compatibility notes applied (TEXT instead of GEOMETRY/JSONB) so the same
+DDL runs on both engines.
+"""
+
+import asyncio
+import json
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from analytics import store_counts
+from storage import ComplaintStore, ForwardStore
+
+# (record field, complaints column) pairs in SELECT/INSERT order
+COMPLAINT_COLUMN_MAP = (
+    ("complaint_id", "id"), ("title", "title"), ("description", "description"),
+    ("category", "category"), ("location", "original_location"), ("attachments", "attachments"),
+    ("language_tag", "language_tag"), ("spam_score", "spam_score"),
+    ("predicted_class", "predicted_class"), ("ml_confidence_score", "ml_confidence_score"),
+    ("recurrence_flag", "recurrence_flag"), ("cluster_id", "cluster_id"),
+    ("duplicate_similarity_score", "duplicate_similarity_score"),
+    ("created_at", "created_at"), ("updated_at", "updated_at"), ("submitted_by", "submitted_by"),
+)
+COMPLAINT_FIELDS = tuple(field for field, _ in COMPLAINT_COLUMN_MAP)
+COMPLAINT_COLUMN_NAMES = dict(COMPLAINT_COLUMN_MAP)
+
+FORWARD_FIELDS = (
+    "forward_id", "complaint_id", "recipient_department", "recipient_officer_id",
+    "recipient_officer_name", "remarks", "follow_up_date", "priority_level", "status",
+    "sla_deadline", "sla_status", "recurrence_flag", "previous_occurrences_count",
+    "cluster_id", "duplicate_similarity_score", "ml_confidence_score", "forwarded_by",
+    "created_at", "updated_at", "undo_token", "undo_expires_at",
+)
+
+def complaint_filters(category: Optional[str] = None, predicted_class: Optional[str] = None,
+                      recurrence_flag: Optional[bool] = None, submitted_by: Optional[str] = None,
+                      min_spam_score: Optional[float] = None, max_spam_score: Optional[float] = None,
+                      created_after: Optional[datetime] = None,
+                      created_before: Optional[datetime] = None) -> dict:
+    """Filters for a complaint listing, leaving out the unset ones
+
+    created_after is inclusive and created_before exclusive; the spam score
+    bounds are both inclusive.
+    """
+    filters = {
+        "category": category, "predicted_class": predicted_class, "recurrence_flag": recurrence_flag,
+        "submitted_by": submitted_by, "min_spam_score": min_spam_score, "max_spam_score": max_spam_score,
+        "created_after": created_after, "created_before": created_before,
+    }
+    return {field: value for field, value in filters.items() if value is not None}
+
+def forward_filters(recipient_department: Optional[str] = None, sla_status: Optional[str] = None,
+                    priority_level: Optional[str] = None, status: Optional[str] = None,
+                    created_after: Optional[datetime] = None, created_before: Optional[datetime] = None) -> dict:
+    """Filters for a forward export, leaving out the unset ones; created_after is
+    inclusive and created_before exclusive"""
+    filters = {
+        "recipient_department": recipient_department, "sla_status": sla_status, "priority_level": priority_level,
+        "status": status, "created_after": created_after, "created_before": created_before,
+    }
+    return {field: value for field, value in filters.items() if value is not None}
+
+
+# Maximum ids bound into a single "IN (...)" query
+IN_CLAUSE_CHUNK = 500
+
+CLUSTER_FIELDS = ("cluster_id", "centroid_location", "complaint_count", "severity", "last_seen")
+
+SESSION_FIELDS = (
+    "session_id", "user_id", "token", "selected_role", "ip_address", "user_agent", "expires_at", "created_at",
+)
+
+# database_schema.sql with the SQLite compatibility notes applied
+SCHEMA_TABLES = [
+    """CREATE TABLE IF NOT EXISTS complaints (
+        id VARCHAR(36) PRIMARY KEY,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL,
+        category VARCHAR(50) NOT NULL,
+        original_location TEXT,
+        attachments TEXT,
+        language_tag VARCHAR(10) DEFAULT 'en',
+        spam_score DECIMAL(3,2),
+        predicted_class VARCHAR(50),
+        ml_confidence_score DECIMAL(3,2),
+        recurrence_flag BOOLEAN DEFAULT FALSE,
+        cluster_id VARCHAR(36),
+        duplicate_similarity_score DECIMAL(3,2),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        soft_delete BOOLEAN DEFAULT FALSE,
+        submitted_by VARCHAR(36)
+    )""",
+    """CREATE TABLE IF NOT EXISTS forwards (
+        forward_id VARCHAR(36) PRIMARY KEY,
+        complaint_id VARCHAR(36) NOT NULL,
+        recipient_department VARCHAR(100) NOT NULL,
+        recipient_officer_id VARCHAR(36) NOT NULL,
+        recipient_officer_name VARCHAR(100) NOT NULL,
+        remarks TEXT,
+        follow_up_date TIMESTAMP,
+        priority_level VARCHAR(20) NOT NULL,
+        status VARCHAR(20) DEFAULT 'Pending',
+        sla_deadline TIMESTAMP NOT NULL,
+        sla_status VARCHAR(20) DEFAULT 'On-Track',
+        recurrence_flag BOOLEAN DEFAULT FALSE,
+        previous_occurrences_count INTEGER DEFAULT 0,
+        cluster_id VARCHAR(36),
+        duplicate_similarity_score DECIMAL(3,2),
+        ml_confidence_score DECIMAL(3,2),
+        forwarded_by VARCHAR(36) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        undo_token VARCHAR(36),
+        undo_expires_at TIMESTAMP,
+        FOREIGN KEY (complaint_id) REFERENCES complaints(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS clusters (
+        cluster_id VARCHAR(36) PRIMARY KEY,
+        centroid_location TEXT,
+        complaint_count INTEGER DEFAULT 0,
+        severity VARCHAR(20) DEFAULT 'Low',
+        last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    # database_schema_extended.sql; users may live in MongoDB, so no foreign key
+    """CREATE TABLE IF NOT EXISTS sessions (
+        session_id VARCHAR(36) PRIMARY KEY,
+        user_id VARCHAR(36) NOT NULL,
+        token VARCHAR(255) UNIQUE NOT NULL,
+        selected_role VARCHAR(20) NOT NULL CHECK (selected_role IN ('admin', 'user', 'volunteer')),
+        ip_address VARCHAR(45),
+        user_agent TEXT,
+        expires_at TIMESTAMP NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+]
+
+SCHEMA_INDEXES = [
+    # Listing indexes: each equality filter leads, then the (created_at, id)
+    # sort key, so a filtered newest-first page is one index range scan
+    "CREATE INDEX IF NOT EXISTS idx_complaints_created_at_id ON complaints(created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_category_created_at ON complaints(category, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_predicted_class_created_at "
+    "ON complaints(predicted_class, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_recurrence_flag_created_at "
+    "ON complaints(recurrence_flag, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_submitted_by_created_at ON complaints(submitted_by, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_complaints_spam_score ON complaints(spam_score)",
+    # Superseded by the listing indexes, which start with the same column
+    "DROP INDEX IF EXISTS idx_complaints_created_at",
+    "DROP INDEX IF EXISTS idx_complaints_category",
+    "DROP INDEX IF EXISTS idx_complaints_recurrence_flag",
+    "CREATE INDEX IF NOT EXISTS idx_forwards_complaint_id ON forwards(complaint_id)",
+    "CREATE INDEX IF NOT EXISTS idx_forwards_sla_deadline ON forwards(sla_deadline)",
+    "CREATE INDEX IF NOT EXISTS idx_forwards_sla_status ON forwards(sla_status)",
+    "CREATE INDEX IF NOT EXISTS idx_forwards_priority_level ON forwards(priority_level)",
+    "CREATE INDEX IF NOT EXISTS idx_forwards_created_at_id ON forwards(created_at, forward_id)",
+    "CREATE INDEX IF NOT EXISTS idx_clusters_last_seen ON clusters(last_seen)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id)",
+]
+
+SCHEMA = SCHEMA_TABLES + SCHEMA_INDEXES
+
+# Columns added after their table was first released: (table, column, type).
+# CREATE TABLE IF NOT EXISTS leaves older tables alone, so these are added
+# to existing databases before the indexes that use them are created.
+ADDED_COLUMNS = [
+    ("complaints", "duplicate_similarity_score", "DECIMAL(3,2)"),
+    ("complaints", "submitted_by", "VARCHAR(36)"),  # database_schema_extended.sql
+]
+
+# Complaint listing filter -> condition; range filters are checked on the rows
+# the (created_at, id) order or an equality filter's index yields
+COMPLAINT_FILTER_CONDITIONS = {
+    "category": "category = ?",
+    "predicted_class": "predicted_class = ?",
+    "recurrence_flag": "recurrence_flag = ?",
+    "submitted_by": "submitted_by = ?",
+    "min_spam_score": "spam_score >= ?",
+    "max_spam_score": "spam_score <= ?",
+    "created_after": "created_at >= ?",
+    "created_before": "created_at < ?",
+}
+
+# Forward export filter -> condition, checked along the (created_at, forward_id) order
+FORWARD_FILTER_CONDITIONS = {
+    "recipient_department": "recipient_department = ?",
+    "sla_status": "sla_status = ?",
+    "priority_level": "priority_level = ?",
+    "status": "status = ?",
+    "created_after": "created_at >= ?",
+    "created_before": "created_at < ?",
+}
+
+COMPLAINT_COLUMNS = ", ".join(column for _, column in COMPLAINT_COLUMN_MAP)
+FORWARD_COLUMNS = ", ".join(FORWARD_FIELDS)
+CLUSTER_COLUMNS = ", ".join(CLUSTER_FIELDS)
+SESSION_COLUMNS = ", ".join(SESSION_FIELDS)
+
+QUERIES = {
+    "insert_complaint": f"INSERT INTO complaints ({COMPLAINT_COLUMNS}) VALUES ({', '.join('?' * len(COMPLAINT_FIELDS))})",
+    "get_complaint": f"SELECT {COMPLAINT_COLUMNS} FROM complaints WHERE id = ? AND soft_delete = FALSE",
+    "count_complaints": "SELECT COUNT(*) FROM complaints WHERE soft_delete = FALSE",
+    "list_complaints": f"SELECT {COMPLAINT_COLUMNS} FROM complaints WHERE soft_delete = FALSE",
+    "insert_forward": f"INSERT INTO forwards ({FORWARD_COLUMNS}) VALUES ({', '.join('?' * len(FORWARD_FIELDS))})",
+    "get_forward": f"SELECT {FORWARD_COLUMNS} FROM forwards WHERE forward_id = ?",
+    "forwards_for_complaint": f"SELECT {FORWARD_COLUMNS} FROM forwards WHERE complaint_id = ? ORDER BY created_at",
+    "count_forwards": "SELECT COUNT(*) FROM forwards",
+    "list_forwards": f"SELECT {FORWARD_COLUMNS} FROM forwards WHERE 1 = 1",
+    "forwards_by_sla_status": f"SELECT {FORWARD_COLUMNS} FROM forwards WHERE sla_status = ?",
+    "update_sla_status": "UPDATE forwards SET sla_status = ?, updated_at = ? WHERE forward_id = ?",
+    "upsert_cluster": (
+        f"INSERT INTO clusters ({CLUSTER_COLUMNS}) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (cluster_id) DO UPDATE SET centroid_location = excluded.centroid_location, "
+        "complaint_count = excluded.complaint_count, severity = excluded.severity, "
+        "last_seen = excluded.last_seen"
+    ),
+    "get_cluster": f"SELECT {CLUSTER_COLUMNS} FROM clusters WHERE cluster_id = ?",
+    "insert_session": f"INSERT INTO sessions ({SESSION_COLUMNS}) VALUES ({', '.join('?' * len(SESSION_FIELDS))})",
+    "get_session": f"SELECT {SESSION_COLUMNS} FROM sessions WHERE session_id = ?",
+    "delete_session": "DELETE FROM sessions WHERE session_id = ?",
+    "ping": "SELECT 1",
+    # Aggregates an analytics rollup is rebuilt from
+    "complaints_by_category": "SELECT category, COUNT(*) FROM complaints WHERE soft_delete = FALSE GROUP BY category",
+    "complaints_by_day": (
+        "SELECT DATE(created_at), COUNT(*) FROM complaints "
+        "WHERE soft_delete = FALSE AND created_at IS NOT NULL GROUP BY DATE(created_at)"
+    ),
+    "forwards_by_department": (
+        "SELECT recipient_department, sla_status, COUNT(*) FROM forwards GROUP BY recipient_department, sla_status"
+    ),
+    "open_forwards": (
+        "SELECT forward_id, recipient_department, sla_status FROM forwards WHERE sla_status IN ('On-Track', 'At-Risk')"
+    ),
+}
+
+
+class ComplaintRepository:
+    """Async storage interface shared by every backend"""
+
+    async def create_complaint(self, record: dict) -> None:
+        raise NotImplementedError
+
+    async def get_complaint(self, complaint_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def count_complaints(self, **filters) -> int:
+        raise NotImplementedError
+
+    async def list_complaints(self, limit: int, after: Optional[Tuple[datetime, str]] = None,
+                              **filters) -> List[dict]:
+        """Up to ``limit`` complaints matching ``filters`` (see complaint_filters), newest
+        first, strictly after the (created_at, complaint_id) key ``after``"""
+        raise NotImplementedError
+
+    async def export_complaints(self, chunk_size: int, **filters) -> AsyncIterator[List[dict]]:
+        """Every complaint matching ``filters``, newest first, in lists of up to ``chunk_size``
+
+        Each chunk is the keyset page following the previous one, so one chunk
+        is held at a time and complaints submitted after the export started
+        are left out.
+        """
+        after = None
+        while True:
+            chunk = await self.list_complaints(chunk_size, after, **filters)
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            after = chunk[-1]["created_at"], chunk[-1]["complaint_id"]
+
+    async def export_forwards(self, chunk_size: int, **filters) -> AsyncIterator[List[dict]]:
+        """Every forward matching ``filters`` (see forward_filters), newest first, in
+        lists of up to ``chunk_size``; forwards made after the export started are left out"""
+        raise NotImplementedError
+        yield  # an async generator, like the implementations, so ``async for`` reaches the raise
+
+    async def add_forward(self, record: dict) -> None:
+        raise NotImplementedError
+
+    async def add_complaints(self, records: List[dict]) -> None:
+        """Insert many complaints in a single transaction"""
+        raise NotImplementedError
+
+    async def get_complaints(self, complaint_ids) -> Dict[str, dict]:
+        """Fetch every existing complaint among ``complaint_ids`` in one bulk lookup"""
+        raise NotImplementedError
+
+    async def update_complaint(self, complaint_id: str, **changes) -> None:
+        raise NotImplementedError
+
+    async def add_forwards(self, records: List[dict]) -> None:
+        """Insert many forwards in a single transaction"""
+        raise NotImplementedError
+
+    async def get_forward(self, forward_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def forwards_for_complaint(self, complaint_id: str) -> List[dict]:
+        raise NotImplementedError
+
+    async def count_forwards(self) -> int:
+        raise NotImplementedError
+
+    async def forwards_by_sla_status(self, sla_status: str, limit: Optional[int] = None) -> List[dict]:
+        """Forwards currently in ``sla_status``, read through the sla_status index"""
+        raise NotImplementedError
+
+    async def update_sla_statuses(self, updates: List[Tuple[str, str]], updated_at: datetime) -> None:
+        """Apply (forward_id, sla_status) changes in one transaction"""
+        raise NotImplementedError
+
+    async def upsert_cluster(self, record: dict) -> None:
+        raise NotImplementedError
+
+    async def upsert_clusters(self, records: List[dict]) -> None:
+        raise NotImplementedError
+
+    async def get_cluster(self, cluster_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def get_clusters(self, cluster_ids) -> Dict[str, dict]:
+        raise NotImplementedError
+
+    async def create_session(self, record: dict) -> None:
+        raise NotImplementedError
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def delete_session(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    async def rollup_counts(self) -> dict:
+        """Aggregate counts an analytics rollup is rebuilt from (see analytics.store_counts)"""
+        raise NotImplementedError
+
+    async def ping(self) -> None:
+        """Round trip to the backing store; raises when it is unreachable"""
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryRepository(ComplaintRepository):
+    """Process-local storage; lost on restart and not shared across workers"""
+
+    def __init__(self, complaints: Optional[ComplaintStore] = None, forwards: Optional[ForwardStore] = None,
+                 clusters: Optional[dict] = None):
+        self.complaints = complaints if complaints is not None else ComplaintStore()
+        self.forwards = forwards if forwards is not None else ForwardStore()
+        self.clusters = clusters if clusters is not None else {}
+        self.sessions: Dict[str, dict] = {}
+
+    async def create_complaint(self, record: dict) -> None:
+        self.complaints.add(record)
+
+    async def get_complaint(self, complaint_id: str) -> Optional[dict]:
+        return self.complaints.record(complaint_id)
+
+    async def count_complaints(self, **filters) -> int:
+        return self.complaints.count(**filters)
+
+    async def list_complaints(self, limit: int, after: Optional[Tuple[datetime, str]] = None,
+                              **filters) -> List[dict]:
+        return self.complaints.page(limit, after, **filters)
+
+    async def add_forward(self, record: dict) -> None:
+        self.forwards.add(record)
+
+    async def add_complaints(self, records: List[dict]) -> None:
+        self.complaints.add_many(records)
+
+    async def get_complaints(self, complaint_ids) -> Dict[str, dict]:
+        return {cid: self.complaints[cid] for cid in complaint_ids if cid in self.complaints}
+
+    async def update_complaint(self, complaint_id: str, **changes) -> None:
+        self.complaints.update(complaint_id, **changes)
+
+    async def add_forwards(self, records: List[dict]) -> None:
+        for record in records:
+            self.forwards.add(record)
+
+    async def get_forward(self, forward_id: str) -> Optional[dict]:
+        return self.forwards.get(forward_id)
+
+    async def forwards_for_complaint(self, complaint_id: str) -> List[dict]:
+        return self.forwards.by_complaint(complaint_id)
+
+    async def count_forwards(self) -> int:
+        return len(self.forwards)
+
+    async def forwards_by_sla_status(self, sla_status: str, limit: Optional[int] = None) -> List[dict]:
+        return self.forwards.by_sla_status(sla_status, limit)
+
+    async def export_forwards(self, chunk_size: int, **filters) -> AsyncIterator[List[dict]]:
+        before = None
+        while before != 0:
+            chunk, before = self.forwards.newest(chunk_size, before, **filters)
+            if chunk:
+                yield chunk
+            else:
+                # Let other requests run while a selective filter skips forwards
+                await asyncio.sleep(0)
+
+    async def update_sla_statuses(self, updates: List[Tuple[str, str]], updated_at: datetime) -> None:
+        for forward_id, sla_status in updates:
+            if forward_id in self.forwards:
+                self.forwards.update(forward_id, sla_status=sla_status, updated_at=updated_at)
+
+    async def upsert_cluster(self, record: dict) -> None:
+        self.clusters[record["cluster_id"]] = record
+
+    async def upsert_clusters(self, records: List[dict]) -> None:
+        for record in records:
+            self.clusters[record["cluster_id"]] = record
+
+    async def get_cluster(self, cluster_id: str) -> Optional[dict]:
+        return self.clusters.get(cluster_id)
+
+    async def get_clusters(self, cluster_ids) -> Dict[str, dict]:
+        return {cid: self.clusters[cid] for cid in cluster_ids if cid in self.clusters}
+
+    async def create_session(self, record: dict) -> None:
+        self.sessions[record["session_id"]] = record
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        return self.sessions.get(session_id)
+
+    async def delete_session(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+
+    async def rollup_counts(self) -> dict:
+        return store_counts(self.complaints, self.forwards)
+
+
+# Row conversion helpers shared by the SQL backends
+def _timestamp(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="microseconds")
+    return value
+
+
+def _datetime(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+_JSON_FIELDS = {"location", "attachments", "centroid_location"}
+_FLOAT_FIELDS = {"spam_score", "ml_confidence_score", "duplicate_similarity_score"}
+_BOOL_FIELDS = {"recurrence_flag"}
+_TIMESTAMP_FIELDS = {
+    "created_at", "updated_at", "follow_up_date", "sla_deadline", "undo_expires_at", "last_seen", "expires_at",
+}
+_DEFAULTS = {"location": {}, "attachments": [], "language_tag": "en", "duplicate_similarity_score": 0.0,
+             "complaint_count": 0, "severity": "Low"}
+
+
+def _encode(field: str, value):
+    if field in _JSON_FIELDS:
+        return None if value is None else json.dumps(value)
+    if field in _TIMESTAMP_FIELDS:
+        return _timestamp(value)
+    if field in _BOOL_FIELDS:
+        return bool(value)
+    return value
+
+
+def _decode(field: str, value):
+    if field in _JSON_FIELDS:
+        return json.loads(value) if value else _DEFAULTS.get(field)
+    if field in _TIMESTAMP_FIELDS:
+        return _datetime(value)
+    if field in _FLOAT_FIELDS:
+        return _float(value)
+    if field in _BOOL_FIELDS:
+        return bool(value)
+    return value
+
+
+def _to_row(fields, record: dict) -> tuple:
+    return tuple(_encode(field, record.get(field, _DEFAULTS.get(field))) for field in fields)
+
+
+def _from_row(fields, row) -> dict:
+    return {field: _decode(field, value) for field, value in zip(fields, row)}
+
+
+def _complaint_row(record: dict) -> tuple:
+    return _to_row(COMPLAINT_FIELDS, record)
+
+
+def _complaint_record(row) -> dict:
+    return _from_row(COMPLAINT_FIELDS, row)
+
+
+def _forward_row(record: dict) -> tuple:
+    return _to_row(FORWARD_FIELDS, record)
+
+
+def _forward_record(row) -> dict:
+    return _from_row(FORWARD_FIELDS, row)
+
+
+def _cluster_row(record: dict) -> tuple:
+    return _to_row(CLUSTER_FIELDS, record)
+
+
+def _cluster_record(row) -> dict:
+    return _from_row(CLUSTER_FIELDS, row)
+
+
+def _session_row(record: dict) -> tuple:
+    return _to_row(SESSION_FIELDS, record)
+
+
+def _session_record(row) -> dict:
+    return _from_row(SESSION_FIELDS, row)
+
+
+class _SQLRepository(ComplaintRepository):
+    """DB-API backed repository: a fixed pool of connections driven from a thread pool"""
+
+    placeholder = "?"
+
+    def __init__(self, pool_size: int = 4):
+        self.pool_size = pool_size
+        self._pool: Optional[queue.Queue] = None
+        self._pool_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="repository")
+        self._queries = {name: sql.replace("?", self.placeholder) for name, sql in QUERIES.items()}
+
+    def _connect(self):
+        raise NotImplementedError
+
+    def _ensure_pool(self) -> queue.Queue:
+        # Connections are opened on first use so importing the app never
+        # blocks on (or fails because of) an unavailable database
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    pool = queue.Queue()
+                    for _ in range(self.pool_size):
+                        pool.put(self._connect())
+                    conn = pool.get()
+                    try:
+                        self._create_schema(conn)
+                    finally:
+                        pool.put(conn)
+                    self._pool = pool
+        return self._pool
+
+    @staticmethod
+    def _create_schema(conn):
+        with conn:
+            cursor = conn.cursor()
+            for statement in SCHEMA_TABLES:
+                cursor.execute(statement)
+            for table, column, column_type in ADDED_COLUMNS:
+                cursor.execute(f"SELECT * FROM {table} WHERE 1 = 0")
+                if column not in {description[0] for description in cursor.description}:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            for statement in SCHEMA_INDEXES:
+                cursor.execute(statement)
+            cursor.close()
+
+    def _transaction(self, fn, *args):
+        pool = self._ensure_pool()
+        conn = pool.get()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                try:
+                    return fn(cursor, *args)
+                finally:
+                    cursor.close()
+        finally:
+            pool.put(conn)
+
+    def _executemany(self, cursor, sql: str, rows: List[tuple]):
+        cursor.executemany(sql, rows)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._transaction, fn, *args)
+
+    async def _run_many(self, name: str, rows: List[tuple]):
+        """Run one statement for every row in a single transaction"""
+        if not rows:
+            return
+        sql = self._queries[name]
+
+        def run(cursor):
+            self._executemany(cursor, sql, rows)
+        await self._run(run)
+
+    def _execute(self, name: str, params=()):
+        sql = self._queries[name]
+
+        def run(cursor):
+            cursor.execute(sql, params)
+        return run
+
+    def _fetch_one(self, name: str, params, convert):
+        sql = self._queries[name]
+
+        def run(cursor):
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+            return convert(row) if row is not None else None
+        return run
+
+    def _fetch_all(self, name: str, params, convert):
+        sql = self._queries[name]
+
+        def run(cursor):
+            cursor.execute(sql, params)
+            return [convert(row) for row in cursor.fetchall()]
+        return run
+
+    async def create_complaint(self, record: dict) -> None:
+        await self._run(self._execute("insert_complaint", _complaint_row(record)))
+
+    async def get_complaint(self, complaint_id: str) -> Optional[dict]:
+        return await self._run(self._fetch_one("get_complaint", (complaint_id,), _complaint_record))
+
+    def _conditions(self, sql: str, conditions: Dict[str, str], filters: dict) -> Tuple[str, list]:
+        params = []
+        for field, value in filters.items():
+            if value is None:
+                continue
+            sql += " AND " + conditions[field].replace("?", self.placeholder)
+            params.append(_timestamp(value) if field.startswith("created_") else value)
+        return sql, params
+
+    async def count_complaints(self, **filters) -> int:
+        sql, params = self._conditions(self._queries["count_complaints"], COMPLAINT_FILTER_CONDITIONS, filters)
+
+        def run(cursor):
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+        return await self._run(run)
+
+    async def list_complaints(self, limit: int, after: Optional[Tuple[datetime, str]] = None,
+                              **filters) -> List[dict]:
+        sql, params = self._conditions(self._queries["list_complaints"], COMPLAINT_FILTER_CONDITIONS, filters)
+        if after is not None:
+            # Row-value comparison, so the keyset bound is part of the index range
+            sql += f" AND (created_at, id) < ({self.placeholder}, {self.placeholder})"
+            params += [_timestamp(after[0]), after[1]]
+        sql += f" ORDER BY created_at DESC, id DESC LIMIT {self.placeholder}"
+        params.append(limit)
+
+        def run(cursor):
+            cursor.execute(sql, params)
+            return [_complaint_record(row) for row in cursor.fetchall()]
+        return await self._run(run)
+
+    async def add_forward(self, record: dict) -> None:
+        await self._run(self._execute("insert_forward", _forward_row(record)))
+
+    def _fetch_in(self, select: str, key_column: str, keys, convert, key_field: str):
+        keys = list(keys)
+
+        def run(cursor):
+            found = {}
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), IN_CLAUSE_CHUNK):
+                chunk = keys[start:start + IN_CLAUSE_CHUNK]
+                marks = ", ".join([self.placeholder] * len(chunk))
+                cursor.execute(f"{select} AND {key_column} IN ({marks})", chunk)
+                for row in cursor.fetchall():
+                    record = convert(row)
+                    found[record[key_field]] = record
+            return found
+        return run
+
+    async def add_complaints(self, records: List[dict]) -> None:
+        await self._run_many("insert_complaint", [_complaint_row(record) for record in records])
+
+    async def get_complaints(self, complaint_ids) -> Dict[str, dict]:
+        select = f"SELECT {COMPLAINT_COLUMNS} FROM complaints WHERE soft_delete = FALSE"
+        return await self._run(self._fetch_in(select, "id", complaint_ids, _complaint_record, "complaint_id"))
+
+    async def update_complaint(self, complaint_id: str, **changes) -> None:
+        if not changes:
+            return
+        fields = list(changes)
+        assignments = ", ".join(f"{COMPLAINT_COLUMN_NAMES[field]} = {self.placeholder}" for field in fields)
+        sql = f"UPDATE complaints SET {assignments} WHERE id = {self.placeholder}"
+        params = [_encode(field, changes[field]) for field in fields] + [complaint_id]
+
+        def run(cursor):
+            cursor.execute(sql, params)
+        await self._run(run)
+
+    async def add_forwards(self, records: List[dict]) -> None:
+        await self._run_many("insert_forward", [_forward_row(record) for record in records])
+
+    async def get_forward(self, forward_id: str) -> Optional[dict]:
+        return await self._run(self._fetch_one("get_forward", (forward_id,), _forward_record))
+
+    async def forwards_for_complaint(self, complaint_id: str) -> List[dict]:
+        return await self._run(self._fetch_all("forwards_for_complaint", (complaint_id,), _forward_record))
+
+    async def count_forwards(self) -> int:
+        return await self._run(self._fetch_one("count_forwards", (), lambda row: row[0]))
+
+    async def forwards_by_sla_status(self, sla_status: str, limit: Optional[int] = None) -> List[dict]:
+        sql = self._queries["forwards_by_sla_status"]
+        params = [sla_status]
+        if limit is not None:
+            sql += f" LIMIT {self.placeholder}"
+            params.append(limit)
+
+        def run(cursor):
+            cursor.execute(sql, params)
+            return [_forward_record(row) for row in cursor.fetchall()]
+        return await self._run(run)
+
+    async def export_forwards(self, chunk_size: int, **filters) -> AsyncIterator[List[dict]]:
+        select, params = self._conditions(self._queries["list_forwards"], FORWARD_FILTER_CONDITIONS, filters)
+        after = None
+        while True:
+            sql, chunk_params = select, list(params)
+            if after is not None:
+                sql += f" AND (created_at, forward_id) < ({self.placeholder}, {self.placeholder})"
+                chunk_params += [_timestamp(after[0]), after[1]]
+            sql += f" ORDER BY created_at DESC, forward_id DESC LIMIT {self.placeholder}"
+            chunk_params.append(chunk_size)
+
+            def run(cursor):
+                cursor.execute(sql, chunk_params)
+                return [_forward_record(row) for row in cursor.fetchall()]
+            chunk = await self._run(run)
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            after = chunk[-1]["created_at"], chunk[-1]["forward_id"]
+
+    async def update_sla_statuses(self, updates: List[Tuple[str, str]], updated_at: datetime) -> None:
+        stamp = _timestamp(updated_at)
+        await self._run_many("update_sla_status", [(status, stamp, forward_id) for forward_id, status in updates])
+
+    async def upsert_cluster(self, record: dict) -> None:
+        await self._run(self._execute("upsert_cluster", _cluster_row(record)))
+
+    async def upsert_clusters(self, records: List[dict]) -> None:
+        await self._run_many("upsert_cluster", [_cluster_row(record) for record in records])
+
+    async def get_cluster(self, cluster_id: str) -> Optional[dict]:
+        return await self._run(self._fetch_one("get_cluster", (cluster_id,), _cluster_record))
+
+    async def get_clusters(self, cluster_ids) -> Dict[str, dict]:
+        select = f"SELECT {CLUSTER_COLUMNS} FROM clusters WHERE 1 = 1"
+        return await self._run(self._fetch_in(select, "cluster_id", cluster_ids, _cluster_record, "cluster_id"))
+
+    async def create_session(self, record: dict) -> None:
+        await self._run(self._execute("insert_session", _session_row(record)))
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        return await self._run(self._fetch_one("get_session", (session_id,), _session_record))
+
+    async def delete_session(self, session_id: str) -> None:
+        await self._run(self._execute("delete_session", (session_id,)))
+
+    async def rollup_counts(self) -> dict:
+        queries = self._queries
+
+        def run(cursor):
+            cursor.execute(queries["complaints_by_category"])
+            by_category = dict(cursor.fetchall())
+            cursor.execute(queries["complaints_by_day"])
+            # DATE() is a text column on SQLite and a date on PostgreSQL
+            by_day = {day if isinstance(day, date) else date.fromisoformat(day): count
+                      for day, count in cursor.fetchall()}
+            cursor.execute(queries["forwards_by_department"])
+            forwards = [tuple(row) for row in cursor.fetchall()]
+            cursor.execute(queries["open_forwards"])
+            return {"complaints_by_category": by_category, "complaints_by_day": by_day,
+                    "forwards": forwards, "open_forwards": [tuple(row) for row in cursor.fetchall()]}
+        return await self._run(run)
+
+    async def ping(self) -> None:
+        await self._run(self._execute("ping"))
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._pool is not None:
+            while not self._pool.empty():
+                self._pool.get_nowait().close()
+            self._pool = None
+
+
+class SQLiteRepository(_SQLRepository):
+    """SQLite file in WAL mode so several worker processes can share it"""
+
+    def __init__(self, path: str, pool_size: int = 4):
+        # Every connection to ":memory:" would be a separate database
+        super().__init__(pool_size=1 if path == ":memory:" else pool_size)
+        self.path = path
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+
+class PostgresRepository(_SQLRepository):
+    """PostgreSQL via psycopg2 with the same schema and queries as SQLite"""
+
+    placeholder = "%s"
+
+    def __init__(self, dsn: str, pool_size: int = 4):
+        super().__init__(pool_size=pool_size)
+        self.dsn = dsn
+
+    def _connect(self):
+        import psycopg2
+        return psycopg2.connect(self.dsn)
+
+    def _executemany(self, cursor, sql: str, rows: List[tuple]):
+        # psycopg2's executemany is one round trip per row; batch them instead
+        from psycopg2.extras import execute_batch
+        execute_batch(cursor, sql, rows, page_size=500)
+
+
+def create_repository(url: Optional[str] = None, pool_size: int = 4, **memory_stores) -> ComplaintRepository:
+    """Build a repository from a DATABASE_URL-style string; no URL means in-memory"""
+    if not url or url.startswith("memory://"):
+        return InMemoryRepository(**memory_stores)
+    if url.startswith("sqlite:///"):
+        return SQLiteRepository(url[len("sqlite:///"):], pool_size=pool_size)
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresRepository(url, pool_size=pool_size)
+    raise ValueError(f"Unsupported DATABASE_URL: {url}")
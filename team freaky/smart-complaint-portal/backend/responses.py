@@ -0,0 +1,49 @@
+"""
+JSON responses rendered straight from stored records
+The complaint endpoints return the record the repository already holds.
+Everything in it was validated on the way in (ComplaintCreate/ForwardRequest
+plus values the server computed), so it is not rebuilt into a pydantic model
+and re-validated against ``response_model`` on the way out. orjson encodes the
+dict in one pass, datetimes included, in the format pydantic would have used.
+Without orjson the standard library encoder is used.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Z for UTC, as pydantic writes it; numpy scalars as plain numbers
+    _OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if value.utcoffset() == timedelta(0) else text
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """Compact JSON for a response body"""
+    if orjson is not None:
+        return orjson.dumps(content, option=_OPTIONS)
+    return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+class RecordResponse(JSONResponse):
+    """JSONResponse for plain dicts/lists of stored records; skips FastAPI's response validation"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,150 @@
+"""
+Signed session tokens
+Logins get an HS256 JWT naming the user (sub), the session (sid) and the
+selected role. The session itself is a row in the sessions table
+(database_schema_extended.sql) holding a SHA-256 digest of the token, so a
+token is only accepted while its session exists: deleting the row revokes it.
+
+Verifying a token costs a signature check plus a database read, so verified
+tokens are kept in an LRU cache for up to ``cache_ttl`` seconds (never past
+their own expiry) and most requests skip both. Revoking a session drops its
+cached token at once in this process; other worker processes keep accepting
+it for at most ``cache_ttl`` seconds, until their cached entry expires.
+"""
+
+import hashlib
+import hmac
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import jwt
+
+ALGORITHM = "HS256"
+
+
+class InvalidSession(Exception):
+    pass
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """LRU of token -> claims with per-entry expiry, indexed by session id for revocation"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._tokens_by_session: Dict[str, str] = {}
+        # Recently revoked session ids: a verification that raced the
+        # revocation must not put the token back
+        self._revoked: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[dict]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= self.clock():
+            self._remove(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: dict, ttl: Optional[float] = None):
+        now = self.clock()
+        if self._revoked.get(claims["sid"], 0.0) > now:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._entries[token] = (now + ttl, claims)
+        self._entries.move_to_end(token)
+        self._tokens_by_session[claims["sid"]] = token
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def revoke(self, session_id: str):
+        now = self.clock()
+        self._revoked = {sid: until for sid, until in self._revoked.items() if until > now}
+        self._revoked[session_id] = now + self.ttl
+        token = self._tokens_by_session.get(session_id)
+        if token is not None:
+            self._remove(token)
+
+    def _remove(self, token: str):
+        _, claims = self._entries.pop(token)
+        if self._tokens_by_session.get(claims["sid"]) == token:
+            del self._tokens_by_session[claims["sid"]]
+
+
+class SessionManager:
+    """Issues, verifies (through the cache) and revokes session tokens"""
+
+    def __init__(self, repository, secret: str, session_ttl: timedelta = timedelta(hours=24),
+                 cache: Optional[VerifiedTokenCache] = None):
+        self.repository = repository
+        self.secret = secret
+        self.session_ttl = session_ttl
+        self.cache = cache or VerifiedTokenCache()
+
+    async def create(self, user: dict, selected_role: Optional[str] = None, ip_address: Optional[str] = None,
+                     user_agent: Optional[str] = None, now: Optional[datetime] = None) -> Tuple[str, dict]:
+        """(token, stored session) for a new session of ``user``"""
+        now = now or datetime.now()
+        expires_at = now + self.session_ttl
+        session_id = str(uuid.uuid4())
+        role = selected_role or user["role"]
+        token = jwt.encode({
+            "sub": user["user_id"],
+            "sid": session_id,
+            "role": role,
+            "iat": int(now.timestamp()),
+            "exp": int(expires_at.timestamp()),
+        }, self.secret, algorithm=ALGORITHM)
+        session = {
+            "session_id": session_id,
+            "user_id": user["user_id"],
+            "token": token_digest(token),
+            "selected_role": role,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "expires_at": expires_at,
+            "created_at": now,
+        }
+        await self.repository.create_session(session)
+        return token, session
+
+    async def authenticate(self, token: str) -> dict:
+        """Claims of a valid, unrevoked token; raises InvalidSession otherwise"""
+        claims = self.cache.get(token)
+        if claims is not None:
+            return claims
+        try:
+            claims = jwt.decode(token, self.secret, algorithms=[ALGORITHM],
+                                options={"require": ["exp", "sub", "sid"]})
+        except jwt.InvalidTokenError as exc:
+            raise InvalidSession(str(exc)) from None
+        session = await self.repository.get_session(claims["sid"])
+        if session is None or not hmac.compare_digest(session["token"], token_digest(token)):
+            raise InvalidSession("Session has been revoked")
+        self.cache.put(token, claims, claims["exp"] - time.time())
+        return claims
+
+    async def revoke(self, session_id: str):
+        self.cache.revoke(session_id)
+        await self.repository.delete_session(session_id)
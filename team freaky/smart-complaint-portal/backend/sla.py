@@ -0,0 +1,196 @@
+"""
+SLA deadlines and background status recomputation
+Each priority level has its own SLA window; a forward is At-Risk once less
+than AT_RISK_FRACTION of its window remains and Breached at the deadline.
+
+SLAScheduler keeps open forwards in a min-heap keyed on their next status
+transition, so a tick only touches the forwards whose status actually changes
+instead of re-evaluating every stored forward. If applying a tick's updates
+fails, its transitions go back on the heap and are retried after
+``retry_seconds``.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import numpy as np
+
+SLA_WINDOWS = {
+    "Urgent": timedelta(hours=24),
+    "High": timedelta(days=3),
+    "Normal": timedelta(days=7),
+}
+AT_RISK_FRACTION = 0.2
+
+logger = logging.getLogger(__name__)
+
+# Row order of SLA_WINDOW_SECONDS; anything else is treated as Normal
+SLA_PRIORITY_CODES = {"Urgent": 0, "High": 1, "Normal": 2}
+SLA_WINDOW_SECONDS = np.array(
+    [int(SLA_WINDOWS[p].total_seconds()) for p in ("Urgent", "High", "Normal")], dtype="timedelta64[s]"
+)
+
+# Forward statuses that no longer run against an SLA
+CLOSED_STATUSES = {"Resolved"}
+
+
+def sla_window(priority_level: str) -> timedelta:
+    return SLA_WINDOWS.get(priority_level, SLA_WINDOWS["Normal"])
+
+
+def calculate_sla_deadline(priority_level: str, now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now()) + sla_window(priority_level)
+
+
+def status_at(deadline_ts: float, window_s: float, now_ts: float) -> str:
+    time_left = deadline_ts - now_ts
+    if time_left <= 0:
+        return "Breached"
+    if time_left <= window_s * AT_RISK_FRACTION:
+        return "At-Risk"
+    return "On-Track"
+
+
+def next_transition(deadline_ts: float, window_s: float, now_ts: float) -> Optional[float]:
+    """Epoch time of the next status change after ``now_ts``, or None once breached"""
+    at_risk_ts = deadline_ts - window_s * AT_RISK_FRACTION
+    if now_ts < at_risk_ts:
+        return at_risk_ts
+    if now_ts < deadline_ts:
+        return deadline_ts
+    return None
+
+
+def get_sla_status(deadline: datetime, priority_level: str = "Normal", now: Optional[datetime] = None) -> str:
+    now = now or datetime.now()
+    return status_at(deadline.timestamp(), sla_window(priority_level).total_seconds(), now.timestamp())
+
+
+def calculate_sla_deadlines(priority_levels: List[str], now: datetime) -> List[datetime]:
+    """Vectorized calculate_sla_deadline for a whole batch of forwards"""
+    deadlines = np.datetime64(now, "us") + SLA_WINDOW_SECONDS[_priority_codes(priority_levels)]
+    return deadlines.astype("datetime64[us]").tolist()
+
+
+def get_sla_statuses(deadlines: List[datetime], priority_levels: List[str], now: datetime) -> List[str]:
+    """Vectorized get_sla_status for a whole batch of deadlines"""
+    if not deadlines:
+        return []
+    time_left = (np.array(deadlines, dtype="datetime64[us]") - np.datetime64(now, "us")) / np.timedelta64(1, "s")
+    window = SLA_WINDOW_SECONDS[_priority_codes(priority_levels)].astype(float)
+    statuses = np.where(time_left <= 0, "Breached",
+                        np.where(time_left <= window * AT_RISK_FRACTION, "At-Risk", "On-Track"))
+    return statuses.tolist()
+
+
+def _priority_codes(priority_levels: List[str]) -> np.ndarray:
+    return np.fromiter((SLA_PRIORITY_CODES.get(p, 2) for p in priority_levels),
+                       dtype=np.intp, count=len(priority_levels))
+
+
+class SLAScheduler:
+    """Min-heap of (next transition time, forward) driving sla_status updates"""
+
+    def __init__(self, apply_updates: Callable[[List[Tuple[str, str]]], Awaitable[None]],
+                 max_sleep: float = 60.0, retry_seconds: float = 5.0):
+        self.apply_updates = apply_updates
+        self.max_sleep = max_sleep
+        self.retry_seconds = retry_seconds
+        self._heap: List[Tuple[float, str, float, float]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.transitions = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def track(self, forward: dict, now: Optional[float] = None):
+        """Schedule a forward's next status transition (no-op once breached or closed)"""
+        if forward.get("status") in CLOSED_STATUSES:
+            return
+        now = time.time() if now is None else now
+        deadline_ts = forward["sla_deadline"].timestamp()
+        window_s = sla_window(forward["priority_level"]).total_seconds()
+        when = next_transition(deadline_ts, window_s, now)
+        if when is None:
+            return
+        if self._wakeup is not None and (not self._heap or when < self._heap[0][0]):
+            self._wakeup.set()
+        heapq.heappush(self._heap, (when, forward["forward_id"], deadline_ts, window_s))
+
+    def pop_due(self, now: float) -> List[Tuple[str, str]]:
+        """(forward_id, new sla_status) for every transition at or before ``now``"""
+        due = self._take_due(now)
+        self._reschedule(due, now)
+        return [(forward_id, status_at(deadline_ts, window_s, now)) for _, forward_id, deadline_ts, window_s in due]
+
+    async def tick(self, now: Optional[float] = None) -> int:
+        """Apply every due transition; if apply_updates raises, the due entries
+        are put back on the heap before the error propagates"""
+        now = time.time() if now is None else now
+        due = self._take_due(now)
+        if not due:
+            return 0
+        updates = [(forward_id, status_at(deadline_ts, window_s, now))
+                   for _, forward_id, deadline_ts, window_s in due]
+        try:
+            await self.apply_updates(updates)
+        except Exception:
+            for entry in due:
+                heapq.heappush(self._heap, entry)
+            raise
+        self._reschedule(due, now)
+        self.transitions += len(updates)
+        return len(updates)
+
+    def _take_due(self, now: float) -> List[Tuple[float, str, float, float]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+        return due
+
+    def _reschedule(self, due: List[Tuple[float, str, float, float]], now: float):
+        for _, forward_id, deadline_ts, window_s in due:
+            when = next_transition(deadline_ts, window_s, now)
+            if when is not None:
+                heapq.heappush(self._heap, (when, forward_id, deadline_ts, window_s))
+
+    def seconds_until_next(self, now: float) -> float:
+        if not self._heap:
+            return self.max_sleep
+        return min(max(self._heap[0][0] - now, 0.0), self.max_sleep)
+
+    async def _run(self):
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await self.tick()
+                delay = None
+            except Exception:
+                logger.exception("SLA status update failed")
+                delay = self.retry_seconds
+            self._wakeup.clear()
+            if delay is None:
+                delay = self.seconds_until_next(time.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._wakeup = None
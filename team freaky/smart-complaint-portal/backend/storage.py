@@ -0,0 +1,778 @@
+"""
+In-process storage for the Smart Complaint Portal
+Forward records are kept by forward_id together with secondary indexes on
+complaint_id, cluster_id and sla_status, so lookups cost O(matches) instead
+of a scan over every stored forward. Their insertion order is kept as well,
+so an export can walk them newest first a chunk at a time.
+
+Complaints are kept column by column in ComplaintStore instead of one dict
+per complaint: titles, descriptions and submitter ids as UTF-8 in shared
+buffers, categories/languages/predicted classes as small integer codes,
+scores as float32, timestamps as epoch microseconds and coordinates as packed
+float64 arrays. A lookup returns a ComplaintRow view that decodes fields only when
+they are read. Rows are also kept in (created_at, complaint_id) order, overall
+and per category/predicted class/recurrence flag/submitter, so a newest-first
+listing page starts with a binary search at its cursor instead of skipping
+every row before it.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Fields that get a secondary index in ForwardStore
+FORWARD_INDEXED_FIELDS = ("complaint_id", "cluster_id", "sla_status")
+
+
+class ForwardStore:
+    """Forward records keyed by forward_id with secondary indexes"""
+
+    def __init__(self, indexed_fields=FORWARD_INDEXED_FIELDS):
+        self._rows: Dict[str, dict] = {}
+        # field -> value -> {forward_id: record}; the inner dicts keep
+        # insertion order so index reads come back oldest first
+        self._indexes: Dict[str, Dict[object, Dict[str, dict]]] = {
+            field: {} for field in indexed_fields
+        }
+        # forward_ids in insertion order; positions stay valid while an export
+        # walks them, so removed ids are skipped rather than deleted. A removed
+        # id that is added again gets a new position; _positions holds each
+        # stored id's current one so the stale entry is skipped too
+        self._sequence: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    # Dict-style access so the store can stand in for the old FORWARDS_DB dict
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, forward_id) -> bool:
+        return forward_id in self._rows
+
+    def __getitem__(self, forward_id: str) -> dict:
+        return self._rows[forward_id]
+
+    def __setitem__(self, forward_id: str, record: dict):
+        if record.get("forward_id") != forward_id:
+            record = dict(record, forward_id=forward_id)
+        self.add(record)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def get(self, forward_id: str, default=None) -> Optional[dict]:
+        return self._rows.get(forward_id, default)
+
+    def values(self):
+        return self._rows.values()
+
+    def items(self):
+        return self._rows.items()
+
+    def clear(self):
+        self._rows.clear()
+        self._sequence.clear()
+        self._positions.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    # Writes
+    def add(self, record: dict):
+        """Insert or replace a forward record and index it"""
+        forward_id = record["forward_id"]
+        if forward_id in self._rows:
+            self._unindex(self._rows[forward_id])
+        else:
+            self._positions[forward_id] = len(self._sequence)
+            self._sequence.append(forward_id)
+        self._rows[forward_id] = record
+        self._index(record)
+
+    def update(self, forward_id: str, **changes) -> dict:
+        """Update fields of a stored forward, moving it between index buckets"""
+        record = self._rows[forward_id]
+        for field in self._indexes:
+            if field in changes and changes[field] != record.get(field):
+                self._unindex_field(field, record)
+                record[field] = changes[field]
+                self._index_field(field, record)
+        record.update(changes)
+        return record
+
+    def remove(self, forward_id: str) -> Optional[dict]:
+        """Delete a forward and drop it from every index"""
+        record = self._rows.pop(forward_id, None)
+        if record is not None:
+            self._positions.pop(forward_id)
+            self._unindex(record)
+        return record
+
+    # Index reads
+    def lookup(self, field: str, value, limit: Optional[int] = None) -> List[dict]:
+        """Return every forward (or the first ``limit``) whose indexed ``field`` equals ``value``"""
+        bucket = self._indexes[field].get(value)
+        if not bucket:
+            return []
+        return list(islice(bucket.values(), limit))
+
+    def count(self, field: str, value) -> int:
+        bucket = self._indexes[field].get(value)
+        return len(bucket) if bucket else 0
+
+    def by_complaint(self, complaint_id: str) -> List[dict]:
+        return self.lookup("complaint_id", complaint_id)
+
+    def by_cluster(self, cluster_id: str) -> List[dict]:
+        return self.lookup("cluster_id", cluster_id)
+
+    def by_sla_status(self, sla_status: str, limit: Optional[int] = None) -> List[dict]:
+        return self.lookup("sla_status", sla_status, limit)
+
+    def newest(self, limit: int, before: Optional[int] = None, **filters) -> Tuple[List[dict], int]:
+        """Forwards matching ``filters`` among the ``limit`` stored just before
+        position ``before`` (the latest when None), newest first, and the
+        position to continue from; it is 0 once the oldest forward was read
+
+        A call looks at ``limit`` forwards at most, so a selective filter
+        returns short or empty pages instead of walking the whole store.
+        """
+        end = len(self._sequence) if before is None else before
+        start = max(end - limit, 0)
+        records = []
+        for position in range(end - 1, start - 1, -1):
+            forward_id = self._sequence[position]
+            if self._positions.get(forward_id) != position:
+                continue
+            record = self._rows[forward_id]
+            if _forward_matches(record, filters):
+                records.append(record)
+        return records, start
+
+    # Index maintenance
+    def _index(self, record: dict):
+        for field in self._indexes:
+            self._index_field(field, record)
+
+    def _unindex(self, record: dict):
+        for field in self._indexes:
+            self._unindex_field(field, record)
+
+    def _index_field(self, field: str, record: dict):
+        value = record.get(field)
+        if value is None:
+            return
+        self._indexes[field].setdefault(value, {})[record["forward_id"]] = record
+
+    def _unindex_field(self, field: str, record: dict):
+        value = record.get(field)
+        if value is None:
+            return
+        bucket = self._indexes[field].get(value)
+        if bucket is None:
+            return
+        bucket.pop(record["forward_id"], None)
+        if not bucket:
+            del self._indexes[field][value]
+
+
+def _forward_matches(record: dict, filters: dict) -> bool:
+    """Whether a forward passes repository.forward_filters-style ``filters``"""
+    for field, value in filters.items():
+        if value is None:
+            continue
+        if field == "created_after":
+            if record["created_at"] < value:
+                return False
+        elif field == "created_before":
+            if record["created_at"] >= value:
+                return False
+        elif record.get(field) != value:
+            return False
+    return True
+
+
+# Complaint fields in ComplaintResponse / repository order
+COMPLAINT_STORE_FIELDS = (
+    "complaint_id", "title", "description", "category", "location", "attachments", "language_tag",
+    "spam_score", "predicted_class", "ml_confidence_score", "recurrence_flag", "cluster_id",
+    "duplicate_similarity_score", "created_at", "updated_at", "submitted_by",
+)
+
+# Complaint fields with a (field, created_at, complaint_id) listing index in ComplaintStore
+COMPLAINT_INDEXED_FIELDS = ("category", "predicted_class", "recurrence_flag", "submitted_by")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TIMESTAMP = -(2 ** 63)
+_NO_TEXT = 2 ** 32 - 1
+
+
+class _TextColumn:
+    """Strings as UTF-8 in one growing buffer; a replaced value leaves its old bytes behind"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("Q")
+        self.lengths = array("I")
+
+    def append(self, value: Optional[str]):
+        self.offsets.append(0)
+        self.lengths.append(_NO_TEXT)
+        self.set(len(self.offsets) - 1, value)
+
+    def set(self, row: int, value: Optional[str]):
+        if value is None:
+            self.lengths[row] = _NO_TEXT
+            return
+        encoded = value.encode()
+        self.offsets[row] = len(self.data)
+        self.lengths[row] = len(encoded)
+        self.data += encoded
+
+    def get(self, row: int) -> Optional[str]:
+        length = self.lengths[row]
+        if length == _NO_TEXT:
+            return None
+        start = self.offsets[row]
+        return self.data[start:start + length].decode()
+
+
+class _InternedColumn:
+    """Low-cardinality strings stored once, with a 2-byte code per row (widened if ever needed)"""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self.codes_by_value: Dict[str, int] = {}
+        self.codes = array("H")
+
+    def _code(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        code = self.codes_by_value.get(value)
+        if code is None:
+            code = self.codes_by_value[value] = len(self.values)
+            self.values.append(value)
+            if code > 0xFFFF and self.codes.typecode == "H":
+                self.codes = array("I", self.codes)
+        return code
+
+    def append(self, value: Optional[str]):
+        self.codes.append(self._code(value))
+
+    def set(self, row: int, value: Optional[str]):
+        self.codes[row] = self._code(value)
+
+    def get(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+
+class _FloatColumn:
+    """float32 values (about 7 significant digits); NaN stands for None"""
+
+    def __init__(self):
+        self.values = array("f")
+
+    def append(self, value: Optional[float]):
+        self.values.append(math.nan if value is None else value)
+
+    def set(self, row: int, value: Optional[float]):
+        self.values[row] = math.nan if value is None else value
+
+    def get(self, row: int) -> Optional[float]:
+        value = self.values[row]
+        # Rounded back to the 7 significant digits float32 actually holds, so 0.87 reads as 0.87
+        return None if value != value else float(f"{value:.7g}")
+
+
+class _BoolColumn:
+    def __init__(self):
+        self.values = array("b")
+
+    def append(self, value: Optional[bool]):
+        self.values.append(-1 if value is None else bool(value))
+
+    def set(self, row: int, value: Optional[bool]):
+        self.values[row] = -1 if value is None else bool(value)
+
+    def get(self, row: int) -> Optional[bool]:
+        value = self.values[row]
+        return None if value < 0 else bool(value)
+
+
+class _TimestampColumn:
+    """Wall-clock microseconds since 1970-01-01; the rare timezone-aware value keeps its tzinfo aside"""
+
+    def __init__(self):
+        self.values = array("q")
+        self.tzinfos: Dict[int, object] = {}
+
+    def append(self, value: Optional[datetime]):
+        self.values.append(_NO_TIMESTAMP)
+        self.set(len(self.values) - 1, value)
+
+    def set(self, row: int, value: Optional[datetime]):
+        self.tzinfos.pop(row, None)
+        if value is None:
+            self.values[row] = _NO_TIMESTAMP
+            return
+        if value.tzinfo is not None:
+            self.tzinfos[row] = value.tzinfo
+            value = value.replace(tzinfo=None)
+        self.values[row] = (value - _EPOCH) // _MICROSECOND
+
+    def get(self, row: int) -> Optional[datetime]:
+        value = self.values[row]
+        if value == _NO_TIMESTAMP:
+            return None
+        moment = _EPOCH + _MICROSECOND * value
+        if self.tzinfos and row in self.tzinfos:
+            return moment.replace(tzinfo=self.tzinfos[row])
+        return moment
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _LocationColumn:
+    """{"lat", "lon"} packed into two float64 arrays; any other shape is kept as given"""
+
+    def __init__(self):
+        self.lat = array("d")
+        self.lon = array("d")
+        self.other: Dict[int, Optional[dict]] = {}
+
+    def append(self, value: Optional[dict]):
+        self.lat.append(math.nan)
+        self.lon.append(math.nan)
+        self.set(len(self.lat) - 1, value)
+
+    def set(self, row: int, value: Optional[dict]):
+        self.other.pop(row, None)
+        if isinstance(value, dict) and len(value) == 2 and _is_number(value.get("lat")) and \
+                _is_number(value.get("lon")):
+            self.lat[row], self.lon[row] = value["lat"], value["lon"]
+        else:
+            self.lat[row] = self.lon[row] = math.nan
+            self.other[row] = value
+
+    def get(self, row: int) -> Optional[dict]:
+        if row in self.other:
+            value = self.other[row]
+            return None if value is None else dict(value)
+        return {"lat": self.lat[row], "lon": self.lon[row]}
+
+
+class _ListColumn:
+    """Lists that are empty for almost every row (attachments); only non-empty ones are stored"""
+
+    def __init__(self):
+        self.rows = 0
+        self.values: Dict[int, list] = {}
+
+    def append(self, value: Optional[list]):
+        self.rows += 1
+        self.set(self.rows - 1, value)
+
+    def set(self, row: int, value: Optional[list]):
+        if value:
+            self.values[row] = list(value)
+        else:
+            self.values.pop(row, None)
+
+    def get(self, row: int) -> list:
+        return list(self.values.get(row, ()))
+
+
+class _ObjectColumn:
+    """Plain references, for high-cardinality strings such as ids"""
+
+    def __init__(self):
+        self.values: list = []
+
+    def append(self, value):
+        self.values.append(value)
+
+    def set(self, row: int, value):
+        self.values[row] = value
+
+    def get(self, row: int):
+        return self.values[row]
+
+
+def _complaint_columns() -> dict:
+    return {
+        "complaint_id": _ObjectColumn(),
+        "title": _TextColumn(),
+        "description": _TextColumn(),
+        "category": _InternedColumn(),
+        "location": _LocationColumn(),
+        "attachments": _ListColumn(),
+        "language_tag": _InternedColumn(),
+        "spam_score": _FloatColumn(),
+        "predicted_class": _InternedColumn(),
+        "ml_confidence_score": _FloatColumn(),
+        "recurrence_flag": _BoolColumn(),
+        "cluster_id": _ObjectColumn(),
+        "duplicate_similarity_score": _FloatColumn(),
+        "created_at": _TimestampColumn(),
+        "updated_at": _TimestampColumn(),
+        "submitted_by": _TextColumn(),
+    }
+
+
+def _micros(value: Optional[datetime]) -> int:
+    """The _TimestampColumn encoding of ``value``, which is also its listing sort key"""
+    if value is None:
+        return _NO_TIMESTAMP
+    return (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+
+class _ListingIndex:
+    """Row numbers in (created_at, complaint_id) order, as two parallel arrays
+
+    Entries arriving in order are appended. Out-of-order ones (backfills,
+    migrated legacy data) wait in a pending list and are merged in one pass
+    the next time the order is read: the pending entries are sorted, each is
+    bisected into the arrays, and the arrays are rebuilt from slices between
+    those positions. A batch of k late entries costs O(n + k log n) instead
+    of O(n) per entry.
+    """
+
+    def __init__(self, ids: list):
+        self._ids = ids  # complaint_id per row, for ties on created_at
+        self._created = array("q")
+        self._rows = array("q")
+        self._pending: List[Tuple[int, str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._pending)
+
+    @property
+    def created(self) -> array:
+        self.settle()
+        return self._created
+
+    @property
+    def rows(self) -> array:
+        self.settle()
+        return self._rows
+
+    def position(self, created: int, complaint_id: str) -> int:
+        """Number of entries ordered before (created, complaint_id)"""
+        self.settle()
+        return self._position(created, complaint_id, 0)
+
+    def _position(self, created: int, complaint_id: str, low: int) -> int:
+        position = bisect_left(self._created, created, low)
+        # Ties on created_at are rare and short, so they are stepped through
+        end = bisect_right(self._created, created, position)
+        while position < end and self._ids[self._rows[position]] < complaint_id:
+            position += 1
+        return position
+
+    def insert(self, created: int, complaint_id: str, row: int):
+        if not self._pending:
+            last = len(self._created) - 1
+            if last < 0 or created > self._created[last] or (
+                    created == self._created[last] and complaint_id > self._ids[self._rows[last]]):
+                self._created.append(created)
+                self._rows.append(row)
+                return
+        self._pending.append((created, complaint_id, row))
+
+    def remove(self, created: int, complaint_id: str):
+        position = self.position(created, complaint_id)
+        del self._created[position]
+        del self._rows[position]
+
+    def settle(self):
+        """Merge the pending out-of-order entries into the arrays"""
+        if not self._pending:
+            return
+        pending = sorted(self._pending)
+        self._pending = []
+        created, rows = array("q"), array("q")
+        done = 0
+        for entry_created, complaint_id, row in pending:
+            position = self._position(entry_created, complaint_id, done)
+            created += self._created[done:position]
+            rows += self._rows[done:position]
+            created.append(entry_created)
+            rows.append(row)
+            done = position
+        created += self._created[done:]
+        rows += self._rows[done:]
+        self._created, self._rows = created, rows
+
+
+class ComplaintRow(Mapping):
+    """Read-only view of one stored complaint; each field is decoded when accessed"""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ComplaintStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, field: str):
+        return self._store._read(self._row, field)
+
+    def __iter__(self):
+        yield from COMPLAINT_STORE_FIELDS
+        yield from self._store._extra.get(self._row, ())
+
+    def __len__(self) -> int:
+        return len(COMPLAINT_STORE_FIELDS) + len(self._store._extra.get(self._row, ()))
+
+    def __repr__(self):
+        return f"ComplaintRow({dict(self)!r})"
+
+
+class ComplaintStore:
+    """Complaint records keyed by complaint_id, stored column by column
+
+    Behaves like the old COMPLAINTS_DB dict for reads (len, in, [id], get,
+    values, items); writes go through add() and update(). Fields outside
+    COMPLAINT_STORE_FIELDS are kept per row as given. page() and count()
+    serve filtered newest-first listings from the listing indexes.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._extra: Dict[int, dict] = {}
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self._columns = _complaint_columns()
+        self._getters = [(field, column.get) for field, column in self._columns.items()]
+        self._by_created = _ListingIndex(self._columns["complaint_id"].values)
+        # field -> value -> rows with that value, in listing order
+        self._indexes: Dict[str, Dict[object, _ListingIndex]] = {field: {} for field in COMPLAINT_INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, complaint_id) -> bool:
+        return complaint_id in self._rows
+
+    def __getitem__(self, complaint_id: str) -> ComplaintRow:
+        return ComplaintRow(self, self._rows[complaint_id])
+
+    def __setitem__(self, complaint_id: str, record: dict):
+        if record.get("complaint_id") != complaint_id:
+            record = dict(record, complaint_id=complaint_id)
+        self.add(record)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def get(self, complaint_id: str, default=None) -> Optional[ComplaintRow]:
+        row = self._rows.get(complaint_id)
+        return default if row is None else ComplaintRow(self, row)
+
+    def values(self) -> Iterator[ComplaintRow]:
+        return (ComplaintRow(self, row) for row in self._rows.values())
+
+    def items(self) -> Iterator:
+        return ((complaint_id, ComplaintRow(self, row)) for complaint_id, row in self._rows.items())
+
+    def clear(self):
+        self._rows.clear()
+        self._reset_columns()
+        self._extra.clear()
+
+    def record(self, complaint_id: str) -> Optional[dict]:
+        """Every field of a complaint decoded into a new dict in one pass (for full responses)"""
+        row = self._rows.get(complaint_id)
+        return None if row is None else self._record(row)
+
+    def _record(self, row: int) -> dict:
+        record = {field: get(row) for field, get in self._getters}
+        if row in self._extra:
+            record.update(self._extra[row])
+        return record
+
+    def add(self, record: dict):
+        """Insert a complaint, or overwrite every field of an existing one"""
+        complaint_id = record["complaint_id"]
+        row = self._rows.get(complaint_id)
+        if row is None:
+            row = self._rows[complaint_id] = len(self._columns["complaint_id"].values)
+            for field, column in self._columns.items():
+                column.append(record.get(field))
+        else:
+            self._unindex(row)
+            for field, column in self._columns.items():
+                column.set(row, record.get(field))
+        self._index(row)
+        extra = {field: value for field, value in record.items() if field not in self._columns}
+        if extra:
+            self._extra[row] = extra
+        else:
+            self._extra.pop(row, None)
+
+    def add_many(self, records: List[dict]):
+        """add() every record, then merge any out-of-order ones into the listing
+        indexes in one pass per index rather than on the next read"""
+        for record in records:
+            self.add(record)
+        self._by_created.settle()
+        for buckets in self._indexes.values():
+            for bucket in buckets.values():
+                bucket.settle()
+
+    def update(self, complaint_id: str, **changes) -> ComplaintRow:
+        """Change some fields of a complaint; the row only moves between the
+        listing buckets of indexed fields whose value changed, and only
+        leaves its place in the overall order when created_at changes"""
+        row = self._rows[complaint_id]
+        if "created_at" in changes:
+            moved = list(self._indexes)
+            self._unindex(row)
+        else:
+            moved = [field for field in self._indexes
+                     if field in changes and changes[field] != self._columns[field].get(row)]
+            for field in moved:
+                self._unindex_field(field, row)
+        for field, value in changes.items():
+            column = self._columns.get(field)
+            if column is None:
+                self._extra.setdefault(row, {})[field] = value
+            else:
+                column.set(row, value)
+        if "created_at" in changes:
+            self._index(row)
+        else:
+            for field in moved:
+                self._index_field(field, row)
+        return ComplaintRow(self, row)
+
+    # Whole columns, for vectorized scans such as the analytics rollup rebuild
+    def interned_column(self, field: str) -> tuple:
+        """(per-row codes, code -> value) of a low-cardinality field such as category"""
+        column = self._columns[field]
+        return column.codes, column.values
+
+    def timestamp_column(self, field: str) -> array:
+        """Per-row wall-clock microseconds since 1970-01-01; -2**63 where the value is None"""
+        return self._columns[field].values
+
+    # Listing reads
+    def page(self, limit: int, after: Optional[Tuple[datetime, str]] = None, **filters) -> List[dict]:
+        """Up to ``limit`` records matching ``filters``, newest first, strictly after
+        the (created_at, complaint_id) key ``after``"""
+        return [self._record(row) for row in islice(self._matching(after, filters), limit)]
+
+    def count(self, **filters) -> int:
+        scan = self._scan(None, filters)
+        if scan is None:
+            return 0
+        index, start, end, checks = scan
+        if not checks:
+            return end - start
+        return sum(1 for _ in self._matching(None, filters))
+
+    def _matching(self, after: Optional[Tuple[datetime, str]], filters: dict) -> Iterator[int]:
+        """Rows matching ``filters`` before ``after``, newest first"""
+        scan = self._scan(after, filters)
+        if scan is None:
+            return
+        index, start, end, checks = scan
+        rows = index.rows
+        for position in range(end - 1, start - 1, -1):
+            row = rows[position]
+            if all(check(row) for check in checks):
+                yield row
+
+    def _scan(self, after: Optional[Tuple[datetime, str]], filters: dict):
+        """(index, start, end, checks): the candidates are index.rows[start:end] and a
+        candidate matches when every check(row) holds; None when nothing can match
+
+        The smallest bucket among the equality filters is scanned, so the other
+        filters only ever reject rows of that bucket.
+        """
+        filters = {field: value for field, value in filters.items() if value is not None}
+        created_after = filters.pop("created_after", None)
+        created_before = filters.pop("created_before", None)
+        min_spam_score = filters.pop("min_spam_score", None)
+        max_spam_score = filters.pop("max_spam_score", None)
+        for field in filters:
+            if field not in self._indexes:
+                raise TypeError(f"Unknown complaint filter: {field}")
+
+        index = self._by_created
+        if filters:
+            buckets = [(self._indexes[field].get(value), field) for field, value in filters.items()]
+            if any(bucket is None for bucket, _ in buckets):
+                return None
+            index, field = min(buckets, key=lambda item: len(item[0]))
+            del filters[field]
+
+        start, end = 0, len(index)
+        if created_after is not None:
+            start = bisect_left(index.created, _micros(created_after))
+        if created_before is not None:
+            end = bisect_left(index.created, _micros(created_before), start)
+        if after is not None:
+            end = min(end, index.position(_micros(after[0]), after[1]))
+        if end <= start:
+            return None
+
+        checks = []
+        for field, value in filters.items():
+            get = self._columns[field].get
+            checks.append(lambda row, get=get, value=value: get(row) == value)
+        if min_spam_score is not None or max_spam_score is not None:
+            low = -math.inf if min_spam_score is None else min_spam_score
+            high = math.inf if max_spam_score is None else max_spam_score
+            get = self._columns["spam_score"].get
+
+            def spam_score_in_range(row):
+                spam_score = get(row)
+                return spam_score is not None and low <= spam_score <= high
+            checks.append(spam_score_in_range)
+        return index, start, end, checks
+
+    # Listing index maintenance
+    def _index(self, row: int):
+        ids = self._columns["complaint_id"].values
+        self._by_created.insert(self._columns["created_at"].values[row], ids[row], row)
+        for field in self._indexes:
+            self._index_field(field, row)
+
+    def _unindex(self, row: int):
+        ids = self._columns["complaint_id"].values
+        self._by_created.remove(self._columns["created_at"].values[row], ids[row])
+        for field in self._indexes:
+            self._unindex_field(field, row)
+
+    def _index_field(self, field: str, row: int):
+        value = self._columns[field].get(row)
+        if value is None:
+            return
+        ids = self._columns["complaint_id"].values
+        buckets = self._indexes[field]
+        bucket = buckets.get(value)
+        if bucket is None:
+            bucket = buckets[value] = _ListingIndex(ids)
+        bucket.insert(self._columns["created_at"].values[row], ids[row], row)
+
+    def _unindex_field(self, field: str, row: int):
+        value = self._columns[field].get(row)
+        if value is None:
+            return
+        buckets = self._indexes[field]
+        bucket = buckets[value]
+        bucket.remove(self._columns["created_at"].values[row], self._columns["complaint_id"].values[row])
+        if not len(bucket):
+            del buckets[value]
+
+    def _read(self, row: int, field: str):
+        column = self._columns.get(field)
+        if column is None:
+            return self._extra.get(row, {})[field]
+        return column.get(row)
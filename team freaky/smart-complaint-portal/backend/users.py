@@ -0,0 +1,254 @@
+"""
+User accounts storage
+One async interface with two backends:
+  - InMemoryUserRepository: process-local dicts (default, used by tests)
+  - MongoUserRepository: the users collection from mongo_integration.py, with
+    pymongo calls offloaded to a thread pool sized to the connection pool
+Usernames and emails are unique. MongoDB enforces this with unique indexes
+(ensure_indexes, run at startup), so registering is a single insert that
+fails with UserExists instead of a count-then-insert race.
+
+Listings are keyset-paginated newest first on (created_at, user_id) and
+never fetch password hashes (see pagination.py).
+"""
+
+import asyncio
+import threading
+from bisect import bisect_left, insort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Fields of a stored user (database_schema_extended.sql: users)
+USER_FIELDS = (
+    "user_id", "username", "email", "password_hash", "full_name", "phone_number", "role",
+    "is_active", "volunteer_status", "volunteer_region", "volunteer_categories",
+    "created_at", "updated_at", "last_login",
+)
+# Everything but the password hash: what leaves the store for display
+PUBLIC_USER_FIELDS = tuple(field for field in USER_FIELDS if field != "password_hash")
+# What a login needs
+LOGIN_FIELDS = ("user_id", "username", "email", "password_hash", "full_name", "role", "is_active")
+# Newest first; user_id breaks ties between users created in the same instant
+LISTING_ORDER = [("created_at", -1), ("user_id", -1)]
+
+
+class UserExists(ValueError):
+    pass
+
+
+def projection(fields) -> dict:
+    return {"_id": 0, **{field: 1 for field in fields}}
+
+
+def _select(record: dict, fields) -> dict:
+    return {field: record.get(field) for field in fields}
+
+
+def user_filters(role: Optional[str] = None, volunteer_status: Optional[str] = None) -> dict:
+    """Equality filters for a user listing, leaving out the unset ones"""
+    filters = {"role": role, "volunteer_status": volunteer_status}
+    return {field: value for field, value in filters.items() if value is not None}
+
+
+class UserRepository:
+    """Async user storage interface shared by every backend"""
+
+    async def ensure_indexes(self) -> None:
+        pass
+
+    async def create_user(self, record: dict) -> None:
+        """Insert a user; raises UserExists when the username or email is taken"""
+        raise NotImplementedError
+
+    async def find_by_login(self, username_or_email: str, fields=LOGIN_FIELDS) -> Optional[dict]:
+        """The user whose username or email is ``username_or_email``"""
+        raise NotImplementedError
+
+    async def get_user(self, user_id: str, fields=PUBLIC_USER_FIELDS) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def update_user(self, user_id: str, **changes) -> None:
+        raise NotImplementedError
+
+    async def count_users(self, **filters) -> int:
+        raise NotImplementedError
+
+    async def list_users(self, limit: int, after: Optional[Tuple[datetime, str]] = None,
+                         fields=PUBLIC_USER_FIELDS, **filters) -> List[dict]:
+        """Up to ``limit`` users matching ``filters``, newest first, strictly after
+        the (created_at, user_id) key ``after``"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryUserRepository(UserRepository):
+    """Process-local users; lost on restart and not shared across workers"""
+
+    def __init__(self):
+        self.users: Dict[str, dict] = {}
+        self._by_username: Dict[str, str] = {}
+        self._by_email: Dict[str, str] = {}
+        self._order: List[Tuple[datetime, str]] = []  # (created_at, user_id), ascending
+
+    async def create_user(self, record: dict) -> None:
+        username, email = record["username"], record["email"]
+        if username in self._by_username or email in self._by_email or record["user_id"] in self.users:
+            raise UserExists("User already exists")
+        self.users[record["user_id"]] = dict(record)
+        self._by_username[username] = record["user_id"]
+        self._by_email[email] = record["user_id"]
+        insort(self._order, (record["created_at"], record["user_id"]))
+
+    async def find_by_login(self, username_or_email: str, fields=LOGIN_FIELDS) -> Optional[dict]:
+        user_id = self._by_username.get(username_or_email) or self._by_email.get(username_or_email)
+        return _select(self.users[user_id], fields) if user_id is not None else None
+
+    async def get_user(self, user_id: str, fields=PUBLIC_USER_FIELDS) -> Optional[dict]:
+        record = self.users.get(user_id)
+        return _select(record, fields) if record is not None else None
+
+    async def update_user(self, user_id: str, **changes) -> None:
+        record = self.users.get(user_id)
+        if record is None:
+            return
+        for field, index in (("username", self._by_username), ("email", self._by_email)):
+            if field in changes and changes[field] != record[field]:
+                if changes[field] in index:
+                    raise UserExists("User already exists")
+                del index[record[field]]
+                index[changes[field]] = user_id
+        record.update(changes)
+
+    async def count_users(self, **filters) -> int:
+        if not filters:
+            return len(self.users)
+        return sum(self._matches(record, filters) for record in self.users.values())
+
+    @staticmethod
+    def _matches(record: dict, filters: dict) -> bool:
+        return all(record.get(field) == value for field, value in filters.items())
+
+    async def list_users(self, limit: int, after: Optional[Tuple[datetime, str]] = None,
+                         fields=PUBLIC_USER_FIELDS, **filters) -> List[dict]:
+        end = bisect_left(self._order, after) if after is not None else len(self._order)
+        page = []
+        for index in range(end - 1, -1, -1):
+            record = self.users[self._order[index][1]]
+            if self._matches(record, filters):
+                page.append(_select(record, fields))
+                if len(page) == limit:
+                    break
+        return page
+
+
+class MongoUserRepository(UserRepository):
+    """users collection through pymongo, one worker thread per pooled connection"""
+
+    def __init__(self, uri: Optional[str] = None, database: str = "smartcomplaint", pool_size: int = 10,
+                 timeout_ms: int = 5000, collection=None):
+        self.uri = uri
+        self.database = database
+        self.pool_size = pool_size
+        self.timeout_ms = timeout_ms
+        self._client = None
+        self._collection = collection  # injected by tests (mongomock)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="mongo-users")
+
+    def collection(self):
+        # The client is created on first use so importing the app never
+        # blocks on (or fails because of) an unavailable MongoDB
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    from pymongo import MongoClient
+                    self._client = MongoClient(
+                        self.uri,
+                        maxPoolSize=self.pool_size,
+                        minPoolSize=min(2, self.pool_size),
+                        connectTimeoutMS=self.timeout_ms,
+                        serverSelectionTimeoutMS=self.timeout_ms,
+                        waitQueueTimeoutMS=self.timeout_ms,
+                    )
+                    self._collection = self._client[self.database].users
+        return self._collection
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def ensure_indexes(self) -> None:
+        def run():
+            users = self.collection()
+            users.create_index("user_id", unique=True, name="uniq_user_id")
+            users.create_index("username", unique=True, name="uniq_username")
+            users.create_index("email", unique=True, name="uniq_email")
+            # idx_users_role / idx_users_volunteer_status from database_schema_extended.sql,
+            # extended with the listing order so a filtered page is one index range scan
+            for prefix in ((), ("role",), ("volunteer_status",)):
+                keys = [(field, 1) for field in prefix] + LISTING_ORDER
+                users.create_index(keys, name="_".join(("idx_users",) + prefix + ("created_at",)))
+        await self._run(run)
+
+    async def create_user(self, record: dict) -> None:
+        from pymongo.errors import DuplicateKeyError
+
+        def run():
+            try:
+                # insert_one adds _id to the document it is given
+                self.collection().insert_one(dict(record))
+            except DuplicateKeyError:
+                raise UserExists("User already exists") from None
+        await self._run(run)
+
+    async def find_by_login(self, username_or_email: str, fields=LOGIN_FIELDS) -> Optional[dict]:
+        query = {"$or": [{"username": username_or_email}, {"email": username_or_email}]}
+        return await self._run(lambda: self.collection().find_one(query, projection(fields)))
+
+    async def get_user(self, user_id: str, fields=PUBLIC_USER_FIELDS) -> Optional[dict]:
+        return await self._run(lambda: self.collection().find_one({"user_id": user_id}, projection(fields)))
+
+    async def update_user(self, user_id: str, **changes) -> None:
+        from pymongo.errors import DuplicateKeyError
+
+        def run():
+            try:
+                self.collection().update_one({"user_id": user_id}, {"$set": changes})
+            except DuplicateKeyError:
+                raise UserExists("User already exists") from None
+        await self._run(run)
+
+    async def count_users(self, **filters) -> int:
+        return await self._run(lambda: self.collection().count_documents(filters))
+
+    async def list_users(self, limit: int, after: Optional[Tuple[datetime, str]] = None,
+                         fields=PUBLIC_USER_FIELDS, **filters) -> List[dict]:
+        query = dict(filters)
+        if after is not None:
+            created_at, user_id = after
+            query["$or"] = [{"created_at": {"$lt": created_at}},
+                            {"created_at": created_at, "user_id": {"$lt": user_id}}]
+
+        def run():
+            cursor = self.collection().find(query, projection(fields)).sort(LISTING_ORDER).limit(limit)
+            return list(cursor)
+        return await self._run(run)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            self._collection = None
+
+
+def create_user_repository(uri: Optional[str] = None, pool_size: int = 10, **options) -> UserRepository:
+    """Build a user repository from a MONGO_URI-style string; no URI means in-memory"""
+    if not uri or uri.startswith("memory://"):
+        return InMemoryUserRepository()
+    if uri.startswith(("mongodb://", "mongodb+srv://")):
+        return MongoUserRepository(uri, pool_size=pool_size, **options)
+    raise ValueError(f"Unsupported MONGO_URI: {uri}")
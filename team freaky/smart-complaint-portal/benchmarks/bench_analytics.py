@@ -0,0 +1,117 @@
+"""
+Benchmark: analytics page views from rollup counters vs scanning the stores
+
+Usage:
+    python benchmarks/bench_analytics.py --complaints 200000 --forwards 50000
+
+Fills a ComplaintStore and ForwardStore (complaints shaped as in
+bench_complaint_store.py), then times:
+  - scan:    one pass over every stored complaint and forward computing the
+             counts behind /api/analytics/* (what a page view costs without rollups)
+  - rollup:  the same four responses read from AnalyticsRollup counters
+  - rebuild: analytics.store_counts (vectorized over the store's columns)
+             against the equivalent Python loop
+  - update:  the per-write cost of keeping the counters current
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from analytics import AnalyticsRollup, store_counts
+from bench_complaint_store import make_record
+from storage import ComplaintStore, ForwardStore
+
+DEPARTMENTS = ["Sanitation Dept", "Roads Dept", "Water Board", "Electrical", "Health", "Parks"]
+SLA_STATUSES = ["On-Track", "On-Track", "At-Risk", "Breached"]
+
+
+def forward_record(rng: random.Random, complaint_id: str, now: datetime) -> dict:
+    return {"forward_id": f"F{rng.getrandbits(64):016x}", "complaint_id": complaint_id,
+            "recipient_department": rng.choice(DEPARTMENTS), "sla_status": rng.choice(SLA_STATUSES),
+            "priority_level": "High", "status": "Pending", "created_at": now}
+
+
+def scan_counts(complaints: ComplaintStore, forwards: ForwardStore) -> dict:
+    """The same aggregates by walking every record"""
+    by_category, by_day, by_department, open_forwards = Counter(), Counter(), Counter(), []
+    for record in complaints.values():
+        by_category[record["category"]] += 1
+        by_day[record["created_at"].date()] += 1
+    for record in forwards.values():
+        by_department[record["recipient_department"], record["sla_status"]] += 1
+        if record["sla_status"] != "Breached":
+            open_forwards.append((record["forward_id"], record["recipient_department"], record["sla_status"]))
+    return {"complaints_by_category": dict(by_category), "complaints_by_day": dict(by_day),
+            "forwards": [(department, status, count) for (department, status), count in by_department.items()],
+            "open_forwards": open_forwards}
+
+
+def page_views(rollup: AnalyticsRollup, today: date):
+    return (rollup.summary(), rollup.categories(), rollup.daily(today - timedelta(days=29), today),
+            rollup.departments())
+
+
+def timed_ms(run, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        run()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--complaints", type=int, default=200000)
+    parser.add_argument("--forwards", type=int, default=50000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = datetime.now()
+    complaints, forwards = ComplaintStore(), ForwardStore()
+    records = [make_record(rng, now) for _ in range(args.complaints)]
+    for record in records:
+        complaints.add(record)
+    for _ in range(args.forwards):
+        forwards.add(forward_record(rng, rng.choice(records)["complaint_id"], now))
+
+    rollup = AnalyticsRollup()
+    rollup.load(store_counts(complaints, forwards))
+    reference = AnalyticsRollup()
+    reference.load(scan_counts(complaints, forwards))
+    # Vectorized and looped aggregation agree
+    assert page_views(rollup, now.date()) == page_views(reference, now.date())
+
+    def scan_view():
+        counts = AnalyticsRollup()
+        counts.load(scan_counts(complaints, forwards))
+        return page_views(counts, now.date())
+
+    scan_ms = timed_ms(scan_view, args.repeats)
+    rollup_ms = timed_ms(lambda: page_views(rollup, now.date()), 1000)
+    vectorized_ms = timed_ms(lambda: store_counts(complaints, forwards), args.repeats)
+    loop_ms = timed_ms(lambda: scan_counts(complaints, forwards), args.repeats)
+
+    extra = [make_record(rng, now) for _ in range(10000)]
+    start = time.perf_counter()
+    for record in extra:
+        rollup.add_complaint(record)
+        rollup.add_forward(forward_record(rng, record["complaint_id"], now))
+    update_us = (time.perf_counter() - start) / len(extra) * 1e6
+
+    print(f"{args.complaints} complaints, {args.forwards} forwards")
+    print(f"  page views (4 endpoints): scan {scan_ms:.1f} ms, rollup {rollup_ms:.3f} ms "
+          f"({scan_ms / rollup_ms:.0f}x)")
+    print(f"  rebuild: vectorized {vectorized_ms:.1f} ms, python loop {loop_ms:.1f} ms "
+          f"({loop_ms / vectorized_ms:.1f}x)")
+    print(f"  incremental update: {update_us:.2f} us per complaint + forward")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: memory per stored complaint, dict records vs ComplaintStore
+
+Usage:
+    python benchmarks/bench_complaint_store.py --sizes 10000,100000,1000000
+
+Stores complaints shaped like create_complaint's records (ComplaintResponse
+fields, template descriptions from data/generate_fixtures.py) in:
+  - dicts:    one dict per complaint in a dict keyed by complaint_id (the old COMPLAINTS_DB)
+  - columnar: storage.ComplaintStore
+and reports the traced heap growth per complaint, plus the cost of a lookup
+that builds the ComplaintResponse get_complaint returns (ComplaintStore.record
+for the columnar store).
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'data'))
+
+from generate_fixtures import PLACES, TEMPLATES
+from main_enhanced import ComplaintResponse
+from storage import ComplaintStore
+
+CATEGORIES = list(TEMPLATES)
+
+
+def make_record(rng: random.Random, now: datetime) -> dict:
+    category = rng.choice(CATEGORIES)
+    place = rng.choice(PLACES).format(n=rng.randrange(1, 200))
+    created = now - timedelta(seconds=rng.randrange(90 * 86400), microseconds=rng.randrange(10 ** 6))
+    recurring = rng.random() < 0.2
+    return {
+        "complaint_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "title": f"{category.replace('_', ' ').title()} issue",
+        "description": rng.choice(TEMPLATES[category]).format(place=place),
+        "category": category,
+        "location": {"lat": 12.9 + rng.random() / 10, "lon": 77.5 + rng.random() / 10},
+        "attachments": [],
+        "language_tag": "en",
+        "spam_score": rng.random() * 0.1,
+        "predicted_class": category,
+        "ml_confidence_score": rng.random(),
+        "recurrence_flag": recurring,
+        "cluster_id": str(uuid.UUID(int=rng.getrandbits(128))) if recurring else None,
+        "duplicate_similarity_score": rng.random() if recurring else 0.0,
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def measure(size: int, store_factory, add) -> tuple:
+    """(bytes per complaint, store, complaint ids)"""
+    rng = random.Random(42)
+    now = datetime.now()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store, ids = store_factory(), []
+    for _ in range(size):
+        record = make_record(rng, now)
+        add(store, record)
+        ids.append(record["complaint_id"])
+    gc.collect()
+    # The id list is the benchmark's own; both stores hold the same id strings
+    grown = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(ids)
+    tracemalloc.stop()
+    return grown / size, store, ids
+
+
+def lookup_us(get, ids, lookups: int) -> float:
+    keys = random.Random(7).choices(ids, k=lookups)
+    start = time.perf_counter()
+    for key in keys:
+        ComplaintResponse(**get(key))
+    return (time.perf_counter() - start) / lookups * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    def add_dict(store, record):
+        store[record["complaint_id"]] = record
+
+    print(f"{'complaints':>10} {'dict B/rec':>11} {'columnar B/rec':>15} {'saving':>7} "
+          f"{'dict get us':>12} {'columnar get us':>16}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        dict_bytes, dicts, ids = measure(size, dict, add_dict)
+        dict_get = lookup_us(dicts.get, ids, args.lookups)
+        del dicts, ids
+        columnar_bytes, store, ids = measure(size, ComplaintStore, ComplaintStore.add)
+        columnar_get = lookup_us(store.record, ids, args.lookups)
+        del store, ids
+        print(f"{size:>10} {dict_bytes:>11.0f} {columnar_bytes:>15.0f} {1 - columnar_bytes / dict_bytes:>7.0%} "
+              f"{dict_get:>12.1f} {columnar_get:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
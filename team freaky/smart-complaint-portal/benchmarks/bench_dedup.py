@@ -0,0 +1,71 @@
+"""
+Benchmark: per-complaint duplicate detection latency as the index grows
+
+Usage:
+    python benchmarks/bench_dedup.py --count 1000000 --dim 512
+
+Preloads the detector with --count synthetic complaint descriptions (embedded
+and added in bulk), then times --probes individual assign calls, which is what
+create_complaint does per request. Building the HNSW graph dominates the
+preload (roughly a minute per 100k vectors at 512 dims); lookups stay in the
+low milliseconds.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import numpy as np
+
+from dedup import DuplicateDetector, HashingEmbedder
+
+PLACES = ["sector 5", "metro station", "main road", "MG road", "the park", "block C", "ward 12"]
+ISSUES = [
+    "Garbage not collected for weeks near {}",
+    "Street light not working near {}",
+    "Water supply issue around {}",
+    "Potholes on the road causing traffic jams at {}",
+    "Broken sewer line causing overflow at {}",
+    "Traffic signal malfunctioning near {}",
+    "Street flooding due to blocked drain at {}",
+]
+
+
+def description(rng: random.Random) -> str:
+    return rng.choice(ISSUES).format(rng.choice(PLACES)) + f" house {rng.randrange(5000)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--probes", type=int, default=1000)
+    parser.add_argument("--chunk", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    detector = DuplicateDetector(HashingEmbedder(dim=args.dim))
+
+    start = time.perf_counter()
+    for offset in range(0, args.count, args.chunk):
+        size = min(args.chunk, args.count - offset)
+        detector.add_bulk([f"C{offset + i}" for i in range(size)], [description(rng) for _ in range(size)])
+    print(f"preloaded {args.count} complaints in {time.perf_counter() - start:.1f}s")
+
+    latencies = []
+    for i in range(args.probes):
+        text = description(rng)
+        t0 = time.perf_counter()
+        detector.assign_sync(f"P{i}", text)
+        latencies.append(time.perf_counter() - t0)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"assign latency at {len(detector)} complaints: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    print(f"clusters formed by probes: {len(detector.cluster_sizes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: complaint export memory, streamed in chunks vs built in one piece
+
+Usage:
+    python benchmarks/bench_export.py --count 200000 --chunk-size 1000
+
+Fills an InMemoryRepository with --count complaints (shaped as in
+bench_complaint_store.py) and exports all of them as CSV, gzipped CSV and
+Parquet, measuring time and peak traced memory (tracemalloc) above the
+filled store:
+  - stream: repository.export_complaints chunks through exports.csv_stream /
+            gzip_stream / parquet_stream, the body /api/admin/exports/complaints
+            sends; each piece is dropped once "sent"
+  - whole:  every record collected into one list first, then the whole file
+            encoded into one buffer (the same writers, one chunk)
+The streamed peak stays at about one chunk however large --count is.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from bench_complaint_store import make_record
+from exports import COMPLAINT_EXPORT_COLUMNS, complaint_values, csv_stream, gzip_stream, parquet_stream
+from repository import InMemoryRepository
+
+ENCODERS = {
+    "csv": lambda chunks: csv_stream(chunks, COMPLAINT_EXPORT_COLUMNS, complaint_values),
+    "csv.gz": lambda chunks: gzip_stream(csv_stream(chunks, COMPLAINT_EXPORT_COLUMNS, complaint_values)),
+    "parquet": lambda chunks: parquet_stream(chunks, COMPLAINT_EXPORT_COLUMNS, complaint_values),
+}
+
+
+async def streamed(repository: InMemoryRepository, encoder, chunk_size: int) -> int:
+    size = 0
+    async for data in encoder(repository.export_complaints(chunk_size)):
+        size += len(data)
+    return size
+
+
+async def whole(repository: InMemoryRepository, encoder, chunk_size: int) -> int:
+    records = [record async for chunk in repository.export_complaints(chunk_size) for record in chunk]
+
+    async def one_chunk():
+        yield records
+    body = b"".join([data async for data in encoder(one_chunk())])
+    return len(body)
+
+
+async def measure(export, repository: InMemoryRepository, encoder, chunk_size: int):
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    size = await export(repository, encoder, chunk_size)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    return size, elapsed, peak
+
+
+async def run(args):
+    rng = random.Random(42)
+    now = datetime.now()
+    repository = InMemoryRepository()
+    for _ in range(args.count):
+        await repository.create_complaint(make_record(rng, now))
+
+    tracemalloc.start()
+    print(f"{args.count} complaints, chunks of {args.chunk_size}")
+    print(f"{'format':>8} {'way':>7} {'MB out':>8} {'seconds':>8} {'peak MB':>8}")
+    for name, encoder in ENCODERS.items():
+        for way, export in (("stream", streamed), ("whole", whole)):
+            size, elapsed, peak = await measure(export, repository, encoder, args.chunk_size)
+            print(f"{name:>8} {way:>7} {size / 1e6:>8.1f} {elapsed:>8.2f} {peak / 1e6:>8.1f}")
+    tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
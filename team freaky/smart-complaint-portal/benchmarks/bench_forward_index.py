@@ -0,0 +1,71 @@
+"""
+Benchmark: complaint history lookups against ForwardStore vs a full scan
+
+Usage:
+    python benchmarks/bench_forward_index.py --sizes 1000,100000,1000000,5000000
+
+The indexed lookup should stay flat as the number of stored forwards grows,
+while the old list-comprehension scan grows linearly (the scan is skipped
+above --scan-limit to keep the run short).
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from storage import ForwardStore
+
+FORWARDS_PER_COMPLAINT = 5
+
+
+def build_store(size: int) -> ForwardStore:
+    store = ForwardStore()
+    for i in range(size):
+        store.add({
+            "forward_id": f"F{i}",
+            "complaint_id": f"C{i // FORWARDS_PER_COMPLAINT}",
+            "cluster_id": f"K{i % 1000}",
+            "sla_status": "On-Track",
+        })
+    return store
+
+
+def time_per_call(fn, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--scan-limit", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'forwards':>10} {'indexed us/op':>15} {'scan us/op':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        store = build_store(size)
+        complaints = max(1, size // FORWARDS_PER_COMPLAINT)
+        keys = [f"C{rng.randrange(complaints)}" for _ in range(args.lookups)]
+
+        indexed = time_per_call(store.by_complaint, keys)
+        scan = "-"
+        if size <= args.scan_limit:
+            values = store.values()
+            scan_keys = keys[:max(1, args.lookups // 100)]
+            scan = "%.1f" % time_per_call(
+                lambda cid: [f for f in values if f["complaint_id"] == cid], scan_keys
+            )
+        print(f"{size:>10} {indexed:>15.2f} {scan:>12}")
+        del store
+
+
+if __name__ == "__main__":
+    main()
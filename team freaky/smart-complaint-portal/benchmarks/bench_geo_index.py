@@ -0,0 +1,61 @@
+"""
+Benchmark: radius + time-window queries on GeoGridIndex
+
+Usage:
+    python benchmarks/bench_geo_index.py --count 1000000 --radius 500
+
+Points are spread over the same 1x1 degree box as data/complaints.jsonl, with
+half of them packed into a few hotspots so some queries hit dense cells.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import numpy as np
+
+from geo_index import METERS_PER_DEGREE, GeoGridIndex
+
+HOTSPOTS = [(12.97, 77.59), (12.93, 77.62), (12.35, 77.21)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--radius", type=float, default=500.0)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--window-days", type=float, default=30.0)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    index = GeoGridIndex(cell_degrees=args.radius / METERS_PER_DEGREE)
+    now = time.time()
+    start = time.perf_counter()
+    for key in range(args.count):
+        if key % 2:
+            hot_lat, hot_lon = rng.choice(HOTSPOTS)
+            lat, lon = rng.gauss(hot_lat, 0.01), rng.gauss(hot_lon, 0.01)
+        else:
+            lat, lon = rng.uniform(12.0, 13.0), rng.uniform(77.0, 78.0)
+        index.add(key, lat, lon, now - rng.uniform(0, 90 * 86400))
+    print(f"indexed {args.count} points in {time.perf_counter() - start:.1f}s")
+
+    since = now - args.window_days * 86400
+    for label, centre in (("uniform", None), ("hotspot", HOTSPOTS[0])):
+        latencies, hits = [], 0
+        for _ in range(args.queries):
+            lat, lon = centre or (rng.uniform(12.0, 13.0), rng.uniform(77.0, 78.0))
+            t0 = time.perf_counter()
+            keys, _ = index.query(lat, lon, args.radius, since=since)
+            latencies.append(time.perf_counter() - t0)
+            hits += len(keys)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{label:>8}: p50 {p50:.3f} ms, p99 {p99:.3f} ms, mean hits {hits / args.queries:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Load test: spam inference throughput with and without micro-batching
+
+Usage:
+    python benchmarks/bench_inference_batching.py --requests 5000 --concurrency 64 --window-ms 2
+
+Trains a spam model on the sample rows from ml/train_spam_classifier.py into a temporary
+directory, then drives SpamModelServer from concurrent asyncio tasks:
+  - unbatched: every request calls predict_spam on the worker thread pool
+  - batched:   every request goes through MicroBatcher
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'ml'))
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from batching import MicroBatcher
+from model_server import SpamModelServer
+from train_spam_classifier import load_sample_data
+
+
+def build_server(directory: str) -> SpamModelServer:
+    texts, labels = zip(*load_sample_data())
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+    model = LogisticRegression(random_state=42).fit(vectorizer.fit_transform(texts), labels)
+    model_path = os.path.join(directory, "spam_classifier_model.pkl")
+    vectorizer_path = os.path.join(directory, "tfidf_vectorizer.pkl")
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+    server = SpamModelServer(model_path, vectorizer_path)
+    server.load()
+    return server
+
+
+async def drive(call, texts, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text):
+        async with semaphore:
+            start = time.perf_counter()
+            await call(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    elapsed = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return len(texts) / elapsed, p50, p99
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = build_server(tmp)
+        texts = [f"Garbage not collected for {i % 30} days near block {i}" for i in range(args.requests)]
+        loop = asyncio.get_running_loop()
+
+        async def unbatched(text):
+            return await loop.run_in_executor(None, server.predict_spam, text)
+
+        batcher = MicroBatcher(server.predict_spam_batch, max_batch_size=args.max_batch,
+                               max_wait_ms=args.window_ms)
+
+        print(f"{'mode':>10} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, call in (("unbatched", unbatched), ("batched", batcher.submit)):
+            throughput, p50, p99 = await drive(call, texts, args.concurrency)
+            print(f"{name:>10} {throughput:>10.0f} {p50:>8.2f} {p99:>8.2f}")
+        print(f"mean batch size: {batcher.stats()['mean_batch_size']}")
+        await batcher.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Benchmark: NDJSON bulk ingestion throughput on a single worker
+
+Usage:
+    python benchmarks/bench_ingest.py --records 100000 --chunk-size 1000
+
+Streams --records synthetic complaints (the data/complaints.jsonl shape, with
+repeated descriptions and clustered locations so dedup has work to do) to
+POST /api/complaints/ingest in-process, as an admin, through httpx's ASGI
+transport, using the in-memory repository unless DATABASE_URL is set. The
+target is 50k records per minute.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import httpx
+
+from main_enhanced import SESSIONS, app
+
+CATEGORIES = ["sanitation", "traffic", "infrastructure", "public_safety", "utilities"]
+ISSUES = [
+    "Garbage not collected for weeks in sector {}",
+    "Street light not working near metro station {}",
+    "Water supply issue in residential area {}",
+    "Potholes on main road causing traffic jams near gate {}",
+    "Broken sewer line causing overflow on lane {}",
+    "Traffic signal malfunctioning at intersection {}",
+]
+HOTSPOTS = [(12.97, 77.59), (12.93, 77.62), (12.35, 77.21)]
+
+
+def records(count: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime.now()
+    for i in range(count):
+        if rng.random() < 0.5:
+            lat, lon = rng.choice(HOTSPOTS)
+            lat, lon = rng.gauss(lat, 0.01), rng.gauss(lon, 0.01)
+        else:
+            lat, lon = rng.uniform(12.0, 13.0), rng.uniform(77.0, 78.0)
+        yield {
+            "complaint_id": str(uuid.uuid4()),
+            "title": f"Complaint #{i + 1}",
+            "description": rng.choice(ISSUES).format(rng.randrange(200)),
+            "category": rng.choice(CATEGORIES),
+            "created_at": (now - timedelta(seconds=rng.randrange(30 * 86400))).isoformat(),
+            "location": {"lat": round(lat, 6), "lon": round(lon, 6)},
+            "attachments": [],
+            "language_tag": "en",
+        }
+
+
+async def body(count: int, seed: int, lines_per_chunk: int = 500):
+    batch = []
+    for record in records(count, seed):
+        batch.append(json.dumps(record))
+        if len(batch) == lines_per_chunk:
+            yield ("\n".join(batch) + "\n").encode()
+            batch = []
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+
+async def run(args):
+    token, _ = await SESSIONS.create({"user_id": "BENCH-ADMIN", "role": "admin"})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        response = await client.post("/api/complaints/ingest", params={"chunk_size": args.chunk_size},
+                                     headers={"Authorization": f"Bearer {token}"},
+                                     content=body(args.records, args.seed))
+        elapsed = time.perf_counter() - start
+    summary = json.loads(response.text.splitlines()[-1])
+    print(f"ingested {summary['committed']} of {summary['lines']} records in {elapsed:.1f}s "
+          f"({summary['committed'] / elapsed * 60:,.0f} records/minute, {summary['failed']} failed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: cost of a deep complaint listing page, keyset cursor vs OFFSET
+
+Usage:
+    python benchmarks/bench_listing.py --count 200000 --pages 1,10,100,1000
+
+Loads --count complaints (shaped as in bench_complaint_store.py) into the
+in-memory and SQLite repositories, then times fetching page N of a newest-first
+listing of --page-size rows, unfiltered and filtered by category:
+  - keyset: list_complaints() after the (created_at, complaint_id) of the row
+            ending page N-1, which is what following next_cursor does
+  - offset: the same ordering skipping (N-1) * page-size rows: LIMIT/OFFSET on
+            SQLite, skipping matches of the same index walk in memory
+A keyset page costs the same at every depth; an OFFSET page grows with it.
+
+It first times filling a ComplaintStore one add() at a time with created_at
+in order and shuffled (as in the legacy data/complaints.jsonl), and with one
+add_many() call, since every add also maintains the listing indexes.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from bench_complaint_store import make_record
+from repository import COMPLAINT_COLUMNS, InMemoryRepository, SQLiteRepository, _complaint_record
+from storage import ComplaintStore
+
+
+async def timed_ms(fetch, repeats: int) -> float:
+    await fetch()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await fetch()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def keyset_after(matching, page: int, page_size: int):
+    """The cursor key following page ``page - 1`` of the newest-first ``matching`` records"""
+    if page == 1:
+        return None
+    last = matching[(page - 1) * page_size - 1]
+    return last["created_at"], last["complaint_id"]
+
+
+async def memory_offset(repository: InMemoryRepository, page: int, page_size: int, filters: dict):
+    rows = islice(repository.complaints._matching(None, filters), (page - 1) * page_size, page * page_size)
+    return [repository.complaints._record(row) for row in rows]
+
+
+async def sqlite_offset(repository: SQLiteRepository, page: int, page_size: int, filters: dict):
+    sql = f"SELECT {COMPLAINT_COLUMNS} FROM complaints WHERE soft_delete = FALSE"
+    params = []
+    for field, value in filters.items():
+        sql += f" AND {field} = ?"
+        params.append(value)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+    params += [page_size, (page - 1) * page_size]
+
+    def run(cursor):
+        cursor.execute(sql, params)
+        return [_complaint_record(row) for row in cursor.fetchall()]
+    return await repository._run(run)
+
+
+def insert_us(records, bulk: bool) -> float:
+    store = ComplaintStore()
+    start = time.perf_counter()
+    if bulk:
+        store.add_many(records)
+    else:
+        for record in records:
+            store.add(record)
+        store.add_many([])  # merges whatever is still pending into every index
+    return (time.perf_counter() - start) / len(records) * 1e6
+
+
+async def run(args):
+    rng = random.Random(42)
+    now = datetime.now()
+    records = [make_record(rng, now) for _ in range(args.count)]
+    newest_first = sorted(records, key=lambda r: (r["created_at"], r["complaint_id"]), reverse=True)
+
+    oldest_first = newest_first[::-1]
+    print(f"{'insert':>18} {'us/record':>10}")
+    for label, ordered, bulk in (("add, in order", oldest_first, False), ("add, shuffled", records, False),
+                                 ("add_many, shuffled", records, True)):
+        print(f"{label:>18} {insert_us(ordered, bulk):>10.1f}")
+    category = newest_first[0]["category"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = InMemoryRepository()
+        sqlite = SQLiteRepository(os.path.join(tmp, "listing.db"), pool_size=1)
+        for repository in (memory, sqlite):
+            for start in range(0, len(records), 10000):
+                await repository.add_complaints(records[start:start + 10000])
+        offsets = {"memory": memory_offset, "sqlite": sqlite_offset}
+
+        print(f"{'backend':>8} {'filter':>16} {'page':>6} {'keyset ms':>10} {'offset ms':>10}")
+        for name, repository in (("memory", memory), ("sqlite", sqlite)):
+            for filters in ({}, {"category": category}):
+                matching = [r for r in newest_first if all(r[field] == value for field, value in filters.items())]
+                for page in (int(p) for p in args.pages.split(",")):
+                    if (page - 1) * args.page_size >= len(matching):
+                        break
+                    after = keyset_after(matching, page, args.page_size)
+
+                    async def keyset():
+                        return await repository.list_complaints(args.page_size, after, **filters)
+
+                    async def offset():
+                        return await offsets[name](repository, page, args.page_size, filters)
+
+                    # Both ways return the same rows
+                    assert [r["complaint_id"] for r in await keyset()] == [r["complaint_id"] for r in await offset()]
+                    keyset_ms = await timed_ms(keyset, args.repeats)
+                    offset_ms = await timed_ms(offset, args.repeats)
+                    label = ",".join(f"{field}={value}" for field, value in filters.items()) or "-"
+                    print(f"{name:>8} {label:>16} {page:>6} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
+        await sqlite.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--pages", default="1,10,100,1000")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
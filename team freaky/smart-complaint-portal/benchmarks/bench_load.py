@@ -0,0 +1,304 @@
+"""
+Load test: throughput and p50/p95/p99 latency per API endpoint
+
+Usage:
+    python benchmarks/bench_load.py --concurrency 32 --requests 2000
+    python benchmarks/bench_load.py --mode socket --concurrency 64 --output results.json
+    python benchmarks/bench_load.py --mode socket --url http://localhost:8001 --endpoints history
+    python benchmarks/bench_load.py --baseline benchmarks/baselines/bench_load_inprocess.json
+    python benchmarks/bench_load.py --baseline benchmarks/baselines/bench_load_inprocess.json --update-baseline
+
+Each endpoint (create, forward, history, batch_forward) is driven in its own
+phase by --concurrency asyncio workers until --requests requests completed.
+  - inprocess: httpx talks to main_enhanced.app through the ASGI transport
+               (no network, client and app share one event loop)
+  - socket:    a uvicorn subprocess serves backend/main_enhanced.py on a free
+               port (or --url points at a running server)
+
+Results are printed and, with --output, written as JSON. With --baseline the
+run is compared against a stored result: an endpoint regresses when its
+throughput drops or a latency percentile grows by more than --tolerance
+(relative) and --slack-ms (absolute), and the script exits with status 1.
+A baseline recorded with a different --mode, --concurrency, --requests or
+--batch-size is refused (status 2) before anything runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND)
+
+import httpx
+import numpy as np
+
+ENDPOINTS = ["create", "forward", "history", "batch_forward"]
+HEADERS = {}  # bearer token of the load-test account, set by sign_in()
+ISSUES = [
+    "Garbage not collected for weeks near {}",
+    "Street light not working near {}",
+    "Water supply issue around {}",
+    "Potholes on the road causing traffic jams at {}",
+    "Traffic signal malfunctioning near {}",
+]
+PLACES = ["sector 5", "metro station", "main road", "MG road", "block C", "ward 12", "the market"]
+
+
+def complaint_payload(rng: random.Random) -> dict:
+    return {
+        "title": "Load test complaint",
+        "description": rng.choice(ISSUES).format(rng.choice(PLACES)) + f" house {rng.randrange(1000)}",
+        "category": "sanitation",
+        "location": {"lat": rng.uniform(12.9, 13.0), "lon": rng.uniform(77.5, 77.6)},
+        "attachments": [],
+        "language_tag": "en",
+    }
+
+
+def forward_payload(rng: random.Random, complaint_id: str) -> dict:
+    return {
+        "complaint_id": complaint_id,
+        "recipient_department": "Sanitation Dept",
+        "recipient_officer_id": "OFF-001",
+        "recipient_officer_name": "Load Tester",
+        "remarks": "Generated by bench_load.py",
+        "follow_up_date": "2030-01-01T10:00:00",
+        "priority_level": rng.choice(["Normal", "High", "Urgent"]),
+    }
+
+
+def request_for(endpoint: str, rng: random.Random, complaint_ids: list, batch_size: int):
+    """(method, url, json body) for one request against ``endpoint``"""
+    if endpoint == "create":
+        return "POST", "/api/complaints", complaint_payload(rng)
+    if endpoint == "forward":
+        return "POST", "/api/complaints/forward", forward_payload(rng, rng.choice(complaint_ids))
+    if endpoint == "history":
+        return "GET", f"/api/complaints/{rng.choice(complaint_ids)}/history", None
+    if endpoint == "batch_forward":
+        return "POST", "/api/complaints/forward/batch", [
+            forward_payload(rng, rng.choice(complaint_ids)) for _ in range(batch_size)
+        ]
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def run_phase(client: httpx.AsyncClient, endpoint: str, args, complaint_ids: list) -> dict:
+    remaining = args.requests
+    latencies, errors = [], 0
+
+    async def worker(seed: int):
+        nonlocal remaining, errors
+        rng = random.Random(seed)
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = request_for(endpoint, rng, complaint_ids, args.batch_size)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body, headers=HEADERS)
+                await response.aread()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.seed * 1000 + i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+async def seed_complaints(client: httpx.AsyncClient, count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    ids = []
+    for _ in range(count):
+        response = await client.post("/api/complaints", json=complaint_payload(rng))
+        response.raise_for_status()
+        ids.append(response.json()["complaint_id"])
+    return ids
+
+
+async def sign_in(client: httpx.AsyncClient, seed: int):
+    """Register a throwaway account; its session token authenticates every request"""
+    suffix = f"{seed}-{os.getpid()}-{time.time_ns()}"
+    response = await client.post("/api/auth/register", json={
+        "username": f"load-test-{suffix}",
+        "email": f"load-test-{suffix}@example.com",
+        "password": "load-test-password",
+        "full_name": "Load Tester",
+    })
+    response.raise_for_status()
+    HEADERS["Authorization"] = f"Bearer {response.json()['token']}"
+
+
+async def run_load(client: httpx.AsyncClient, args) -> dict:
+    await sign_in(client, args.seed)
+    complaint_ids = await seed_complaints(client, args.seed_complaints, args.seed)
+    for endpoint in args.endpoints:  # warm-up, so lazy model/pool loading is not measured
+        method, url, body = request_for(endpoint, random.Random(args.seed), complaint_ids, args.batch_size)
+        await client.request(method, url, json=body, headers=HEADERS)
+    results = {}
+    for endpoint in args.endpoints:
+        results[endpoint] = await run_phase(client, endpoint, args, complaint_ids)
+        print(f"{endpoint:>14}: {results[endpoint]['throughput_rps']:>8.1f} req/s  "
+              f"p50 {results[endpoint]['p50_ms']:.2f} ms  p95 {results[endpoint]['p95_ms']:.2f} ms  "
+              f"p99 {results[endpoint]['p99_ms']:.2f} ms  errors {results[endpoint]['errors']}")
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    command = [sys.executable, "-m", "uvicorn", "main_enhanced:app", "--host", "127.0.0.1",
+               "--port", str(port), "--log-level", "warning"]
+    return subprocess.Popen(command, cwd=BACKEND)
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError("server did not become healthy")
+        await asyncio.sleep(0.2)
+
+
+async def run(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.mode == "inprocess":
+        from main_enhanced import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await run_load(client, args)
+
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = start_server(port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+            await wait_until_healthy(client)
+            return await run_load(client, args)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+# Run options a baseline is only comparable under
+WORKLOAD_OPTIONS = ("mode", "concurrency", "requests", "batch_size")
+
+
+def workload_differences(baseline: dict, args) -> list:
+    """"option=value (baseline value)" for each WORKLOAD_OPTIONS entry this run changes"""
+    return [f"{option}={getattr(args, option)} (baseline {baseline['meta'].get(option)})"
+            for option in WORKLOAD_OPTIONS if baseline["meta"].get(option) != getattr(args, option)]
+
+
+def compare(results: dict, baseline: dict, tolerance: float, slack_ms: float) -> list:
+    """Human-readable regressions of ``results`` against ``baseline``"""
+    regressions = []
+    for endpoint, current in results["endpoints"].items():
+        previous = baseline["endpoints"].get(endpoint)
+        if previous is None:
+            continue
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{endpoint}: {current['errors']} errors (baseline {previous['errors']})")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {current['throughput_rps']} req/s "
+                               f"(baseline {previous['throughput_rps']})")
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = max(previous[key] * (1 + tolerance), previous[key] + slack_ms)
+            if current[key] > limit:
+                regressions.append(f"{endpoint}: {key[:-3]} {current[key]} ms (baseline {previous[key]} ms)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inprocess", "socket"], default="inprocess")
+    parser.add_argument("--url", help="socket mode: benchmark this running server instead of starting one")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    parser.add_argument("--batch-size", type=int, default=50, help="forwards per batch_forward request")
+    parser.add_argument("--seed-complaints", type=int, default=200, help="complaints created before measuring")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="stored results JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite --baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative regression")
+    parser.add_argument("--slack-ms", type=float, default=1.0, help="latency growth always allowed")
+    args = parser.parse_args()
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline needs --baseline")
+    baseline = None
+    if args.baseline and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differences = workload_differences(baseline, args)
+        if differences:
+            parser.error(f"{args.baseline} was recorded with a different workload: {', '.join(differences)}; "
+                         "rerun with its options or record a new one with --update-baseline")
+
+    results = {
+        "meta": {
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "batch_size": args.batch_size,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "endpoints": asyncio.run(run(args)),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+    elif baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.slack_ms)
+        if regressions:
+            print("\nREGRESSIONS against " + args.baseline, file=sys.stderr)
+            for line in regressions:
+                print("  " + line, file=sys.stderr)
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: concurrent logins with bcrypt on the event loop vs. the worker pool
+
+Usage:
+    python benchmarks/bench_passwords.py --rounds 12 --logins 64 --concurrency 16
+    python benchmarks/bench_passwords.py --rounds 10 --workers 4 --max-pending 32
+
+Each login verifies one password against a stored hash, as
+mongo_integration.authenticate_user does. "inline" calls bcrypt directly in
+the coroutine (the old behaviour), "pool" goes through PasswordHasher. While
+the logins run, a ticker coroutine measures event-loop lag, which is what
+every other request on the worker experiences during a login burst.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import numpy as np
+
+from passwords import PasswordHasher, PasswordHasherBusy
+
+
+async def measure(login, logins: int, concurrency: int) -> dict:
+    remaining = logins
+    latencies, rejected, lags = [], 0, []
+
+    async def worker():
+        nonlocal remaining, rejected
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                await login()
+            except PasswordHasherBusy:
+                rejected += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    async def ticker(interval=0.005):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(loop.time() - expected, 0.0))
+
+    tick = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    tick.cancel()
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return {
+        "logins_per_s": len(latencies) / elapsed,
+        "p50_ms": p50,
+        "p99_ms": p99,
+        "rejected": rejected,
+        "max_loop_lag_ms": max(lags, default=elapsed) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=0, help="pool threads (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=0, help="default: 8 per worker")
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(rounds=args.rounds, max_workers=args.workers or None,
+                            max_pending=args.max_pending or None, queue_timeout=60.0)
+    stored = hasher.context.hash("correct horse battery staple")
+
+    async def inline_login():
+        hasher.context.verify("correct horse battery staple", stored)
+
+    async def pool_login():
+        await hasher.verify("correct horse battery staple", stored)
+
+    print(f"rounds {args.rounds}, {args.logins} logins, concurrency {args.concurrency}, "
+          f"{hasher.max_workers} pool threads, {os.cpu_count()} CPUs")
+    for name, login in (("inline", inline_login), ("pool", pool_login)):
+        result = asyncio.run(measure(login, args.logins, args.concurrency))
+        print(f"{name:>7}: {result['logins_per_s']:7.1f} logins/s  p50 {result['p50_ms']:7.1f} ms  "
+              f"p99 {result['p99_ms']:7.1f} ms  max loop lag {result['max_loop_lag_ms']:7.1f} ms  "
+              f"rejected {result['rejected']}")
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
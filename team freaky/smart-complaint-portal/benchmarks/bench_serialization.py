@@ -0,0 +1,107 @@
+"""
+Benchmark: per-request response serialization for get_complaint and forward_complaint
+
+Usage:
+    python benchmarks/bench_serialization.py --iterations 20000
+
+Times only the work between "the endpoint has its record" and "the response
+body bytes exist", for a representative complaint and forward record:
+  - model:  the previous path: build ComplaintResponse/ForwardResponse from the
+            record, let FastAPI validate it against the route's response_model
+            (serialize_response) and render it with JSONResponse
+  - record: the current path: responses.RecordResponse renders the stored dict
+            (orjson when installed)
+  - stdlib: RecordResponse with orjson disabled, for deployments without it
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+import responses
+from main_enhanced import ComplaintResponse, ForwardResponse, app
+from responses import RecordResponse
+
+NOW = datetime(2025, 3, 1, 9, 30, 15, 123456)
+
+COMPLAINT = {
+    "complaint_id": "6f1c9a52-3d7e-4b8a-9c1f-2e5d7a8b9c0d", "title": "Overflowing drain",
+    "description": "Open drain emitting foul smell next to the government school", "category": "sanitation",
+    "location": {"lat": 12.9716, "lon": 77.5946}, "attachments": [], "language_tag": "en", "spam_score": 0.03,
+    "predicted_class": "sanitation", "ml_confidence_score": 0.87, "recurrence_flag": True,
+    "cluster_id": "0b8e4d2c-5a1f-4c3e-8d7b-6a9f1e2d3c4b", "duplicate_similarity_score": 0.91,
+    "created_at": NOW, "updated_at": NOW,
+}
+
+FORWARD = {
+    "forward_id": "9d3e2f1a-7b6c-4d5e-8f9a-0b1c2d3e4f5a", "complaint_id": COMPLAINT["complaint_id"],
+    "recipient_department": "Sanitation Dept", "recipient_officer_id": "OFF-001",
+    "recipient_officer_name": "Officer", "remarks": "Please check", "follow_up_date": NOW + timedelta(days=3),
+    "priority_level": "High", "status": "Pending", "sla_deadline": NOW + timedelta(days=2),
+    "sla_status": "On-Track", "undo_token": "1a2b3c4d-5e6f-4a7b-8c9d-0e1f2a3b4c5d",
+    "undo_expires_at": NOW + timedelta(minutes=5), "recurrence_flag": True, "previous_occurrences_count": 2,
+    "cluster_id": COMPLAINT["cluster_id"], "duplicate_similarity_score": 0.91, "ml_confidence_score": 0.87,
+    "forwarded_by": "USER-001", "created_at": NOW, "updated_at": NOW,
+}
+
+
+def response_field(path: str, method: str):
+    for route in app.routes:
+        if getattr(route, "path", None) == path and method in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+async def per_call_us(render, iterations: int) -> float:
+    for _ in range(min(iterations, 1000)):
+        await render()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await render()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def run(args):
+    cases = [
+        ("get_complaint", COMPLAINT, ComplaintResponse, response_field("/api/complaints/{complaint_id}", "GET")),
+        ("forward_complaint", FORWARD, ForwardResponse, response_field("/api/complaints/forward", "POST")),
+    ]
+    print(f"{'endpoint':>18} {'model us':>9} {'record us':>10} {'stdlib us':>10} {'speedup':>8}")
+    for name, record, model, field in cases:
+        async def model_path():
+            content = await serialize_response(field=field, response_content=model(**record), is_coroutine=True)
+            return JSONResponse(content).body
+
+        async def record_path():
+            return RecordResponse(record).body
+
+        # Same document either way
+        assert json.loads(await model_path()) == json.loads(await record_path())
+
+        model_us = await per_call_us(model_path, args.iterations)
+        record_us = await per_call_us(record_path, args.iterations)
+        orjson, responses.orjson = responses.orjson, None
+        try:
+            stdlib_us = await per_call_us(record_path, args.iterations)
+        finally:
+            responses.orjson = orjson
+        print(f"{name:>18} {model_us:>9.1f} {record_us:>10.1f} {stdlib_us:>10.1f} {model_us / record_us:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
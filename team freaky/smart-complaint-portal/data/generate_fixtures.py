@@ -1,56 +1,380 @@
+"""
+Synthetic complaint fixtures for development and load testing
+
+Usage:
+    python generate_fixtures.py                              # 200 complaints -> complaints.jsonl
+    python generate_fixtures.py --count 20000000 --shards 8 --workers 8 --output fixtures/complaints.jsonl
+    python generate_fixtures.py --count 1000000 --format parquet --output complaints.parquet
+    python generate_fixtures.py --count 100000 --output - | \\
+        curl -X POST -T - -H "Content-Type: application/x-ndjson" -H "Authorization: Bearer $ADMIN_TOKEN" \\
+        http://localhost:8001/api/complaints/ingest
+
+Records have the shape POST /api/complaints/ingest accepts, plus an ``is_spam``
+label; descriptions are drawn from per-category templates so ``category`` is
+a usable training label. Output is written in batches, so memory stays bounded
+whatever --count is. With --shards, shard k is written to
+<name>-0000k-of-0000n.<ext> by one of --workers processes; the same --seed,
+--end and options always produce the same files. Duplicates (repeats of an
+earlier description near its location) are drawn from a bounded window of
+recent complaints within the same shard. Parquet output needs pyarrow.
+"""
+
+import argparse
 import json
-import random
-from datetime import datetime, timedelta
+import multiprocessing
+import os
+import sys
+import time
 import uuid
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
-# Sample data
-categories = ["sanitation", "traffic", "infrastructure", "public_safety", "utilities"]
-descriptions = [
-    "Garbage not collected for weeks in sector 5",
-    "Street light not working near metro station",
-    "Water supply issue in residential area",
-    "Potholes on main road causing traffic jams",
-    "Broken sewer line causing overflow",
-    "Traffic signal malfunctioning at intersection",
-    "Street flooding due to blocked drain",
-    "Power outage in apartment complex",
-    "Broken bench in public park",
-    "Overgrown grass in public garden"
+METERS_PER_DEGREE = 111320.0
+
+TEMPLATES = {
+    "sanitation": [
+        "Garbage not collected for weeks near {place}",
+        "Overflowing dustbins at {place} attracting stray dogs",
+        "Broken sewer line causing overflow at {place}",
+        "Dead animal lying on the road near {place}",
+        "Open drain emitting foul smell next to {place}",
+    ],
+    "traffic": [
+        "Traffic signal malfunctioning at {place}",
+        "Illegal parking blocking the road at {place}",
+        "Potholes on the road causing traffic jams near {place}",
+        "No traffic police during peak hours at {place}",
+        "Road divider damaged near {place}",
+    ],
+    "infrastructure": [
+        "Street light not working near {place}",
+        "Broken bench in public park at {place}",
+        "Footpath tiles broken along {place}",
+        "Street flooding due to blocked drain at {place}",
+        "Overgrown grass in public garden near {place}",
+    ],
+    "public_safety": [
+        "Open manhole without cover at {place}",
+        "Fallen tree blocking the footpath near {place}",
+        "Exposed electrical wires hanging at {place}",
+        "Stray dog menace reported around {place}",
+        "Unlit stretch unsafe for pedestrians at night near {place}",
+    ],
+    "utilities": [
+        "Water supply issue in residential area near {place}",
+        "Power outage in apartment complex at {place}",
+        "Low water pressure for the last week around {place}",
+        "Frequent voltage fluctuation at {place}",
+        "Contaminated drinking water supplied near {place}",
+    ],
+}
+PLACES = [
+    "the metro station", "sector {n}", "main road", "MG road", "the bus stand", "block {n}", "ward {n}",
+    "the market", "gate {n}", "the railway crossing", "the government school", "cross road {n}",
+    "the community hall", "the lake", "the hospital", "phase {n}", "the temple", "lane {n}",
+]
+SPAM = [
+    "Buy cheap {thing} online now, visit our website",
+    "Congratulations! You have won {thing}, click the link to claim",
+    "Earn money from home with {thing}, limited time offer",
+    "Best deals on {thing} today only, call now",
+    "Free {thing} for the first 100 customers, register here",
 ]
+SPAM_THINGS = ["medicines", "a lottery prize", "crypto", "insurance", "loans", "gift cards", "followers"]
+
+# Repeats are drawn from the last DUPLICATE_WINDOW originals of a shard
+DUPLICATE_WINDOW = 10000
+
+
+def parse_mix(value: str) -> dict:
+    """"sanitation=3,traffic=1" -> normalised category weights"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in TEMPLATES:
+            raise argparse.ArgumentTypeError(f"unknown category {name!r} (expected one of {', '.join(TEMPLATES)})")
+        mix[name] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("category weights must add up to more than 0")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def parse_hotspot(value: str) -> tuple:
+    """"lat,lon[,radius_m[,weight]]" -> (lat, lon, radius_m, weight)"""
+    parts = [float(part) for part in value.split(",")]
+    if not 2 <= len(parts) <= 4:
+        raise argparse.ArgumentTypeError("hotspot must be lat,lon[,radius_m[,weight]]")
+    lat, lon = parts[:2]
+    return lat, lon, parts[2] if len(parts) > 2 else 800.0, parts[3] if len(parts) > 3 else 1.0
+
+
+def resolve_hotspots(args) -> list:
+    """Explicit --hotspot values plus --random-hotspots placed in the bounding box (same for every shard)"""
+    hotspots = list(args.hotspot or [])
+    rng = np.random.default_rng([args.seed, 0xC0FFEE])
+    south, west, north, east = args.bbox
+    for _ in range(args.random_hotspots):
+        hotspots.append((rng.uniform(south, north), rng.uniform(west, east), rng.uniform(300, 1500),
+                         rng.uniform(0.5, 2.0)))
+    return hotspots
+
+
+def shard_path(output: str, shard: int, shards: int) -> str:
+    if shards == 1:
+        return output
+    root, ext = os.path.splitext(output)
+    return f"{root}-{shard:05d}-of-{shards:05d}{ext}"
+
+
+class ComplaintGenerator:
+    """Seeded, vectorised generator of column batches for one shard"""
+
+    def __init__(self, args, shard: int = 0):
+        self.args = args
+        self.rng = np.random.default_rng([args.seed, shard])
+        self.categories = list(args.categories)
+        self.category_weights = np.array([args.categories[c] for c in self.categories])
+        hotspots = resolve_hotspots(args)
+        self.hotspots = np.array([h[:3] for h in hotspots]).reshape(-1, 3)
+        weights = np.array([h[3] for h in hotspots], dtype=float)
+        self.hotspot_weights = weights / weights.sum() if len(weights) else weights
+        self.end = np.datetime64(args.end, "us")
+        self.span_us = int(args.days * 86400 * 1e6)
+        # Ring buffer of recent originals: description, category index, lat, lon
+        self.recent_text = [""] * DUPLICATE_WINDOW
+        self.recent_meta = np.zeros((DUPLICATE_WINDOW, 3))
+        self.recent_count = 0
+
+    def _locations(self, size: int):
+        rng = self.rng
+        south, west, north, east = self.args.bbox
+        lats = rng.uniform(south, north, size)
+        lons = rng.uniform(west, east, size)
+        if len(self.hotspots) and self.args.hotspot_share > 0:
+            hot = rng.random(size) < self.args.hotspot_share
+            picks = rng.choice(len(self.hotspots), size, p=self.hotspot_weights)[hot]
+            centre_lat, centre_lon, radius = self.hotspots[picks].T
+            spread = radius / METERS_PER_DEGREE
+            lats[hot] = centre_lat + rng.normal(0.0, 1.0, len(picks)) * spread
+            lons[hot] = centre_lon + rng.normal(0.0, 1.0, len(picks)) * spread / np.cos(np.radians(centre_lat))
+        return lats, lons
+
+    def _description(self, category: str, template: int, place: int, number: int) -> str:
+        templates = TEMPLATES[category]
+        return templates[template % len(templates)].format(place=PLACES[place].format(n=number))
+
+    def batch(self, start: int, size: int) -> dict:
+        """Columns for records ``start`` .. ``start + size - 1`` of this shard"""
+        args, rng = self.args, self.rng
+        spam = rng.random(size) < args.spam_ratio
+        duplicate = (rng.random(size) < args.duplicate_rate) & ~spam
+        categories = rng.choice(len(self.categories), size, p=self.category_weights)
+        lats, lons = self._locations(size)
+        created = self.end - rng.integers(0, max(self.span_us, 1), size).astype("timedelta64[us]")
+        templates = rng.integers(0, 1 << 16, size)
+        places = rng.integers(0, len(PLACES), size)
+        numbers = rng.integers(1, 200, size)
+        sources = rng.integers(0, DUPLICATE_WINDOW, size)
+        # Repeat reports land within about 50 m of the original
+        jitter = rng.normal(0.0, 50.0 / METERS_PER_DEGREE, (size, 2))
 
-# Generate 200 complaints
-complaints = []
-
-for i in range(200):
-    # Randomly decide if this should be a duplicate (10% chance)
-    is_duplicate = random.random() < 0.1
-    
-    if is_duplicate and i > 0:
-        # Use an existing complaint's description
-        base_complaint = complaints[random.randint(0, len(complaints) - 1)]
-        description = base_complaint["description"]
+        descriptions = []
+        for i in range(size):
+            if spam[i]:
+                descriptions.append(SPAM[templates[i] % len(SPAM)].format(
+                    thing=SPAM_THINGS[places[i] % len(SPAM_THINGS)]))
+                continue
+            if duplicate[i] and self.recent_count:
+                j = sources[i] % min(self.recent_count, DUPLICATE_WINDOW)
+                descriptions.append(self.recent_text[j])
+                category, lat, lon = self.recent_meta[j]
+                categories[i] = int(category)
+                lats[i], lons[i] = lat + jitter[i, 0], lon + jitter[i, 1]
+                continue
+            text = self._description(self.categories[categories[i]], templates[i], places[i], numbers[i])
+            descriptions.append(text)
+            slot = self.recent_count % DUPLICATE_WINDOW
+            self.recent_text[slot] = text
+            self.recent_meta[slot] = (categories[i], lats[i], lons[i])
+            self.recent_count += 1
+
+        raw_ids = rng.bytes(16 * size)
+        return {
+            "complaint_id": [str(uuid.UUID(bytes=raw_ids[16 * i:16 * i + 16], version=4)) for i in range(size)],
+            "title": [f"Complaint #{start + i + 1}" for i in range(size)],
+            "description": descriptions,
+            "category": [self.categories[c] for c in categories],
+            "created_at": created,
+            "lat": np.round(lats, 6),
+            "lon": np.round(lons, 6),
+            "is_spam": spam,
+        }
+
+
+def _dumps(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record).encode()
+
+
+class JSONLWriter:
+    def __init__(self, path: str):
+        if path == "-":
+            self.file, self.owned = sys.stdout.buffer, False
+        else:
+            self.file, self.owned = open(path, "wb"), True
+
+    def write(self, columns: dict):
+        created = np.datetime_as_string(columns["created_at"], unit="us")
+        lines = [
+            _dumps({
+                "complaint_id": complaint_id,
+                "title": title,
+                "description": description,
+                "category": category,
+                "created_at": created_at,
+                "location": {"lat": lat, "lon": lon},
+                "attachments": [],
+                "language_tag": "en",
+                "is_spam": is_spam,
+            })
+            for complaint_id, title, description, category, created_at, lat, lon, is_spam in zip(
+                columns["complaint_id"], columns["title"], columns["description"], columns["category"],
+                created.tolist(), columns["lat"].tolist(), columns["lon"].tolist(), columns["is_spam"].tolist())
+        ]
+        self.file.write(b"\n".join(lines) + b"\n")
+
+    def close(self):
+        if self.owned:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class ParquetWriter:
+    """One row group per batch; location is a lat/lon struct as in the JSONL"""
+
+    def __init__(self, path: str):
+        self.schema = pa.schema([
+            ("complaint_id", pa.string()),
+            ("title", pa.string()),
+            ("description", pa.string()),
+            ("category", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("location", pa.struct([("lat", pa.float64()), ("lon", pa.float64())])),
+            ("attachments", pa.list_(pa.string())),
+            ("language_tag", pa.string()),
+            ("is_spam", pa.bool_()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, columns: dict):
+        size = len(columns["complaint_id"])
+        table = pa.Table.from_arrays([
+            pa.array(columns["complaint_id"], pa.string()),
+            pa.array(columns["title"], pa.string()),
+            pa.array(columns["description"], pa.string()),
+            pa.array(columns["category"], pa.string()),
+            pa.array(columns["created_at"], pa.timestamp("us")),
+            pa.StructArray.from_arrays([pa.array(columns["lat"]), pa.array(columns["lon"])], names=["lat", "lon"]),
+            pa.array([[]] * size, pa.list_(pa.string())),
+            pa.array(["en"] * size, pa.string()),
+            pa.array(columns["is_spam"]),
+        ], schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+
+def write_shard(task) -> tuple:
+    """Generate one shard to its file; returns (path, records written)"""
+    args, shard = task
+    first = shard * args.count // args.shards
+    last = (shard + 1) * args.count // args.shards
+    path = shard_path(args.output, shard, args.shards)
+    writer = ParquetWriter(path) if args.format == "parquet" else JSONLWriter(path)
+    generator = ComplaintGenerator(args, shard)
+    try:
+        for start in range(first, last, args.batch_size):
+            writer.write(generator.batch(start, min(args.batch_size, last - start)))
+    finally:
+        writer.close()
+    return path, last - first
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200, help="total complaints to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="complaints.jsonl", help="output file, or - for JSONL on stdout")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default=None,
+                        help="defaults to parquet for .parquet outputs, jsonl otherwise")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1,
+                        help="share of complaints repeating an earlier description near its location")
+    parser.add_argument("--spam-ratio", type=float, default=0.02)
+    parser.add_argument("--categories", type=parse_mix, default=parse_mix(",".join(TEMPLATES)),
+                        help='category mix, e.g. "sanitation=3,traffic=2,utilities=1" (default: uniform)')
+    parser.add_argument("--bbox", type=float, nargs=4, default=[12.0, 77.0, 13.0, 78.0],
+                        metavar=("SOUTH", "WEST", "NORTH", "EAST"))
+    parser.add_argument("--hotspot", type=parse_hotspot, action="append",
+                        help="lat,lon[,radius_m[,weight]]; may be repeated")
+    parser.add_argument("--random-hotspots", type=int, default=5, help="extra hotspots placed inside --bbox")
+    parser.add_argument("--hotspot-share", type=float, default=0.4, help="share of complaints inside hotspots")
+    parser.add_argument("--days", type=float, default=30.0, help="time span ending at --end")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None,
+                        help="latest created_at (ISO 8601); defaults to now, set it for reproducible output")
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="processes writing shards in parallel")
+    parser.add_argument("--batch-size", type=int, default=50000, help="records generated and written at a time")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.end = args.end or datetime.now().replace(microsecond=0)
+    args.format = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    if args.format == "parquet" and pa is None:
+        parser.error("parquet output needs pyarrow (pip install pyarrow)")
+    if args.format == "parquet" and args.output == "-":
+        parser.error("parquet output needs a file path")
+    if args.output == "-" and args.shards != 1:
+        parser.error("stdout output is a single shard")
+    if args.count < 0 or args.shards < 1 or args.workers < 1 or args.batch_size < 1:
+        parser.error("--count must be >= 0 and --shards, --workers, --batch-size >= 1")
+    directory = os.path.dirname(args.output)
+    if args.output != "-" and directory:
+        os.makedirs(directory, exist_ok=True)
+
+    started = time.perf_counter()
+    tasks = [(args, shard) for shard in range(args.shards)]
+    workers = min(args.workers, args.shards)
+    if workers == 1:
+        written = [write_shard(task) for task in tasks]
     else:
-        description = random.choice(descriptions)
-    
-    complaint = {
-        "complaint_id": str(uuid.uuid4()),
-        "title": f"Complaint #{i+1}",
-        "description": description,
-        "category": random.choice(categories),
-        "created_at": (datetime.now() - timedelta(days=random.randint(0, 30))).isoformat(),
-        "location": {
-            "lat": round(random.uniform(12.0, 13.0), 6),
-            "lon": round(random.uniform(77.0, 78.0), 6)
-        },
-        "attachments": [],
-        "language_tag": "en"
-    }
-    
-    complaints.append(complaint)
-
-# Save to JSONL file
-with open("complaints.jsonl", "w") as f:
-    for complaint in complaints:
-        f.write(json.dumps(complaint) + "\n")
-
-print(f"Generated {len(complaints)} complaints in complaints.jsonl")
\ No newline at end of file
+        with multiprocessing.Pool(workers) as pool:
+            written = pool.map(write_shard, tasks, chunksize=1)
+    elapsed = time.perf_counter() - started
+
+    total = sum(count for _, count in written)
+    where = written[0][0] if len(written) == 1 else f"{len(written)} shards of {args.output}"
+    print(f"Generated {total} complaints in {where} ({total / max(elapsed, 1e-9):,.0f} records/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ CREATE TABLE complaints (
     ml_confidence_score DECIMAL(3,2), -- Range 0.00 - 1.00
     recurrence_flag BOOLEAN DEFAULT FALSE,
     cluster_id VARCHAR(36), -- Foreign key to clusters table
+    duplicate_similarity_score DECIMAL(3,2), -- Similarity to the nearest earlier complaint
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     soft_delete BOOLEAN DEFAULT FALSE
@@ -66,14 +67,18 @@ CREATE TABLE clusters (
 );
 
 -- Indexes for performance
-CREATE INDEX idx_complaints_created_at ON complaints(created_at);
-CREATE INDEX idx_complaints_category ON complaints(category);
+-- Complaint listings are keyset-paginated newest first on (created_at, id);
+-- each equality filter leads its own index followed by that sort key
+CREATE INDEX idx_complaints_created_at_id ON complaints(created_at, id);
+CREATE INDEX idx_complaints_category_created_at ON complaints(category, created_at, id);
+CREATE INDEX idx_complaints_predicted_class_created_at ON complaints(predicted_class, created_at, id);
+CREATE INDEX idx_complaints_recurrence_flag_created_at ON complaints(recurrence_flag, created_at, id);
 CREATE INDEX idx_complaints_spam_score ON complaints(spam_score);
-CREATE INDEX idx_complaints_recurrence_flag ON complaints(recurrence_flag);
 CREATE INDEX idx_forwards_complaint_id ON forwards(complaint_id);
 CREATE INDEX idx_forwards_sla_deadline ON forwards(sla_deadline);
 CREATE INDEX idx_forwards_sla_status ON forwards(sla_status);
 CREATE INDEX idx_forwards_priority_level ON forwards(priority_level);
+CREATE INDEX idx_forwards_created_at_id ON forwards(created_at, forward_id);
 CREATE INDEX idx_forward_audit_forward_id ON forward_audit(forward_id);
 CREATE INDEX idx_clusters_last_seen ON clusters(last_seen);
 
@@ -133,6 +133,9 @@ ALTER TABLE complaints ADD COLUMN verified_by VARCHAR(36);
 ALTER TABLE complaints ADD COLUMN verified_at TIMESTAMP;
 ALTER TABLE complaints ADD COLUMN volunteer_priority_score DECIMAL(3,2);
 
+-- A citizen's own complaints, newest first (see database_schema.sql)
+CREATE INDEX idx_complaints_submitted_by_created_at ON complaints(submitted_by, created_at, id);
+
 -- Add foreign key constraints
 -- ALTER TABLE complaints ADD FOREIGN KEY (submitted_by) REFERENCES users(user_id);
 -- ALTER TABLE complaints ADD FOREIGN KEY (verified_by) REFERENCES users(user_id);
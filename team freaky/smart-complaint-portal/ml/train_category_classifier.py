@@ -0,0 +1,154 @@
+"""
+Complaint category classifier: hashed word n-grams + a linear model
+
+Usage:
+    python ml/train_category_classifier.py data/complaints.jsonl
+    python ml/train_category_classifier.py exports/*.jsonl --output category_classifier.npz --epochs 5
+    python ml/train_category_classifier.py exports/*.jsonl --registry models/
+
+Learns to predict ``category`` from ``description`` using complaints that users
+already categorised (JSONL exports, e.g. from data/generate_fixtures.py;
+records labelled ``is_spam`` are skipped). Text is hashed into a fixed number
+of features, so memory does not grow with the vocabulary, and the files are
+streamed in chunks through SGDClassifier.partial_fit, so it does not grow with
+the training set either. A stable ~10% of records is held out for evaluation.
+
+The artifact is a compressed .npz with the class names, float32 coefficients
+and the hashing parameters; backend/model_server.py rebuilds the identical
+HashingVectorizer from those parameters, so no pickled sklearn objects are
+shipped to the API. With --registry it is also published as a new version of
+"category" in that model registry (MODEL_REGISTRY_DIR), and running APIs
+switch to it without a restart.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import classification_report
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from model_registry import ModelRegistry
+
+ARTIFACT_VERSION = 1
+REGISTRY_NAME = "category"
+
+
+def hashing_vectorizer(n_features: int, ngram_max: int) -> HashingVectorizer:
+    """The feature extractor shared by training and serving"""
+    return HashingVectorizer(n_features=n_features, ngram_range=(1, ngram_max), alternate_sign=False,
+                             norm="l2", dtype=np.float32)
+
+
+def iter_labelled(paths: List[str]) -> Iterator[Tuple[str, str, str]]:
+    """(key, description, category) for every usable record in the JSONL files"""
+    for path in paths:
+        with open(path, "rb") as f:
+            for number, line in enumerate(f):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("is_spam") or not record.get("category") or not record.get("description"):
+                    continue
+                yield record.get("complaint_id") or f"{path}:{number}", record["description"], record["category"]
+
+
+def is_holdout(key: str, fraction: float) -> bool:
+    # Stable across runs and epochs, independent of file order
+    return zlib.crc32(key.encode()) % 10000 < fraction * 10000
+
+
+def iter_chunks(paths: List[str], chunk_size: int, holdout: float, evaluation: bool):
+    texts, labels = [], []
+    for key, text, label in iter_labelled(paths):
+        if is_holdout(key, holdout) != evaluation:
+            continue
+        texts.append(text)
+        labels.append(label)
+        if len(texts) == chunk_size:
+            yield texts, labels
+            texts, labels = [], []
+    if texts:
+        yield texts, labels
+
+
+def train(args):
+    classes = sorted({label for _, _, label in iter_labelled(args.inputs)})
+    if len(classes) < 2:
+        raise SystemExit(f"need at least two categories to train, found {classes}")
+    vectorizer = hashing_vectorizer(args.n_features, args.ngram_max)
+    model = SGDClassifier(loss="log_loss", alpha=args.alpha, random_state=args.seed)
+    rng = np.random.default_rng(args.seed)
+
+    start = time.perf_counter()
+    for epoch in range(args.epochs):
+        seen = 0
+        for texts, labels in iter_chunks(args.inputs, args.chunk_size, args.holdout, evaluation=False):
+            order = rng.permutation(len(texts))
+            X = vectorizer.transform([texts[i] for i in order])
+            model.partial_fit(X, np.asarray(labels)[order], classes=classes)
+            seen += len(texts)
+        print(f"epoch {epoch + 1}/{args.epochs}: {seen} training records, {time.perf_counter() - start:.1f}s")
+
+    y_true, y_pred = [], []
+    for texts, labels in iter_chunks(args.inputs, args.chunk_size, args.holdout, evaluation=True):
+        y_true.extend(labels)
+        y_pred.extend(model.predict(vectorizer.transform(texts)))
+    holdout = {"records": len(y_true)}
+    if y_true:
+        print("Holdout classification report:")
+        print(classification_report(y_true, y_pred, zero_division=0))
+        holdout["accuracy"] = round(float(np.mean(np.array(y_true) == np.array(y_pred))), 4)
+
+    # Written through a file object so numpy cannot append ".npz" to --output
+    with open(args.output, "wb") as f:
+        np.savez_compressed(
+            f,
+            version=ARTIFACT_VERSION,
+            classes=np.array(model.classes_, dtype=str),
+            coef=model.coef_.astype(np.float32),
+            intercept=model.intercept_.astype(np.float32),
+            n_features=args.n_features,
+            ngram_max=args.ngram_max,
+        )
+    print(f"Model saved as '{args.output}'")
+    if args.registry:
+        published = ModelRegistry(args.registry).publish(REGISTRY_NAME, {"model.npz": args.output}, {
+            "trainer": "ml/train_category_classifier.py",
+            "inputs": args.inputs,
+            "params": {"n_features": args.n_features, "ngram_max": args.ngram_max, "epochs": args.epochs,
+                       "alpha": args.alpha, "seed": args.seed},
+            "holdout": holdout,
+        })
+        print(f"Published {REGISTRY_NAME} {published.version} to {args.registry}")
+    return model
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="JSONL exports with description and category")
+    parser.add_argument("--output", default="category_classifier.npz")
+    parser.add_argument("--registry", default=None, help="model registry directory to publish the new version to")
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--ngram-max", type=int, default=2, help="longest word n-gram hashed")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--alpha", type=float, default=1e-6, help="L2 regularisation strength")
+    parser.add_argument("--holdout", type=float, default=0.1, help="fraction of records kept for evaluation")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv=None):
+    train(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,62 @@
 """
-Simple spam classifier training script using TF-IDF and Logistic Regression
+Spam classifier: hashed word n-grams + a linear model, trained out of core
+
+Usage:
+    python ml/train_spam_classifier.py                                  # built-in sample rows
+    python ml/train_spam_classifier.py data/complaints-*.jsonl --workers 8 --epochs 3
+    python ml/train_spam_classifier.py data/*.jsonl --resume            # continue after an interruption
+    python ml/train_spam_classifier.py labelled-this-week.jsonl --update --epochs 1
+    python ml/train_spam_classifier.py labelled-this-week.jsonl --update --registry models/
+
+Learns ``is_spam`` from ``description`` in JSONL exports (e.g. from
+data/generate_fixtures.py; records without an ``is_spam`` label are skipped).
+The files are read in chunks of raw lines; --workers processes parse and hash
+each chunk while the main process feeds the previous one to
+SGDClassifier.partial_fit, and at most two chunks per worker are in flight, so
+peak memory depends on --chunk-size and --n-features, not on how much data
+there is. A stable ~10% of records is held out for evaluation.
+
+A checkpoint (model, position and shuffling state) is written every
+--checkpoint-every chunks and at the end of each epoch; --resume picks up
+from it and produces the same model an uninterrupted run would. --update
+loads the deployed model and continues training it on newly labelled files
+instead of starting over.
+
+Writes the joblib artifacts backend/model_server.py loads
+(SPAM_MODEL_PATH / SPAM_VECTORIZER_PATH); the vectorizer is a stateless
+HashingVectorizer, so updated models keep using the deployed one. With
+--registry the artifacts are also published as a new version of "spam" in
+that model registry (MODEL_REGISTRY_DIR), which running APIs pick up
+without a restart; --update then continues from the registry's current
+version.
 """
 
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix
-import joblib
+import argparse
 import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import classification_report
+
+from train_category_classifier import hashing_vectorizer, is_holdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from model_registry import ModelRegistry
+
+CLASSES = np.array([0, 1])
+REGISTRY_NAME = "spam"
+
 
-def load_sample_data():
-    """Load sample complaint data"""
-    # In a real implementation, this would load from the JSONL fixtures
-    # For this demo, we'll create sample data
-    data = [
+def load_sample_data() -> List[Tuple[str, int]]:
+    """Built-in (text, label) rows used when no JSONL files are given"""
+    return [
         ("This is a legitimate complaint about garbage collection", 0),
         ("Garbage not picked up for weeks", 0),
         ("Street light broken near metro station", 0),
@@ -36,71 +78,223 @@ def load_sample_data():
         ("Claim your reward today", 1),
         ("Infrastructure needs repair", 0)
     ]
-    
-    df = pd.DataFrame(data, columns=['text', 'label'])
-    return df
-
-def train_spam_classifier():
-    """Train a simple spam classifier"""
-    # Load data
-    df = load_sample_data()
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        df['text'], df['label'], test_size=0.2, random_state=42
-    )
-    
-    # Vectorize text
-    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-    X_train_vec = vectorizer.fit_transform(X_train)
-    X_test_vec = vectorizer.transform(X_test)
-    
-    # Train model
-    model = LogisticRegression(random_state=42)
-    model.fit(X_train_vec, y_train)
-    
-    # Evaluate
-    y_pred = model.predict(X_test_vec)
-    print("Classification Report:")
-    print(classification_report(y_test, y_pred))
-    
-    # Save model and vectorizer
-    joblib.dump(model, 'spam_classifier_model.pkl')
-    joblib.dump(vectorizer, 'tfidf_vectorizer.pkl')
-    
-    print("Model saved as 'spam_classifier_model.pkl'")
-    print("Vectorizer saved as 'tfidf_vectorizer.pkl'")
-    
-    return model, vectorizer
+
+
+def iter_line_chunks(paths: List[str], chunk_size: int) -> Iterator[Tuple[str, int, List[bytes]]]:
+    """(source, number of the first line, raw lines) in chunks of chunk_size lines"""
+    if not paths:
+        lines = [json.dumps({"complaint_id": f"sample-{i}", "description": text, "is_spam": bool(label)}).encode()
+                 for i, (text, label) in enumerate(load_sample_data())]
+        for first in range(0, len(lines), chunk_size):
+            yield "<sample>", first, lines[first:first + chunk_size]
+        return
+    for path in paths:
+        with open(path, "rb") as f:
+            first, lines = 0, []
+            for line in f:
+                lines.append(line)
+                if len(lines) == chunk_size:
+                    yield path, first, lines
+                    first, lines = first + chunk_size, []
+            if lines:
+                yield path, first, lines
+
+
+_vectorizers = {}
+
+
+def featurize(source: str, first: int, lines: List[bytes], n_features: int, ngram_max: int,
+              holdout: float, evaluation: bool) -> Tuple[object, np.ndarray]:
+    """Parse and hash one chunk of lines; runs in the worker processes"""
+    texts, labels = [], []
+    for number, line in enumerate(lines, first):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if record.get("is_spam") is None or not record.get("description"):
+            continue
+        if is_holdout(record.get("complaint_id") or f"{source}:{number}", holdout) != evaluation:
+            continue
+        texts.append(record["description"])
+        labels.append(int(bool(record["is_spam"])))
+    key = (n_features, ngram_max)
+    if key not in _vectorizers:
+        _vectorizers[key] = hashing_vectorizer(n_features, ngram_max)
+    return _vectorizers[key].transform(texts), np.array(labels, dtype=np.int64)
+
+
+def iter_batches(args, evaluation: bool, skip: int = 0, pool: Optional[ProcessPoolExecutor] = None):
+    """Hashed (X, y) per chunk, in file order; the first ``skip`` chunks are not read into the pool"""
+    options = (args.n_features, args.ngram_max, args.holdout, evaluation)
+    chunks = iter_line_chunks(args.inputs, args.chunk_size)
+    for _ in range(skip):
+        next(chunks, None)
+    if pool is None:
+        for chunk in chunks:
+            yield featurize(*chunk, *options)
+        return
+    # Bounded read-ahead: the workers hash the next chunks while the caller fits this one
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(featurize, *chunk, *options))
+        if len(pending) >= 2 * args.workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def save_checkpoint(path: str, state: dict):
+    # Written under a temporary name and renamed, so a crash never leaves a torn checkpoint
+    joblib.dump(state, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def load_model(args) -> SGDClassifier:
+    """The deployed model for --update; it must have been trained with the same hashing parameters"""
+    model_path, vectorizer_path = args.output, args.vectorizer_output
+    if args.registry:
+        deployed = ModelRegistry(args.registry).get(REGISTRY_NAME)
+        model_path, vectorizer_path = deployed.file("model.pkl"), deployed.file("vectorizer.pkl")
+    model = joblib.load(model_path)
+    if not hasattr(model, "partial_fit"):
+        raise SystemExit(f"{model_path} ({type(model).__name__}) cannot be updated incrementally; retrain it")
+    vectorizer = joblib.load(vectorizer_path)
+    if (getattr(vectorizer, "n_features", None), getattr(vectorizer, "ngram_range", None)) != \
+            (args.n_features, (1, args.ngram_max)):
+        raise SystemExit(f"{vectorizer_path} does not match --n-features/--ngram-max")
+    return model
+
+
+def publish(args, holdout: dict):
+    registry = ModelRegistry(args.registry)
+    previous = registry.current(REGISTRY_NAME)
+    files = {"model.pkl": args.output, "vectorizer.pkl": args.vectorizer_output}
+    published = registry.publish(REGISTRY_NAME, files, {
+        "trainer": "ml/train_spam_classifier.py",
+        "inputs": args.inputs,
+        "updated_from": previous if args.update else None,
+        "params": {"n_features": args.n_features, "ngram_max": args.ngram_max, "epochs": args.epochs,
+                   "alpha": args.alpha, "seed": args.seed},
+        "holdout": holdout,
+    })
+    print(f"Published {REGISTRY_NAME} {published.version} to {args.registry}")
+
+
+def evaluate(args, model, pool=None) -> dict:
+    y_true, y_pred = [], []
+    for X, y in iter_batches(args, evaluation=True, pool=pool):
+        if len(y):
+            y_true.extend(y)
+            y_pred.extend(model.predict(X))
+    if not y_true:
+        return {"records": 0}
+    print("Holdout classification report:")
+    print(classification_report(y_true, y_pred, labels=CLASSES, target_names=["ham", "spam"], zero_division=0))
+    report = classification_report(y_true, y_pred, labels=CLASSES, output_dict=True, zero_division=0)
+    return {"records": len(y_true), "accuracy": round(float(np.mean(np.array(y_true) == np.array(y_pred))), 4),
+            "spam_precision": round(report["1"]["precision"], 4), "spam_recall": round(report["1"]["recall"], 4)}
+
+
+def train(args) -> SGDClassifier:
+    checkpoint = args.checkpoint or args.output + ".checkpoint"
+    if args.resume and os.path.exists(checkpoint):
+        state = joblib.load(checkpoint)
+        print(f"Resuming from {checkpoint}: epoch {state['epoch'] + 1}, {state['chunks']} chunks done")
+    else:
+        model = load_model(args) if args.update else \
+            SGDClassifier(loss="log_loss", alpha=args.alpha, random_state=args.seed)
+        state = {"model": model, "epoch": 0, "chunks": 0, "rng": np.random.default_rng(args.seed)}
+    model, rng = state["model"], state["rng"]
+
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    try:
+        start = time.perf_counter()
+        while state["epoch"] < args.epochs:
+            seen = 0
+            for X, y in iter_batches(args, evaluation=False, skip=state["chunks"], pool=pool):
+                if len(y):
+                    order = rng.permutation(len(y))
+                    model.partial_fit(X[order], y[order], classes=CLASSES)
+                    seen += len(y)
+                state["chunks"] += 1
+                if args.checkpoint_every and state["chunks"] % args.checkpoint_every == 0:
+                    save_checkpoint(checkpoint, state)
+            state["epoch"], state["chunks"] = state["epoch"] + 1, 0
+            save_checkpoint(checkpoint, state)
+            print(f"epoch {state['epoch']}/{args.epochs}: {seen} training records, "
+                  f"{time.perf_counter() - start:.1f}s")
+        holdout = evaluate(args, model, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    joblib.dump(model, args.output)
+    joblib.dump(hashing_vectorizer(args.n_features, args.ngram_max), args.vectorizer_output)
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(f"Model saved as '{args.output}'")
+    print(f"Vectorizer saved as '{args.vectorizer_output}'")
+    if args.registry:
+        publish(args, holdout)
+    return model
+
 
 def predict_spam(text, model, vectorizer):
     """Predict if a text is spam"""
-    # Vectorize the text
     text_vec = vectorizer.transform([text])
-    
-    # Predict
     prediction = model.predict(text_vec)[0]
     probability = model.predict_proba(text_vec)[0]
-    
     return prediction, probability
 
-if __name__ == "__main__":
-    # Train the model
-    model, vectorizer = train_spam_classifier()
-    
-    # Test with sample texts
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", help="JSONL exports with description and is_spam (default: sample rows)")
+    parser.add_argument("--output", default="spam_classifier_model.pkl")
+    parser.add_argument("--vectorizer-output", default="tfidf_vectorizer.pkl")
+    parser.add_argument("--registry", default=None, help="model registry directory to publish the new version to")
+    parser.add_argument("--update", action="store_true",
+                        help="continue training the model in --output (or the registry's current version)")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint if there is one")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint path (default <output>.checkpoint)")
+    parser.add_argument("--checkpoint-every", type=int, default=20, help="chunks between checkpoints (0: per epoch)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes hashing chunks")
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--ngram-max", type=int, default=2, help="longest word n-gram hashed")
+    parser.add_argument("--epochs", type=positive_int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--alpha", type=float, default=1e-5, help="L2 regularisation strength")
+    parser.add_argument("--holdout", type=float, default=0.1, help="fraction of records kept for evaluation")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    model = train(args)
+    vectorizer = hashing_vectorizer(args.n_features, args.ngram_max)
+
     test_texts = [
         "Garbage collection needs improvement in sector 7",
         "Congratulations! You have won $1000000! Click here now!",
         "Street light not working near the park",
         "Free iPhone! Limited time offer! Act now!!!"
     ]
-    
     print("\nSample Predictions:")
     for text in test_texts:
         prediction, probability = predict_spam(text, model, vectorizer)
         label = "SPAM" if prediction == 1 else "NOT SPAM"
-        confidence = max(probability)
         print(f"Text: {text}")
-        print(f"Prediction: {label} (Confidence: {confidence:.2f})")
-        print()
\ No newline at end of file
+        print(f"Prediction: {label} (Confidence: {max(probability):.2f})")
+        print()
+
+
+if __name__ == "__main__":
+    main()
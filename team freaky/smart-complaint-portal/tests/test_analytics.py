@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from analytics import AnalyticsRollup
+from repository import InMemoryRepository, SQLiteRepository
+
+DEPARTMENTS = ["Sanitation Dept", "Roads Dept", "Water Board"]
+
+def make_complaint(i, rng):
+    created = datetime(2025, 11, 1, 8) + timedelta(hours=rng.randrange(96))
+    return {"complaint_id": f"C{i}", "title": "t", "description": "d", "category": rng.choice(["roads", "water"]),
+            "location": {"lat": 1.0, "lon": 2.0}, "attachments": [], "language_tag": "en", "spam_score": 0.1,
+            "predicted_class": "roads", "ml_confidence_score": 0.5, "recurrence_flag": False, "cluster_id": None,
+            "duplicate_similarity_score": 0.0, "created_at": created, "updated_at": created}
+
+def make_forward(i, complaint_id, rng):
+    now = datetime(2025, 11, 5)
+    return {"forward_id": f"F{i}", "complaint_id": complaint_id, "recipient_department": rng.choice(DEPARTMENTS),
+            "recipient_officer_id": "OFF-1", "recipient_officer_name": "Officer", "remarks": "", "follow_up_date": now,
+            "priority_level": "High", "status": "Pending", "sla_deadline": now,
+            "sla_status": rng.choice(["On-Track", "On-Track", "At-Risk", "Breached"]), "recurrence_flag": False,
+            "previous_occurrences_count": 0, "cluster_id": None, "duplicate_similarity_score": 0.0,
+            "ml_confidence_score": 0.5, "forwarded_by": "USER-1", "created_at": now, "updated_at": now}
+
+def state(rollup):
+    return (rollup.summary(), rollup.categories(), rollup.daily(date(2025, 10, 31), date(2025, 11, 6)),
+            rollup.departments(), rollup._open)
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request, tmp_path):
+    repo = InMemoryRepository() if request.param == "memory" else SQLiteRepository(str(tmp_path / "a.db"))
+    yield repo
+    asyncio.run(repo.close())
+
+def test_incremental_updates_match_a_rebuild(repository):
+    rng = random.Random(5)
+    rollup = AnalyticsRollup()
+
+    async def scenario():
+        complaints = [make_complaint(i, rng) for i in range(40)]
+        forwards = [make_forward(i, f"C{i}", rng) for i in range(30)]
+        await repository.add_complaints(complaints[:20])
+        await repository.add_forwards(forwards[:10])
+        rollup.add_complaints(complaints[:20])  # ignored: not built yet, the rebuild reads the store
+        await rollup.rebuild(repository)
+
+        await repository.add_complaints(complaints[20:])
+        rollup.add_complaints(complaints[20:])
+        for forward in forwards[10:]:
+            await repository.add_forward(forward)
+            rollup.add_forward(forward)
+        # The scheduler only ever moves forwards that have not breached yet
+        updates = [(f["forward_id"], rng.choice(["At-Risk", "Breached"])) for f in forwards[::2]
+                   if f["sla_status"] != "Breached"]
+        await repository.update_sla_statuses(updates, datetime(2025, 11, 6))
+        rollup.apply_sla_transitions(updates)
+
+        rebuilt = AnalyticsRollup()
+        await rebuilt.rebuild(repository)
+        return rebuilt
+
+    rebuilt = asyncio.run(scenario())
+    assert state(rollup) == state(rebuilt)
+    summary = rollup.summary()
+    assert summary["complaints"] == 40 and summary["forwards"] == 30
+    assert summary["breach_rate"] == round(summary["by_sla_status"]["Breached"] / 30, 4)
+    assert sum(day["complaints"] for day in rollup.daily(date(2025, 11, 1), date(2025, 11, 5))) == 40
+    assert all(status != "Breached" for _, status in rollup._open.values())
+
+def test_analytics_endpoints_follow_writes():
+    from main_enhanced import ANALYTICS, SESSIONS, app
+
+    client = TestClient(app)
+    token, _ = asyncio.run(SESSIONS.create({"user_id": "ANALYST", "role": "admin"}))
+    before = client.get("/api/analytics/summary").json()
+    assert ANALYTICS.built
+
+    complaint = client.post("/api/complaints", json={
+        "title": "Analytics", "description": "Water logging at the analytics junction", "category": "analytics-water",
+        "location": {"lat": 12.1, "lon": 77.1},
+    }).json()
+    forward = client.post("/api/complaints/forward", headers={"Authorization": f"Bearer {token}"}, json={
+        "complaint_id": complaint["complaint_id"], "recipient_department": "Analytics Dept",
+        "recipient_officer_id": "OFF-1", "recipient_officer_name": "Officer", "remarks": "",
+        "follow_up_date": "2025-12-31T10:00:00", "priority_level": "Urgent",
+    }).json()
+
+    after = client.get("/api/analytics/summary").json()
+    assert (after["complaints"], after["forwards"]) == (before["complaints"] + 1, before["forwards"] + 1)
+    categories = client.get("/api/analytics/categories").json()["categories"]
+    assert {"category": "analytics-water", "complaints": 1} in categories
+    today = date.today().isoformat()
+    days = client.get("/api/analytics/daily", params={"start": today, "end": today}).json()["days"]
+    assert days[0]["day"] == today and days[0]["complaints"] >= 1
+    assert len(client.get("/api/analytics/daily").json()["days"]) == 30
+    assert client.get("/api/analytics/daily", params={"start": "2025-02-01", "end": "2025-01-01"}).status_code == 400
+
+    ANALYTICS.apply_sla_transitions([(forward["forward_id"], "Breached")])
+    department, = [d for d in client.get("/api/analytics/departments").json()["departments"]
+                   if d["department"] == "Analytics Dept"]
+    assert department["forwards"] == 1 and department["breach_rate"] == 1.0
+    assert department["by_sla_status"] == {"On-Track": 0, "At-Risk": 0, "Breached": 1}
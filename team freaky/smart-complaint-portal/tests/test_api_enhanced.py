@@ -0,0 +1,147 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from main_enhanced import app, calculate_sla_deadlines, SESSIONS, SLA_SCHEDULER
+
+client = TestClient(app)
+
+def auth_headers(user_id="USER-001", role="user"):
+    token, _ = asyncio.run(SESSIONS.create({"user_id": user_id, "role": role}))
+    return {"Authorization": f"Bearer {token}"}
+
+def create_complaint(title="Test Complaint", description="This is a test complaint"):
+    response = client.post("/api/complaints", json={
+        "title": title,
+        "description": description,
+        "category": "sanitation",
+        "location": {"lat": 12.34, "lon": 56.78},
+        "attachments": [],
+        "language_tag": "en"
+    })
+    assert response.status_code == 200
+    return response.json()["complaint_id"]
+
+def forward_payload(complaint_id, priority_level="High"):
+    return {
+        "complaint_id": complaint_id,
+        "recipient_department": "Sanitation Dept",
+        "recipient_officer_id": "OFF-001",
+        "recipient_officer_name": "John Doe",
+        "remarks": "Storm clean-up",
+        "follow_up_date": "2025-12-31T10:00:00",
+        "priority_level": priority_level,
+    }
+
+def test_batch_forward_writes_every_known_complaint():
+    complaint_ids = [create_complaint(f"Test Complaint {i}") for i in range(3)]
+    payload = [forward_payload(cid, level) for cid, level in zip(complaint_ids, ["Urgent", "High", "Normal"])]
+    payload.append(forward_payload("does-not-exist"))
+
+    response = client.post("/api/complaints/forward/batch", json=payload, headers=auth_headers())
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["success"] for r in results] == [True, True, True, False]
+    assert results[3]["error"] == "Complaint not found"
+
+    for complaint_id, result in zip(complaint_ids, results):
+        history = client.get(f"/api/complaints/{complaint_id}/history").json()["forward_history"]
+        assert [f["forward_id"] for f in history] == [result["forward_id"]]
+        assert history[0]["forwarded_by"] == "USER-001"
+
+def test_batch_forward_requires_user():
+    response = client.post("/api/complaints/forward/batch", json=[])
+    assert response.status_code == 401
+
+def test_vectorized_deadlines_match_single_calculation():
+    now = datetime(2025, 11, 1, 12, 0)
+    deadlines = calculate_sla_deadlines(["Urgent", "High", "Normal", "Unknown"], now)
+    assert [(d - now).total_seconds() / 3600 for d in deadlines] == [24, 72, 168, 168]
+
+def test_ml_metrics_reports_spam_latency():
+    response = client.get("/api/ml/metrics")
+    assert response.status_code == 200
+    spam = response.json()["spam"]
+    assert {"loaded", "count", "p50_ms", "p99_ms"} <= set(spam)
+
+def test_sla_alerts_list_forwards_after_transitions():
+    complaint_id = create_complaint("SLA Complaint")
+    response = client.post("/api/complaints/forward", json=forward_payload(complaint_id, "Urgent"),
+                           headers=auth_headers())
+    forward_id = response.json()["forward_id"]
+    assert response.json()["sla_status"] == "On-Track"
+
+    assert client.get("/api/sla/alerts").status_code == 401
+    assert client.get("/api/sla/alerts", headers=auth_headers()).status_code == 403
+    admin = auth_headers("SLA-ADMIN", "admin")
+
+    def sla_alerts(limit=500):
+        return client.get("/api/sla/alerts", params={"limit": limit}, headers=admin).json()
+
+    alerts = sla_alerts()
+    assert forward_id not in {f["forward_id"] for f in alerts["at_risk"] + alerts["breached"]}
+
+    asyncio.run(SLA_SCHEDULER.tick(now=(datetime.now() + timedelta(hours=20)).timestamp()))
+    alerts = sla_alerts()
+    assert forward_id in {f["forward_id"] for f in alerts["at_risk"]}
+
+    asyncio.run(SLA_SCHEDULER.tick(now=(datetime.now() + timedelta(hours=25)).timestamp()))
+    alerts = sla_alerts()
+    assert forward_id in {f["forward_id"] for f in alerts["breached"]}
+    assert forward_id not in {f["forward_id"] for f in alerts["at_risk"]}
+    assert len(sla_alerts(1)["breached"]) == 1
+
+def test_admin_users_listing_pages_with_cursor():
+    from main_enhanced import USERS
+    now = datetime.now()
+
+    async def seed():
+        for i in range(5):
+            await USERS.create_user({"user_id": f"ADMIN-LIST-{i}", "username": f"admin-list-{i}",
+                                     "email": f"admin-list-{i}@example.com", "password_hash": "x",
+                                     "full_name": "Listed", "role": "volunteer", "volunteer_status": "pending",
+                                     "is_active": True, "created_at": now + timedelta(days=3650, seconds=i)})
+    asyncio.run(seed())
+
+    admin = auth_headers("ADMIN", role="admin")
+    params = {"role": "volunteer", "volunteer_status": "pending", "limit": 3, "include_total": "true"}
+    first = client.get("/api/admin/users", params=params, headers=admin).json()
+    assert [u["user_id"] for u in first["items"]] == ["ADMIN-LIST-4", "ADMIN-LIST-3", "ADMIN-LIST-2"]
+    assert first["total"] == 5 and "password_hash" not in first["items"][0]
+    second = client.get("/api/admin/users", params=dict(params, cursor=first["next_cursor"]),
+                        headers=admin).json()
+    assert [u["user_id"] for u in second["items"]] == ["ADMIN-LIST-1", "ADMIN-LIST-0"]
+    assert second["next_cursor"] is None
+    assert client.get("/api/admin/users", params={"cursor": "not-a-cursor"},
+                      headers=admin).status_code == 400
+
+def test_complaint_listings_page_by_filter_and_submitter():
+    citizen = auth_headers("CITIZEN-LIST", role="user")
+    submitted = []
+    for i in range(4):
+        response = client.post("/api/citizen/complaints", headers=citizen, json={
+            "title": f"Listed {i}", "description": f"Pothole number {i} on the listing road",
+            "category": "listing-roads", "location": {"lat": 12.5, "lon": 77.5},
+        })
+        assert response.status_code == 200 and response.json()["submitted_by"] == "CITIZEN-LIST"
+        submitted.append(response.json()["complaint_id"])
+    create_complaint("Anonymous listing complaint")
+    assert client.post("/api/citizen/complaints", json={}).status_code == 401
+
+    admin = auth_headers("ADMIN", role="admin")
+    params = {"category": "listing-roads", "max_spam_score": 1.0, "limit": 3, "include_total": "true"}
+    first = client.get("/api/admin/complaints", params=params, headers=admin).json()
+    assert [c["complaint_id"] for c in first["items"]] == submitted[:0:-1] and first["total"] == 4
+    second = client.get("/api/admin/complaints", params=dict(params, cursor=first["next_cursor"]),
+                        headers=admin).json()
+    assert [c["complaint_id"] for c in second["items"]] == submitted[:1] and second["next_cursor"] is None
+    assert client.get("/api/admin/complaints", headers=citizen).status_code == 403
+    assert client.get("/api/admin/complaints", params={"cursor": "bad"}, headers=admin).status_code == 400
+
+    mine = client.get("/api/citizen/complaints", params={"include_total": "true"}, headers=citizen).json()
+    assert [c["complaint_id"] for c in mine["items"]] == submitted[::-1] and mine["total"] == 4
+    others = client.get("/api/citizen/complaints", headers=auth_headers("CITIZEN-OTHER")).json()
+    assert others["items"] == [] and others["next_cursor"] is None
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+from batching import MicroBatcher
+
+def test_concurrent_submissions_share_a_batch():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(double, max_batch_size=64, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [i * 2 for i in range(10)]
+    assert len(calls) == 1 and sorted(calls[0]) == list(range(10))
+    assert stats["batches"] == 1 and stats["items"] == 10
+
+def test_batches_are_capped_at_max_batch_size():
+    sizes = []
+
+    def identity(items):
+        sizes.append(len(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(identity, max_batch_size=4, max_wait_ms=50)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        await batcher.stop()
+        return results
+
+    assert asyncio.run(scenario()) == list(range(10))
+    assert max(sizes) <= 4 and sum(sizes) == 10
+
+def test_batch_errors_reach_every_caller():
+    def broken(items):
+        raise RuntimeError("model failed")
+
+    async def scenario():
+        batcher = MicroBatcher(broken, max_wait_ms=5)
+        results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
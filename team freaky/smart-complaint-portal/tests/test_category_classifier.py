@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ml'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+import generate_fixtures
+import main_enhanced
+import train_category_classifier
+from batching import MicroBatcher
+from model_registry import ModelRegistry
+from model_server import CategoryModelServer
+
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("category")
+    data, artifact = str(directory / "complaints.jsonl"), str(directory / "category.npz")
+    generate_fixtures.main(["--output", data, "--count", "3000", "--spam-ratio", "0.05"])
+    args = train_category_classifier.build_parser().parse_args(
+        [data, "--output", artifact, "--n-features", "4096", "--epochs", "3", "--chunk-size", "500"])
+    model = train_category_classifier.train(args)
+    return model, artifact
+
+def test_served_predictions_match_the_trained_model(trained):
+    model, artifact = trained
+    server = CategoryModelServer(artifact)
+    assert server.load()
+    texts = ["Garbage not collected for weeks near the market", "Power outage in apartment complex at ward 7",
+             "Traffic signal malfunctioning at MG road", "Open manhole without cover at lane 3"]
+    predictions = server.predict_batch(texts)
+
+    assert [label for label, _ in predictions] == ["sanitation", "utilities", "traffic", "public_safety"]
+    vectorizer = train_category_classifier.hashing_vectorizer(4096, 2)
+    expected = model.predict_proba(vectorizer.transform(texts)).max(axis=1)
+    np.testing.assert_allclose([confidence for _, confidence in predictions], expected, rtol=1e-4)
+    assert server.stats()["count"] == 1
+
+def test_artifact_holds_only_arrays(trained):
+    _, artifact = trained
+    with np.load(artifact) as arrays:
+        assert arrays["coef"].dtype == np.float32 and arrays["coef"].shape == (5, 4096)
+        assert int(arrays["n_features"]) == 4096
+
+def test_output_without_extension_is_written_and_published_as_named(trained, tmp_path):
+    _, artifact = trained
+    data = os.path.join(os.path.dirname(artifact), "complaints.jsonl")
+    output, registry = str(tmp_path / "category-model"), str(tmp_path / "registry")
+    args = train_category_classifier.build_parser().parse_args(
+        [data, "--output", output, "--registry", registry, "--n-features", "4096", "--epochs", "1"])
+    train_category_classifier.train(args)
+
+    assert not os.path.exists(output + ".npz")
+    assert CategoryModelServer(output).load()
+    version = ModelRegistry(registry).get("category")
+    assert CategoryModelServer(version.file("model.npz")).load()
+
+def test_create_complaint_uses_the_category_model(trained, monkeypatch):
+    _, artifact = trained
+    client = TestClient(main_enhanced.app)
+    payload = {"title": "Issue", "description": "Low water pressure for the last week around sector 9",
+               "category": "sanitation", "location": {"lat": 12.9, "lon": 77.6}}
+
+    monkeypatch.setattr(main_enhanced, "CATEGORY_MODEL", CategoryModelServer(str(artifact) + ".missing"))
+    fallback = client.post("/api/complaints", json=payload).json()
+    assert (fallback["predicted_class"], fallback["ml_confidence_score"]) == ("sanitation", 0.0)
+
+    server = CategoryModelServer(artifact)
+    monkeypatch.setattr(main_enhanced, "CATEGORY_MODEL", server)
+    monkeypatch.setattr(main_enhanced, "CATEGORY_BATCHER", MicroBatcher(server.predict_batch, name="category"))
+    complaint = client.post("/api/complaints", json=payload).json()
+    assert complaint["predicted_class"] == "utilities"
+    assert 0.5 < complaint["ml_confidence_score"] <= 1.0
+
+def test_concurrent_complaints_share_a_category_batch(trained, monkeypatch):
+    _, artifact = trained
+    server = CategoryModelServer(artifact)
+    batcher = MicroBatcher(server.predict_batch, max_wait_ms=20, name="category")
+    monkeypatch.setattr(main_enhanced, "CATEGORY_MODEL", server)
+    monkeypatch.setattr(main_enhanced, "CATEGORY_BATCHER", batcher)
+    texts = ["Garbage not collected for weeks near the market", "Power outage in apartment complex at ward 7",
+             "Traffic signal malfunctioning at MG road"]
+
+    async def scenario():
+        results = await asyncio.gather(*(main_enhanced.predict_categories([text], ["other"]) for text in texts))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+    assert [prediction for prediction, in results] == server.predict_batch(texts)
+    assert batcher.stats()["batches"] == 1 and batcher.stats()["items"] == 3
@@ -0,0 +1,144 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import numpy as np
+import pytest
+import dedup
+from dedup import DuplicateDetector, HashingEmbedder, _NumpyIndex
+
+def test_hashing_embedder_is_normalised_and_discriminative():
+    embedder = HashingEmbedder(dim=256)
+    vectors = embedder.embed([
+        "Garbage not collected for weeks in sector 5",
+        "Garbage not collected for weeks in sector 5",
+        "Traffic signal malfunctioning at intersection",
+    ])
+    assert vectors.shape == (3, 256) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert vectors[0] @ vectors[1] > 0.99
+    assert vectors[0] @ vectors[2] < 0.2
+
+def test_embeddings_and_text_keys_do_not_depend_on_history():
+    import subprocess
+    text = "Garbage not collected for weeks in sector 5"
+    fresh = HashingEmbedder(dim=256).embed([text])
+    seasoned = HashingEmbedder(dim=256)
+    seasoned.embed(["Garbage everywhere near the garbage dump"] * 50)
+    np.testing.assert_array_equal(seasoned.embed([text]), fresh)
+
+    # Same key in another process with a different hash() salt
+    code = "import sys; sys.path.insert(0, sys.argv[1]); import dedup; print(dedup.text_key(sys.argv[2]))"
+    backend = os.path.join(os.path.dirname(__file__), '..', 'backend')
+    other = subprocess.run([sys.executable, "-c", code, backend, "  GARBAGE not collected for weeks in sector 5"],
+                           env=dict(os.environ, PYTHONHASHSEED="123"), capture_output=True, text=True, check=True)
+    assert int(other.stdout) == dedup.text_key(text)
+
+def test_duplicates_share_a_cluster():
+    detector = DuplicateDetector(HashingEmbedder(dim=256), threshold=0.8)
+    first = detector.assign_sync("C1", "Street light not working near metro station")
+    unrelated = detector.assign_sync("C2", "Water supply issue in residential area")
+    second = detector.assign_sync("C3", "Street light not working near the metro station")
+    third = detector.assign_sync("C4", "Street light not working near metro station")
+
+    assert first["cluster_id"] is None and unrelated["cluster_id"] is None
+    assert second["new_cluster"] and second["neighbour_id"] == "C1"
+    assert third["cluster_id"] == second["cluster_id"] and not third["new_cluster"]
+    assert third["cluster_size"] == 3
+    assert third["similarity"] > 0.8
+
+def test_batch_assignment_clusters_within_and_across_batches():
+    detector = DuplicateDetector(HashingEmbedder(dim=256), threshold=0.8, radius_m=500)
+    detector.assign_sync("C0", "Water supply issue in residential area", {"lat": 12.9, "lon": 77.6})
+    near, far = {"lat": 12.9001, "lon": 77.6001}, {"lat": 13.5, "lon": 77.6}
+    results = detector.assign_batch_sync(
+        ["C1", "C2", "C3", "C4", "C5"],
+        ["Street light not working near metro station",
+         "Street light not working near metro station",
+         "Water supply issue in residential area",
+         "Water supply issue in residential area",
+         "Street light not working near the metro station"],
+        [None, None, near, far, None],
+    )
+
+    assert results[0]["cluster_id"] is None
+    assert results[1]["neighbour_id"] == "C1" and results[1]["new_cluster"]
+    assert results[2]["neighbour_id"] == "C0"
+    assert results[3]["cluster_id"] is None  # same text, outside the radius
+    assert results[4]["cluster_id"] == results[1]["cluster_id"] and results[4]["cluster_size"] == 3
+    assert len(detector) == 6
+
+def test_repeated_descriptions_share_one_index_vector():
+    detector = DuplicateDetector(HashingEmbedder(dim=256), threshold=0.8)
+    detector.assign_sync("C1", "Broken bench in public park")
+    detector.assign_batch_sync(["C2", "C3", "C4"], ["broken bench in  public park", "Power outage in apartment complex",
+                                                    "Power outage in apartment complex"])
+    result = detector.assign_sync("C5", "Broken bench in public park")
+
+    assert len(detector) == 5 and detector.index.ntotal == 2
+    assert result["neighbour_id"] == "C1" and result["cluster_size"] == 3
+
+def test_numpy_index_fallback_matches_exact_search():
+    index = _NumpyIndex(2)
+    index.add(np.array([[1, 0], [0, 1]], dtype=np.float32))
+    scores, rows = index.search(np.array([[0.6, 0.8]], dtype=np.float32), 1)
+    assert rows[0][0] == 1 and scores[0][0] == pytest.approx(0.8)
+
+def test_detector_works_without_faiss(monkeypatch):
+    monkeypatch.setattr(dedup, "faiss", None)
+    detector = DuplicateDetector(HashingEmbedder(dim=128))
+    detector.assign_sync("C1", "Broken sewer line causing overflow")
+    assert detector.assign_sync("C2", "Broken sewer line causing overflow")["neighbour_id"] == "C1"
+
+def test_create_complaint_marks_recurrence():
+    from fastapi.testclient import TestClient
+    from main_enhanced import app
+
+    client = TestClient(app)
+    payload = {
+        "title": "Drain blocked",
+        "description": "Storm drain on 14th cross completely blocked with plastic waste",
+        "category": "sanitation",
+        "location": {"lat": 12.91, "lon": 77.63},
+    }
+    first = client.post("/api/complaints", json=payload).json()
+    second = client.post("/api/complaints", json=payload).json()
+
+    assert second["recurrence_flag"] is True
+    assert second["duplicate_similarity_score"] > 0.9
+    first_now = client.get(f"/api/complaints/{first['complaint_id']}").json()
+    assert first_now["cluster_id"] == second["cluster_id"]
+
+def test_startup_rebuilds_the_index_from_stored_complaints(tmp_path, monkeypatch):
+    import asyncio
+    from datetime import datetime
+    import main_enhanced
+    from repository import SQLiteRepository
+
+    repository = SQLiteRepository(str(tmp_path / "dedup.db"))
+    now = datetime.now()
+    stored = [
+        {"complaint_id": cid, "title": "Drain", "description": text, "category": "sanitation",
+         "location": {"lat": 12.91, "lon": 77.63}, "attachments": [], "language_tag": "en", "spam_score": 0.1,
+         "predicted_class": "sanitation", "ml_confidence_score": 0.5, "recurrence_flag": cluster is not None,
+         "cluster_id": cluster, "duplicate_similarity_score": 0.0, "created_at": now, "updated_at": now}
+        for cid, text, cluster in [
+            ("C1", "Storm drain on 5th main blocked with plastic waste", "K1"),
+            ("C2", "Storm drain on 5th main blocked with plastic waste", "K1"),
+            ("C3", "Water supply issue in residential area", None),
+        ]
+    ]
+    detector = DuplicateDetector(HashingEmbedder(dim=256), threshold=0.8, radius_m=500)
+    monkeypatch.setattr(main_enhanced, "REPOSITORY", repository)
+    monkeypatch.setattr(main_enhanced, "DEDUP", detector)
+
+    async def scenario():
+        await repository.add_complaints(stored)
+        await main_enhanced.rebuild_dedup_index()
+        return detector.assign_sync("C4", "Storm drain on 5th main blocked with plastic waste",
+                                    {"lat": 12.9101, "lon": 77.6301}, now.timestamp())
+
+    match = asyncio.run(scenario())
+    asyncio.run(repository.close())
+    assert len(detector) == 4
+    assert match["cluster_id"] == "K1" and not match["new_cluster"] and match["cluster_size"] == 3
@@ -0,0 +1,143 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+import csv
+import gzip
+import io
+import random
+from datetime import datetime, timedelta
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from exports import (COMPLAINT_EXPORT_COLUMNS, FORWARD_EXPORT_COLUMNS, complaint_values, csv_stream,
+                     forward_values, gzip_stream, parquet_stream)
+from repository import InMemoryRepository, SQLiteRepository
+
+START = datetime(2025, 11, 1, 8)
+
+def make_complaint(i, rng):
+    created = START + timedelta(minutes=rng.randrange(5000))
+    return {"complaint_id": f"C{i:03d}", "title": f"Complaint {i}", "description": "Drain, \"blocked\"\nagain",
+            "category": rng.choice(["roads", "water"]), "location": {"lat": 12.5, "lon": 77.25},
+            "attachments": [], "language_tag": "en", "spam_score": 0.25, "predicted_class": "roads",
+            "ml_confidence_score": 0.5, "recurrence_flag": i % 3 == 0, "cluster_id": None,
+            "duplicate_similarity_score": 0.0, "created_at": created, "updated_at": created, "submitted_by": None}
+
+def make_forward(i, rng):
+    created = START + timedelta(minutes=i)
+    return {"forward_id": f"F{i:03d}", "complaint_id": f"C{i % 50:03d}",
+            "recipient_department": rng.choice(["Roads", "Water"]),
+            "recipient_officer_id": "OFF-1", "recipient_officer_name": "Officer", "remarks": "", "follow_up_date": created,
+            "priority_level": "High", "status": "Pending", "sla_deadline": created + timedelta(days=1),
+            "sla_status": "On-Track", "recurrence_flag": False, "previous_occurrences_count": 0, "cluster_id": None,
+            "duplicate_similarity_score": 0.0, "ml_confidence_score": 0.5, "forwarded_by": "USER-1",
+            "created_at": created, "updated_at": created}
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request, tmp_path):
+    repo = InMemoryRepository() if request.param == "memory" else SQLiteRepository(str(tmp_path / "e.db"))
+    yield repo
+    asyncio.run(repo.close())
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+async def collect_bytes(stream):
+    return b"".join([data async for data in stream])
+
+def test_exports_walk_every_match_newest_first_in_bounded_chunks(repository):
+    rng = random.Random(3)
+    complaints = [make_complaint(i, rng) for i in range(53)]
+    forwards = [make_forward(i, rng) for i in range(47)]
+
+    async def scenario():
+        await repository.add_complaints(complaints)
+        await repository.add_forwards(forwards)
+        everything = await collect(repository.export_complaints(10))
+        roads = await collect(repository.export_complaints(10, category="roads"))
+
+        walk = repository.export_forwards(10, recipient_department="Water")
+        first = await walk.__anext__()
+        # Forwards made once the export is under way are not part of it
+        await repository.add_forward(make_forward(99, rng))
+        water = [first] + await collect(walk)
+        return everything, roads, water
+
+    everything, roads, water = asyncio.run(scenario())
+    newest_first = sorted(complaints, key=lambda c: (c["created_at"], c["complaint_id"]), reverse=True)
+    assert [len(chunk) for chunk in everything] == [10, 10, 10, 10, 10, 3]
+    assert [c["complaint_id"] for chunk in everything for c in chunk] == [c["complaint_id"] for c in newest_first]
+    assert [c["complaint_id"] for chunk in roads for c in chunk] == \
+        [c["complaint_id"] for c in newest_first if c["category"] == "roads"]
+
+    assert all(0 < len(chunk) <= 10 for chunk in water)
+    assert [f["forward_id"] for chunk in water for f in chunk] == \
+        [f["forward_id"] for f in reversed(forwards) if f["recipient_department"] == "Water"]
+
+def test_csv_parquet_and_gzip_encode_chunk_by_chunk():
+    rng = random.Random(4)
+    complaints = [make_complaint(i, rng) for i in range(7)]
+    chunks = [complaints[:4], complaints[4:]]
+
+    async def stream(chunks):
+        for chunk in chunks:
+            yield chunk
+
+    csv_parts = asyncio.run(collect(csv_stream(stream(chunks), COMPLAINT_EXPORT_COLUMNS, complaint_values)))
+    assert len(csv_parts) == 3  # header, then one block per chunk
+    rows = list(csv.DictReader(io.StringIO(b"".join(csv_parts).decode())))
+    assert [row["complaint_id"] for row in rows] == [c["complaint_id"] for c in complaints]
+    assert rows[0]["description"] == complaints[0]["description"]
+    assert rows[0]["created_at"] == complaints[0]["created_at"].isoformat() and rows[0]["cluster_id"] == ""
+    assert rows[0]["location_lat"] == "12.5"
+
+    compressed = asyncio.run(collect_bytes(gzip_stream(
+        csv_stream(stream(chunks), COMPLAINT_EXPORT_COLUMNS, complaint_values))))
+    assert gzip.decompress(compressed) == b"".join(csv_parts)
+
+    forwards = [make_forward(i, rng) for i in range(5)]
+    data = asyncio.run(collect_bytes(parquet_stream(stream([forwards[:3], forwards[3:]]),
+                                                    FORWARD_EXPORT_COLUMNS, forward_values)))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read(use_threads=False)
+    assert table.column_names == [name for name, _ in FORWARD_EXPORT_COLUMNS]
+    assert table.column("forward_id").to_pylist() == [f["forward_id"] for f in forwards]
+    assert table.column("sla_deadline").to_pylist() == [f["sla_deadline"] for f in forwards]
+
+def test_export_endpoints_stream_filtered_downloads():
+    from main_enhanced import SESSIONS, app
+
+    client = TestClient(app)
+    token, _ = asyncio.run(SESSIONS.create({"user_id": "EXPORTER", "role": "admin"}))
+    admin = {"Authorization": f"Bearer {token}"}
+    complaint = client.post("/api/complaints", json={
+        "title": "Export", "description": "Broken bench in the export park", "category": "export-parks",
+        "location": {"lat": 12.2, "lon": 77.2},
+    }).json()
+    client.post("/api/complaints/forward", headers=admin, json={
+        "complaint_id": complaint["complaint_id"], "recipient_department": "Export Dept",
+        "recipient_officer_id": "OFF-1", "recipient_officer_name": "Officer", "remarks": "",
+        "follow_up_date": "2025-12-31T10:00:00", "priority_level": "Low",
+    })
+
+    response = client.get("/api/admin/exports/complaints", params={"category": "export-parks", "gzip": "true"},
+                          headers=admin)
+    assert response.status_code == 200 and response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.csv.gz"')
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+    assert [row["complaint_id"] for row in rows] == [complaint["complaint_id"]]
+
+    response = client.get("/api/admin/exports/forwards", params={"recipient_department": "Export Dept",
+                                                                 "format": "parquet"}, headers=admin)
+    table = pq.ParquetFile(io.BytesIO(response.content)).read(use_threads=False)
+    assert table.column("complaint_id").to_pylist() == [complaint["complaint_id"]]
+    assert "undo_token" not in table.column_names
+
+    assert client.get("/api/admin/exports/forwards", params={"format": "xlsx"}, headers=admin).status_code == 400
+    citizen_token, _ = asyncio.run(SESSIONS.create({"user_id": "CITIZEN-X", "role": "user"}))
+    citizen = {"Authorization": f"Bearer {citizen_token}"}
+    assert client.get("/api/admin/exports/complaints", headers=citizen).status_code == 403
@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+import json
+from collections import Counter
+
+import pytest
+import generate_fixtures
+
+def generate(tmp_path, name="complaints.jsonl", *options):
+    output = str(tmp_path / name)
+    generate_fixtures.main(["--output", output, "--end", "2025-11-01T00:00:00", *options])
+    return output
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_output_is_reproducible(tmp_path):
+    first = generate(tmp_path, "a.jsonl", "--count", "500", "--batch-size", "128")
+    second = generate(tmp_path, "b.jsonl", "--count", "500", "--batch-size", "128")
+    with open(first, "rb") as a, open(second, "rb") as b:
+        assert a.read() == b.read()
+
+    records = read_jsonl(first)
+    assert len(records) == 500 and len({r["complaint_id"] for r in records}) == 500
+    assert {"title", "description", "category", "location", "created_at"} <= set(records[0])
+    assert all("2025-10-02" <= r["created_at"] < "2025-11-01T00:00:01" for r in records)
+
+def test_rates_and_category_mix(tmp_path):
+    path = generate(tmp_path, "c.jsonl", "--count", "20000", "--spam-ratio", "0.1", "--duplicate-rate", "0.3",
+                    "--categories", "traffic=3,utilities=1", "--hotspot", "12.5,77.5,500", "--random-hotspots", "0",
+                    "--hotspot-share", "0.5")
+    records = read_jsonl(path)
+
+    spam = sum(r["is_spam"] for r in records) / len(records)
+    assert spam == pytest.approx(0.1, abs=0.015)
+    categories = Counter(r["category"] for r in records if not r["is_spam"])
+    assert set(categories) == {"traffic", "utilities"}
+    assert categories["traffic"] / sum(categories.values()) == pytest.approx(0.75, abs=0.03)
+    repeated = sum(count - 1 for count in Counter(r["description"] for r in records if not r["is_spam"]).values())
+    assert repeated / len(records) >= 0.25
+    near_hotspot = sum(abs(r["location"]["lat"] - 12.5) < 0.02 and abs(r["location"]["lon"] - 77.5) < 0.02
+                       for r in records)
+    assert near_hotspot / len(records) > 0.45
+
+def test_shards_cover_count_in_parallel(tmp_path):
+    output = generate(tmp_path, "shards/c.jsonl", "--count", "1001", "--shards", "3", "--workers", "2")
+    shards = [generate_fixtures.shard_path(output, shard, 3) for shard in range(3)]
+    records = [r for path in shards for r in read_jsonl(path)]
+    assert len(records) == 1001 and len({r["complaint_id"] for r in records}) == 1001
+    assert records[-1]["title"] == "Complaint #1001"
+
+def test_parquet_output(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = generate(tmp_path, "c.parquet", "--count", "300", "--batch-size", "100")
+    table = pq.read_table(path)
+    assert table.num_rows == 300
+    assert pq.ParquetFile(path).num_row_groups == 3
+    assert set(table.column("location").to_pylist()[0]) == {"lat", "lon"}
@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import random
+import numpy as np
+import pytest
+from geo_index import GeoGridIndex, haversine_m, location_coordinates
+
+def test_radius_query_matches_brute_force():
+    rng = random.Random(3)
+    points = [(rng.uniform(12.0, 13.0), rng.uniform(77.0, 78.0)) for _ in range(5000)]
+    index = GeoGridIndex(cell_degrees=0.005)
+    for key, (lat, lon) in enumerate(points):
+        index.add(key, lat, lon)
+
+    lat, lon, radius = 12.5, 77.5, 2000
+    keys, distances = index.query(lat, lon, radius)
+    all_distances = haversine_m(lat, lon, np.array([p[0] for p in points]), np.array([p[1] for p in points]))
+    assert sorted(keys.tolist()) == np.flatnonzero(all_distances <= radius).tolist()
+    assert (distances <= radius).all()
+
+def brute_force(points, lat, lon, radius):
+    distances = haversine_m(lat, lon, np.array([p[0] for p in points]), np.array([p[1] for p in points]))
+    return np.flatnonzero(distances <= radius).tolist()
+
+def test_queries_at_the_poles_stay_cheap_and_exact():
+    rng = random.Random(5)
+    points = [(rng.uniform(89.9, 90.0), rng.uniform(-180.0, 180.0)) for _ in range(2000)]
+    points += [(rng.uniform(-90.0, -89.95), rng.uniform(-180.0, 180.0)) for _ in range(500)]
+    index = GeoGridIndex(cell_degrees=0.005)
+    for key, (lat, lon) in enumerate(points):
+        index.add(key, lat, lon)
+
+    lookups = []
+
+    class CountingCells(dict):
+        def get(self, key, default=None):
+            lookups.append(key)
+            return super().get(key, default)
+    index._cells = CountingCells(index._cells)
+
+    for lat, lon in ((90.0, 0.0), (89.999, 170.0), (-90.0, -45.0)):
+        lookups.clear()
+        keys, _ = index.query(lat, lon, 2000)
+        assert sorted(keys.tolist()) == brute_force(points, lat, lon, 2000)
+        # Only the occupied cells of the few rows near the pole are visited, not
+        # every one of the 72000 columns of a row
+        assert len(lookups) < len(points)
+
+def test_queries_wrap_across_the_antimeridian():
+    points = [(10.0, 179.999), (10.0, -179.999), (10.0, 179.9), (10.0, -179.9), (10.0, 0.0)]
+    index = GeoGridIndex(cell_degrees=0.005)
+    for key, (lat, lon) in enumerate(points):
+        index.add(key, lat, lon)
+
+    for lon in (180.0, -180.0, 179.9995, -179.9995):
+        keys, distances = index.query(10.0, lon, 1000)
+        assert sorted(keys.tolist()) == brute_force(points, 10.0, lon, 1000) == [0, 1]
+        assert (distances < 1000).all()
+    keys, _ = index.query(10.0, 179.95, 20000)
+    assert sorted(keys.tolist()) == brute_force(points, 10.0, 179.95, 20000) == [0, 1, 2, 3]
+
+def test_time_window_filters_old_points():
+    index = GeoGridIndex()
+    index.add(1, 12.9716, 77.5946, timestamp=100.0)
+    index.add(2, 12.9717, 77.5947, timestamp=500.0)
+    keys, _ = index.query(12.9716, 77.5946, 100, since=200.0)
+    assert keys.tolist() == [2]
+    assert len(index) == 2
+
+def test_location_coordinates_rejects_unusable_points():
+    assert location_coordinates({"lat": "12.5", "lon": 77}) == (12.5, 77.0)
+    assert location_coordinates({}) is None
+    assert location_coordinates({"lat": 12.5}) is None
+    assert location_coordinates({"lat": 123, "lon": 77}) is None
+
+def test_recurrence_only_within_radius_and_window():
+    from dedup import DuplicateDetector, HashingEmbedder
+
+    detector = DuplicateDetector(HashingEmbedder(dim=256), threshold=0.8, radius_m=500, window_seconds=3600)
+    text = "Street light not working near metro station"
+    detector.assign_sync("C1", text, {"lat": 12.9716, "lon": 77.5946}, timestamp=1000.0)
+    far = detector.assign_sync("C2", text, {"lat": 13.0500, "lon": 77.5946}, timestamp=1100.0)
+    late = detector.assign_sync("C3", text, {"lat": 12.9717, "lon": 77.5946}, timestamp=9000.0)
+    near = detector.assign_sync("C4", text, {"lat": 12.9720, "lon": 77.5950}, timestamp=9100.0)
+
+    assert far["cluster_id"] is None
+    assert late["cluster_id"] is None
+    assert near["neighbour_id"] == "C3" and near["cluster_size"] == 2
+    assert near["centroid"]["lat"] == pytest.approx((12.9717 + 12.9720) / 2)
+    assert near["centroid"]["lon"] == pytest.approx((77.5946 + 77.5950) / 2)
@@ -0,0 +1,125 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+import struct
+
+import bson
+from fastapi.testclient import TestClient
+from health import OP_MSG, HealthChecker, mongo_probe, redis_probe
+from main_enhanced import app, HEALTH
+from repository import SQLiteRepository
+
+client = TestClient(app)
+
+async def serve(handler):
+    """Local stand-in server on a free port; returns (server, port)"""
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+async def fake_redis(reader, writer):
+    # Answers every RESP command with +OK, except PING with +PONG
+    while True:
+        header = await reader.readline()
+        if not header:
+            break
+        args = []
+        for _ in range(int(header[1:])):
+            await reader.readline()
+            args.append((await reader.readline()).strip())
+        writer.write(b"+PONG\r\n" if args[0] == b"PING" else b"+OK\r\n")
+        await writer.drain()
+    writer.close()
+
+async def fake_mongo(reader, writer):
+    length, request_id, _, _ = struct.unpack("<iiii", await reader.readexactly(16))
+    command = bson.decode((await reader.readexactly(length - 16))[5:])
+    reply = {"ok": 1.0} if command == {"ping": 1, "$db": "admin"} else {"ok": 0.0, "errmsg": "bad command"}
+    body = struct.pack("<iB", 0, 0) + bson.encode(reply)
+    writer.write(struct.pack("<iiii", 16 + len(body), 2, request_id, OP_MSG) + body)
+    await writer.drain()
+    writer.close()
+
+async def silent(reader, writer):
+    await asyncio.sleep(10)
+
+def test_live_and_ready_endpoints():
+    assert client.get("/health/live").json() == {"status": "alive"}
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    report = response.json()
+    assert report["status"] == "ready"
+    assert report["dependencies"]["database"]["status"] == "up"
+    assert report["dependencies"]["database"]["latency_ms"] >= 0
+
+def test_ready_reports_unavailable_dependency_with_503():
+    async def down():
+        raise ConnectionRefusedError("connection refused")
+
+    probes, report = HEALTH.probes, HEALTH._report
+    HEALTH.probes, HEALTH._report = {"database": down}, None
+    try:
+        response = client.get("/health/ready")
+    finally:
+        HEALTH.probes, HEALTH._report = probes, report
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "not_ready"
+    assert body["dependencies"]["database"] == {
+        "status": "down", "error": "connection refused", "latency_ms": body["dependencies"]["database"]["latency_ms"]}
+
+def test_redis_and_mongo_probes_against_stand_ins():
+    async def run():
+        redis_server, redis_port = await serve(fake_redis)
+        mongo_server, mongo_port = await serve(fake_mongo)
+        slow_server, slow_port = await serve(silent)
+        checker = HealthChecker({
+            "redis": redis_probe(f"redis://127.0.0.1:{redis_port}/0"),
+            "redis_auth": redis_probe(f"redis://:secret@127.0.0.1:{redis_port}/0"),
+            "mongodb": mongo_probe(f"mongodb://user:pw@127.0.0.1:{mongo_port}/smartcomplaint"),
+            "slow": redis_probe(f"redis://127.0.0.1:{slow_port}"),
+        }, timeout=0.2, ttl=0)
+        report = await checker.check()
+        for server in (redis_server, mongo_server, slow_server):
+            server.close()
+        return report
+
+    report = asyncio.run(run())
+    dependencies = report["dependencies"]
+    assert report["status"] == "not_ready"
+    assert dependencies["redis"]["status"] == "up"
+    assert dependencies["redis_auth"]["status"] == "up"
+    assert dependencies["mongodb"]["status"] == "up"
+    assert dependencies["slow"] == {"status": "down", "error": "timed out after 0.2s",
+                                    "latency_ms": dependencies["slow"]["latency_ms"]}
+    # Probes run in parallel, so the timeout bounds the whole check
+    assert max(d["latency_ms"] for d in dependencies.values()) < 1000
+
+def test_reports_are_cached_and_concurrent_checks_share_one_probe():
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+
+    async def run():
+        checker = HealthChecker({"dep": probe}, ttl=60)
+        first = await asyncio.gather(*(checker.check() for _ in range(10)))
+        again = await checker.check()
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert len(calls) == 1
+    assert [r["cached"] for r in first].count(False) == 1
+    assert again["cached"] is True and again["checked_at"] == first[0]["checked_at"]
+
+def test_sql_repository_ping(tmp_path):
+    async def run():
+        repository = SQLiteRepository(str(tmp_path / "health.db"))
+        try:
+            await repository.ping()
+        finally:
+            await repository.close()
+
+    asyncio.run(run())
@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from ingest import LineTooLong, iter_lines
+from main_enhanced import SESSIONS, app
+
+client = TestClient(app)
+ADMIN_TOKEN, _ = asyncio.run(SESSIONS.create({"user_id": "INGEST-ADMIN", "role": "admin"}))
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'data', 'complaints.jsonl')
+
+async def collect(chunks, **kwargs):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+    return [item async for item in iter_lines(stream(), **kwargs)]
+
+def test_lines_are_split_across_chunk_boundaries():
+    lines = asyncio.run(collect([b'{"a"', b': 1}\n\n{"b": 2}\n{"c"', b": 3}"]))
+    assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+def test_overlong_line_is_rejected():
+    with pytest.raises(LineTooLong):
+        asyncio.run(collect([b"x" * 64], max_line_bytes=16))
+
+def ingest(body, **params):
+    response = client.post("/api/complaints/ingest", content=body, params=params,
+                           headers={"Content-Type": "application/x-ndjson",
+                                    "Authorization": f"Bearer {ADMIN_TOKEN}"})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_ingest_fixture_file_in_chunks():
+    with open(FIXTURES, "rb") as f:
+        body = f.read()
+    records = [json.loads(line) for line in body.splitlines()]
+    events = ingest(body, chunk_size=64)
+
+    summary = events[-1]
+    assert summary["done"] is True
+    assert summary["lines"] == summary["committed"] == len(records) and summary["failed"] == 0
+    assert [e["committed"] for e in events[:-1]] == [64, 128, 192]
+
+    stored = client.get(f"/api/complaints/{records[5]['complaint_id']}").json()
+    assert stored["description"] == records[5]["description"]
+    assert stored["created_at"] == records[5]["created_at"]
+
+def test_ingest_reports_bad_lines_and_keeps_going():
+    good = {"title": "Pothole", "description": "Deep pothole on ring road near the flyover exit",
+            "category": "infrastructure", "location": {"lat": 12.5, "lon": 77.5}}
+    body = "\n".join([
+        json.dumps(dict(good, complaint_id="INGEST-1")),
+        "{not json",
+        json.dumps({"title": "No description"}),
+        json.dumps(dict(good, complaint_id="INGEST-1")),
+        json.dumps(good),
+    ])
+    events = ingest(body.encode())
+
+    errors = {e["line"]: e["error"] for e in events if "line" in e}
+    assert set(errors) == {2, 3, 4}
+    assert "description" in errors[3] and "already exists" in errors[4]
+    assert events[-1]["committed"] == 2 and events[-1]["failed"] == 3
+    # The second copy of the same text is recognised as a recurrence
+    assert client.get("/api/complaints/INGEST-1").json()["recurrence_flag"] is True
+
+def test_ingest_needs_an_admin_session():
+    body = b'{"complaint_id": "FORGED-1", "title": "Forged", "description": "Backdated complaint"}\n'
+    assert client.post("/api/complaints/ingest", content=body).status_code == 401
+    token, _ = asyncio.run(SESSIONS.create({"user_id": "INGEST-CITIZEN", "role": "user"}))
+    response = client.post("/api/complaints/ingest", content=body, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import pytest
+from fastapi.testclient import TestClient
+from main_enhanced import app
+from metrics import Registry
+
+client = TestClient(app)
+
+def sample(text, name):
+    """Value of the sample line starting with ``name`` in an exposition"""
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} not exported")
+
+def test_registry_renders_text_format():
+    registry = Registry()
+    requests = registry.counter("jobs_total", "Jobs by state", ("state",))
+    latency = registry.histogram("job_seconds", "Job latency", buckets=(0.1, 1.0))
+    requests.labels("done").inc(3)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    text = registry.render()
+
+    assert "# TYPE jobs_total counter" in text
+    assert sample(text, 'jobs_total{state="done"}') == 3
+    assert sample(text, 'job_seconds_bucket{le="0.1"}') == 1
+    assert sample(text, 'job_seconds_bucket{le="1"}') == 2
+    assert sample(text, 'job_seconds_bucket{le="+Inf"}') == 3
+    assert sample(text, "job_seconds_count") == 3
+    assert sample(text, "job_seconds_sum") == pytest.approx(5.55)
+
+def test_registry_reuses_metrics_and_rejects_conflicts():
+    registry = Registry()
+    assert registry.counter("a_total", "A") is registry.counter("a_total", "A")
+    with pytest.raises(ValueError):
+        registry.gauge("a_total", "A")
+
+def test_metrics_endpoint_reports_routes_ml_and_stores():
+    complaint_id = client.post("/api/complaints", json={
+        "title": "Metrics", "description": "Street light not working on 3rd main",
+        "category": "infrastructure", "location": {"lat": 12.1, "lon": 77.1},
+    }).json()["complaint_id"]
+    client.get(f"/api/complaints/{complaint_id}")
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert sample(text, 'http_requests_total{method="GET",route="/api/complaints/{complaint_id}",status="200"}') >= 1
+    assert sample(text, 'http_requests_total{method="GET",route="unmatched",status="404"}') >= 1
+    assert sample(text, 'http_request_duration_seconds_count{method="POST",route="/api/complaints"}') >= 1
+    assert sample(text, 'ml_inference_seconds_count{model="dedup"}') >= 1
+    assert sample(text, 'store_records{store="complaints"}') >= 1
+    # the /metrics request itself is still being served
+    assert sample(text, "http_requests_in_flight") == 1
+
+def test_loop_lag_monitor_sees_blocked_loop():
+    import asyncio
+    import time
+    from metrics import LoopLagMonitor
+
+    monitor = LoopLagMonitor(Registry(), interval=0.01)
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # block the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    asyncio.run(scenario())
+    assert monitor.lag_histogram.count >= 2
+    assert monitor.lag_histogram.sum >= 0.05
@@ -0,0 +1,142 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ml'))
+
+import asyncio
+import json
+import threading
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import HashingVectorizer
+from metrics import Registry
+from model_registry import ModelRegistry, RegistryError
+from model_server import ModelWatcher, SpamModelServer
+
+# Single-text requests set HELD and wait on GATE, so a test can hold one in flight
+GATE = threading.Event()
+HELD = threading.Event()
+CALLS = []
+
+class GatedModel:
+    classes_ = np.array([0, 1])
+
+    def __init__(self, spam_probability):
+        self.spam_probability = spam_probability
+
+    def predict_proba(self, X):
+        CALLS.append((self.spam_probability, X.shape[0]))
+        if X.shape[0] == 1:
+            HELD.set()
+            assert GATE.wait(5)
+        return np.tile([1 - self.spam_probability, self.spam_probability], (X.shape[0], 1))
+
+def publish(registry, tmp_path, spam_probability):
+    joblib.dump(GatedModel(spam_probability), tmp_path / "model.pkl")
+    joblib.dump(HashingVectorizer(n_features=16), tmp_path / "vectorizer.pkl")
+    return registry.publish("spam", {"model.pkl": str(tmp_path / "model.pkl"),
+                                     "vectorizer.pkl": str(tmp_path / "vectorizer.pkl")}, {"trainer": "test"})
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / "registry"))
+
+def test_publish_activate_and_rollback(registry, tmp_path):
+    assert registry.current("spam") is None
+    first = publish(registry, tmp_path, 0.1)
+    second = publish(registry, tmp_path, 0.9)
+    assert (first.version, second.version) == ("v000001", "v000002")
+    assert registry.versions("spam") == ["v000001", "v000002"] and registry.current("spam") == "v000002"
+
+    metadata = registry.get("spam").metadata
+    assert metadata["trainer"] == "test" and set(metadata["files"]) == {"model.pkl", "vectorizer.pkl"}
+    registry.activate("spam", "v000001")
+    assert registry.current("spam") == "v000001"
+    with pytest.raises(RegistryError):
+        registry.activate("spam", "v000009")
+
+    with open(second.file("model.pkl"), "ab") as f:
+        f.write(b"tampered")
+    with pytest.raises(RegistryError, match="checksum"):
+        registry.get("spam", "v000002")
+
+def test_watcher_swaps_while_requests_finish_on_the_old_model(registry, tmp_path):
+    publish(registry, tmp_path, 0.1)
+    server = SpamModelServer(str(tmp_path / "missing.pkl"), str(tmp_path / "missing.pkl"), registry=registry,
+                             warmup_batch=8)
+    assert server.load() and server.version == "v000001"
+    metrics = Registry()
+    watcher = ModelWatcher(registry, [server], metrics)
+
+    GATE.clear()
+    HELD.clear()
+    in_flight = []
+    request = threading.Thread(target=lambda: in_flight.append(server.predict_spam("held")))
+    request.start()
+    assert HELD.wait(5)
+    publish(registry, tmp_path, 0.9)
+    CALLS.clear()
+    asyncio.run(watcher.check())
+    # Warmed with a full batch before going live, without waiting for the held request
+    assert server.version == "v000002" and CALLS == [(0.9, 8)]
+    GATE.set()
+    request.join(5)
+
+    assert in_flight == [pytest.approx(0.1)]
+    assert server.predict_spam("new") == pytest.approx(0.9)
+    assert 'model_reloads_total{model="spam",outcome="swapped"} 1' in metrics.render()
+
+def test_broken_version_keeps_the_old_model(registry, tmp_path):
+    publish(registry, tmp_path, 0.1)
+    server = SpamModelServer(str(tmp_path / "missing.pkl"), str(tmp_path / "missing.pkl"), registry=registry)
+    server.load()
+    metrics = Registry()
+    watcher = ModelWatcher(registry, [server], metrics)
+
+    broken = publish(registry, tmp_path, 0.9)
+    with open(broken.file("model.pkl"), "wb") as f:
+        f.write(b"truncated")
+
+    async def run():
+        await watcher.check()
+        await watcher.check()  # not retried until CURRENT moves again
+
+    asyncio.run(run())
+    GATE.set()
+    assert server.version == "v000001" and server.predict_spam("still served") == pytest.approx(0.1)
+    assert 'model_reloads_total{model="spam",outcome="rejected"} 1' in metrics.render()
+
+    registry.activate("spam", "v000001")
+    asyncio.run(watcher.check())
+    assert server.stats()["swaps"] == 0
+
+    # Checksums match but the artifact is not a model: a load failure rather than a rejection
+    (tmp_path / "model.pkl").write_bytes(b"not a pickle")
+    registry.publish("spam", {"model.pkl": str(tmp_path / "model.pkl"),
+                              "vectorizer.pkl": str(tmp_path / "vectorizer.pkl")}, {"trainer": "test"})
+    asyncio.run(watcher.check())
+    assert server.version == "v000001"
+    assert 'model_reloads_total{model="spam",outcome="failed"} 1' in metrics.render()
+
+def test_trainers_publish_and_update_from_the_registry(registry, tmp_path):
+    import train_spam_classifier
+
+    def train(*extra):
+        args = train_spam_classifier.build_parser().parse_args(
+            ["--output", str(tmp_path / "spam.pkl"), "--vectorizer-output", str(tmp_path / "vectorizer.pkl"),
+             "--registry", registry.root, "--n-features", "1024", "--workers", "1", "--epochs", "2", *extra])
+        return train_spam_classifier.train(args)
+
+    first = train()
+    os.remove(tmp_path / "spam.pkl")  # --update reads the registry's version, not --output
+    train("--update")
+
+    assert registry.versions("spam") == ["v000001", "v000002"]
+    metadata = registry.get("spam").metadata
+    assert metadata["updated_from"] == "v000001" and metadata["params"]["n_features"] == 1024
+    assert "accuracy" in metadata["holdout"] or metadata["holdout"] == {"records": 0}
+    assert joblib.load(registry.get("spam").file("model.pkl")).t_ > first.t_
+    with open(os.path.join(registry.root, "spam", "v000002", "metadata.json")) as f:
+        assert json.load(f)["files"]["model.pkl"] == metadata["files"]["model.pkl"]
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import joblib
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from model_server import SpamModelServer
+
+TRAINING_DATA = [
+    ("Garbage not picked up for weeks", 0),
+    ("Street light broken near metro station", 0),
+    ("Water supply issue in my area", 0),
+    ("Potholes causing traffic problems", 0),
+    ("Click here to claim your prize now", 1),
+    ("Congratulations you won a lottery prize", 1),
+    ("Free money claim your reward now", 1),
+    ("Limited time offer buy now", 1),
+]
+
+@pytest.fixture
+def artifacts(tmp_path):
+    texts, labels = zip(*TRAINING_DATA)
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression(C=10).fit(vectorizer.fit_transform(texts), labels)
+    model_path, vectorizer_path = tmp_path / "model.pkl", tmp_path / "vectorizer.pkl"
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+    return str(model_path), str(vectorizer_path)
+
+def test_scores_come_from_the_trained_model(artifacts):
+    server = SpamModelServer(*artifacts)
+    assert server.load()
+
+    spam = server.predict_spam("Claim your free prize now")
+    ham = server.predict_spam("Garbage on the street near the station")
+    assert 0.0 <= ham < 0.5 < spam <= 1.0
+
+    stats = server.stats()
+    assert stats["loaded"] and stats["count"] == 2
+    assert stats["p50_ms"] <= stats["p99_ms"]
+
+def test_artifacts_are_loaded_once(artifacts):
+    server = SpamModelServer(*artifacts)
+    server.load()
+    model = server.model
+    server.predict_spam_batch(["one", "two"])
+    assert server.model is model
+
+def test_missing_artifacts_disable_scoring(tmp_path):
+    server = SpamModelServer(str(tmp_path / "missing.pkl"), str(tmp_path / "missing_vec.pkl"))
+    assert server.predict_spam("anything") is None
+    assert server.stats()["loaded"] is False
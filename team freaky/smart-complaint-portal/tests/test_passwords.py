@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+import time
+from datetime import datetime
+
+import mongo_integration
+from passwords import PasswordHasher, PasswordHasherBusy
+from users import InMemoryUserRepository
+
+def test_hash_and_verify_use_configured_rounds():
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+
+    async def run():
+        password_hash = await hasher.hash("s3cret")
+        return password_hash, await hasher.verify("s3cret", password_hash), await hasher.verify("wrong", password_hash)
+
+    password_hash, valid, invalid = asyncio.run(run())
+    assert password_hash.startswith("$2b$04$")
+    assert valid and not invalid
+
+def test_hash_with_old_cost_is_replaced_on_verify():
+    old = PasswordHasher(rounds=4)
+    new = PasswordHasher(rounds=5)
+
+    async def run():
+        password_hash = await old.hash("s3cret")
+        return password_hash, await new.verify_and_update("s3cret", password_hash)
+
+    password_hash, (valid, replacement) = asyncio.run(run())
+    assert new.needs_update(password_hash)
+    assert valid and replacement.startswith("$2b$05$")
+    assert not new.needs_update(replacement)
+
+def test_event_loop_keeps_running_while_hashing():
+    hasher = PasswordHasher(rounds=10, max_workers=1)
+
+    async def run():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        task = asyncio.ensure_future(ticker())
+        await asyncio.gather(*(hasher.hash("pw") for _ in range(3)))
+        task.cancel()
+        return ticks
+
+    ticks = asyncio.run(run())
+    assert len(ticks) > 5
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.05
+
+def test_full_queue_rejects_with_busy():
+    hasher = PasswordHasher(rounds=10, max_workers=1, max_pending=1, queue_timeout=0.01)
+
+    async def run():
+        return await asyncio.gather(*(hasher.hash("pw") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 2
+    assert hasher.rejected == 2
+
+def test_authenticate_user_rehashes_outdated_hash(monkeypatch):
+    old_hash = PasswordHasher(rounds=4).context.hash("password123")
+    users = InMemoryUserRepository()
+    asyncio.run(users.create_user({'user_id': 'U1', 'username': 'asha', 'email': 'asha@example.com',
+                                   'password_hash': old_hash, 'full_name': 'Asha', 'role': 'user',
+                                   'created_at': datetime.now()}))
+    monkeypatch.setattr(mongo_integration, "USERS", users)
+    monkeypatch.setattr(mongo_integration, "PASSWORDS", PasswordHasher(rounds=5))
+
+    assert asyncio.run(mongo_integration.authenticate_user("asha", "wrong")) == {"error": "Invalid password"}
+    assert users.users['U1']['password_hash'] == old_hash
+    result = asyncio.run(mongo_integration.authenticate_user("asha@example.com", "password123"))
+    assert result["success"] and "password_hash" not in result["user"]
+    assert users.users['U1']['password_hash'].startswith("$2b$05$")
@@ -0,0 +1,263 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from repository import ComplaintRepository, InMemoryRepository, SQLiteRepository, complaint_filters, create_repository
+
+def make_complaint(complaint_id="C1"):
+    now = datetime(2025, 11, 1, 9, 30)
+    return {
+        "complaint_id": complaint_id,
+        "title": "Street light broken",
+        "description": "Street light not working near metro station",
+        "category": "infrastructure",
+        "location": {"lat": 12.97, "lon": 77.59},
+        "attachments": ["photo.jpg"],
+        "language_tag": "en",
+        "spam_score": 0.12,
+        "predicted_class": "Infrastructure",
+        "ml_confidence_score": 0.87,
+        "recurrence_flag": False,
+        "cluster_id": None,
+        "duplicate_similarity_score": 0.0,
+        "created_at": now,
+        "updated_at": now,
+        "submitted_by": None,
+    }
+
+def make_forward(forward_id, complaint_id="C1"):
+    now = datetime(2025, 11, 1, 10, 0)
+    return {
+        "forward_id": forward_id,
+        "complaint_id": complaint_id,
+        "recipient_department": "Electrical",
+        "recipient_officer_id": "OFF-001",
+        "recipient_officer_name": "John Doe",
+        "remarks": "Please fix",
+        "follow_up_date": now + timedelta(days=2),
+        "priority_level": "High",
+        "status": "Pending",
+        "sla_deadline": now + timedelta(days=3),
+        "sla_status": "On-Track",
+        "undo_token": "U-" + forward_id,
+        "undo_expires_at": now + timedelta(minutes=5),
+        "recurrence_flag": False,
+        "previous_occurrences_count": 0,
+        "cluster_id": None,
+        "duplicate_similarity_score": 0.25,
+        "ml_confidence_score": 0.87,
+        "forwarded_by": "USER-001",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request, tmp_path):
+    if request.param == "memory":
+        repo = InMemoryRepository()
+    else:
+        repo = SQLiteRepository(str(tmp_path / "complaints.db"), pool_size=2)
+    yield repo
+    asyncio.run(repo.close())
+
+def test_complaint_round_trip(repository):
+    async def scenario():
+        await repository.create_complaint(make_complaint())
+        return await repository.get_complaint("C1"), await repository.get_complaint("missing")
+
+    stored, missing = asyncio.run(scenario())
+    assert stored == make_complaint()
+    assert missing is None
+
+def test_forwards_and_clusters(repository):
+    async def scenario():
+        await repository.create_complaint(make_complaint())
+        await repository.add_forward(make_forward("F1"))
+        await repository.add_forward(make_forward("F2"))
+        await repository.upsert_cluster({"cluster_id": "K1", "centroid_location": {"lat": 1.0, "lon": 2.0},
+                                         "complaint_count": 1, "severity": "Low",
+                                         "last_seen": datetime(2025, 11, 1)})
+        await repository.upsert_cluster({"cluster_id": "K1", "centroid_location": {"lat": 1.0, "lon": 2.0},
+                                         "complaint_count": 2, "severity": "Medium",
+                                         "last_seen": datetime(2025, 11, 2)})
+        return (await repository.forwards_for_complaint("C1"), await repository.get_cluster("K1"),
+                await repository.count_forwards())
+
+    forwards, cluster, count = asyncio.run(scenario())
+    assert [f["forward_id"] for f in forwards] == ["F1", "F2"]
+    assert forwards[0] == make_forward("F1")
+    assert cluster["complaint_count"] == 2 and cluster["severity"] == "Medium"
+    assert count == 2
+
+def test_bulk_lookup_and_batch_insert(repository):
+    async def scenario():
+        await repository.create_complaint(make_complaint("C1"))
+        await repository.create_complaint(make_complaint("C2"))
+        existing = await repository.get_complaints(["C1", "C2", "C3"])
+        await repository.add_forwards([make_forward("F1", "C1"), make_forward("F2", "C2")])
+        return existing, await repository.forwards_for_complaint("C2")
+
+    existing, forwards = asyncio.run(scenario())
+    assert set(existing) == {"C1", "C2"}
+    assert existing["C2"]["title"] == "Street light broken"
+    assert [f["forward_id"] for f in forwards] == ["F2"]
+
+def test_update_complaint(repository):
+    async def scenario():
+        await repository.create_complaint(make_complaint())
+        await repository.update_complaint("C1", cluster_id="K1", recurrence_flag=True)
+        return await repository.get_complaint("C1")
+
+    stored = asyncio.run(scenario())
+    assert stored["cluster_id"] == "K1" and stored["recurrence_flag"] is True
+
+def test_sla_status_updates_and_lookup(repository):
+    async def scenario():
+        await repository.create_complaint(make_complaint())
+        await repository.add_forwards([make_forward(f"F{i}") for i in range(4)])
+        await repository.update_sla_statuses([("F1", "At-Risk"), ("F2", "Breached"), ("F3", "Breached")],
+                                             datetime(2025, 11, 4, 10, 0))
+        return (await repository.forwards_by_sla_status("Breached"),
+                await repository.forwards_by_sla_status("At-Risk"),
+                await repository.forwards_by_sla_status("Breached", limit=1))
+
+    breached, at_risk, limited = asyncio.run(scenario())
+    assert sorted(f["forward_id"] for f in breached) == ["F2", "F3"]
+    assert [f["forward_id"] for f in at_risk] == ["F1"]
+    assert at_risk[0]["updated_at"] == datetime(2025, 11, 4, 10, 0)
+    assert len(limited) == 1
+
+def listed_complaints(count):
+    rng = random.Random(3)
+    start = datetime(2025, 11, 1)
+    return [dict(make_complaint(f"C{i:03d}"),
+                 category=rng.choice(["roads", "water", "sanitation"]),
+                 predicted_class=rng.choice(["roads", "water"]),
+                 recurrence_flag=rng.random() < 0.3,
+                 submitted_by=rng.choice(["U1", "U2", None]),
+                 spam_score=rng.randrange(100) / 100,
+                 # Several complaints share each timestamp, so ties are ordered by id
+                 created_at=start + timedelta(minutes=i // 3))
+            for i in range(count)]
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"category": "water"},
+    {"category": "roads", "predicted_class": "water", "recurrence_flag": False},
+    {"submitted_by": "U1", "min_spam_score": 0.2, "max_spam_score": 0.6},
+    {"created_after": datetime(2025, 11, 1, 0, 5), "created_before": datetime(2025, 11, 1, 0, 17, 30)},
+    {"category": "nope"},
+])
+def test_listing_pages_follow_the_keyset_order(repository, filters):
+    records = listed_complaints(60)
+    low, high = filters.get("min_spam_score", 0), filters.get("max_spam_score", 1)
+    expected = sorted(
+        (r for r in records
+         if all(r[field] == filters[field] for field in ("category", "predicted_class", "recurrence_flag",
+                                                          "submitted_by") if field in filters)
+         and low <= r["spam_score"] <= high
+         and filters.get("created_after", datetime.min) <= r["created_at"] < filters.get("created_before",
+                                                                                       datetime.max)),
+        key=lambda r: (r["created_at"], r["complaint_id"]), reverse=True)
+
+    async def scenario():
+        await repository.add_complaints(records)
+        listed, after = [], None
+        while True:
+            page = await repository.list_complaints(7, after, **complaint_filters(**filters))
+            listed += page
+            if len(page) < 7:
+                return listed, await repository.count_complaints(**filters)
+            after = (page[-1]["created_at"], page[-1]["complaint_id"])
+
+    listed, total = asyncio.run(scenario())
+    assert [r["complaint_id"] for r in listed] == [r["complaint_id"] for r in expected]
+    assert total == len(expected)
+    if listed:
+        assert listed[0] == next(r for r in records if r["complaint_id"] == listed[0]["complaint_id"])
+
+def test_listing_follows_updates(repository):
+    async def scenario():
+        await repository.add_complaints(listed_complaints(6))
+        await repository.update_complaint("C001", category="parks", recurrence_flag=True)
+        return (await repository.list_complaints(10, category="parks"),
+                await repository.list_complaints(10, category="parks", recurrence_flag=False))
+
+    parks, not_recurring = asyncio.run(scenario())
+    assert [r["complaint_id"] for r in parks] == ["C001"] and not_recurring == []
+
+def test_sqlite_listing_is_an_index_range_scan(tmp_path):
+    repository = SQLiteRepository(str(tmp_path / "complaints.db"), pool_size=1)
+    statements = []
+
+    async def scenario():
+        await repository.add_complaints(listed_complaints(30))
+        repository._pool.queue[0].set_trace_callback(statements.append)
+        after = (datetime(2025, 11, 1, 0, 5), "C015")
+        for filters in ({}, {"category": "water"}, {"predicted_class": "roads"}, {"recurrence_flag": True},
+                        {"submitted_by": "U2", "min_spam_score": 0.5}):
+            await repository.list_complaints(10, after, **filters)
+
+    asyncio.run(scenario())
+    asyncio.run(repository.close())
+    conn = sqlite3.connect(str(tmp_path / "complaints.db"))
+    selects = [sql for sql in statements if sql.startswith("SELECT")]
+    assert len(selects) == 5
+    for sql in selects:
+        plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+        # Rows come out of a listing index already in page order: no sort, no full scan
+        assert plan.startswith("SEARCH complaints USING INDEX idx_complaints_") and "TEMP B-TREE" not in plan, plan
+
+def test_existing_database_gains_added_columns(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE complaints (id VARCHAR(36) PRIMARY KEY, title TEXT NOT NULL, "
+                 "description TEXT NOT NULL, category VARCHAR(50) NOT NULL, original_location TEXT, "
+                 "attachments TEXT, language_tag VARCHAR(10) DEFAULT 'en', spam_score DECIMAL(3,2), "
+                 "predicted_class VARCHAR(50), ml_confidence_score DECIMAL(3,2), recurrence_flag BOOLEAN, "
+                 "cluster_id VARCHAR(36), created_at TIMESTAMP, "
+                 "updated_at TIMESTAMP, soft_delete BOOLEAN DEFAULT FALSE)")
+    conn.execute("CREATE INDEX idx_complaints_category ON complaints(category)")
+    conn.commit()
+    conn.close()
+    repository = SQLiteRepository(path)
+
+    async def scenario():
+        await repository.create_complaint(dict(make_complaint(), submitted_by="U7", duplicate_similarity_score=0.5))
+        return await repository.list_complaints(5, submitted_by="U7")
+
+    listed = asyncio.run(scenario())
+    assert [r["complaint_id"] for r in listed] == ["C1"] and listed[0]["duplicate_similarity_score"] == 0.5
+    asyncio.run(repository.close())
+    indexes = {row[0] for row in sqlite3.connect(path).execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_complaints_category_created_at" in indexes and "idx_complaints_category" not in indexes
+
+def test_sqlite_file_is_shared_between_repositories(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    writer, reader = create_repository(url), create_repository(url)
+
+    async def scenario():
+        await writer.create_complaint(make_complaint("C9"))
+        return await reader.get_complaint("C9")
+
+    assert asyncio.run(scenario())["complaint_id"] == "C9"
+    asyncio.run(writer.close())
+    asyncio.run(reader.close())
+
+def test_unknown_database_url_is_rejected():
+    with pytest.raises(ValueError):
+        create_repository("mysql://localhost/db")
+
+def test_unimplemented_export_raises_not_implemented():
+    async def export():
+        async for _ in ComplaintRepository().export_forwards(10):
+            pass
+
+    with pytest.raises(NotImplementedError):
+        asyncio.run(export())
@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+import responses
+from main_enhanced import SESSIONS, ComplaintResponse, ForwardResponse, app
+
+client = TestClient(app)
+
+RECORD = {
+    "complaint_id": "C1", "title": "Drain", "description": "Drain overflowing — ward 7", "category": "sanitation",
+    "location": {"lat": 12.9716, "lon": 77.5946}, "attachments": ["a.jpg"], "language_tag": "kn",
+    "spam_score": 0.03, "predicted_class": "sanitation", "ml_confidence_score": 0.87, "recurrence_flag": True,
+    "cluster_id": None, "duplicate_similarity_score": 0.0,
+    "created_at": datetime(2025, 3, 1, 9, 30, 15, 123456), "updated_at": datetime(2025, 3, 1, 9, 30),
+    "submitted_by": "USER-1",
+}
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("created_at", [
+    datetime(2025, 3, 1, 9, 30, 15, 123456),
+    datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc),
+    datetime(2025, 3, 1, 9, 30, 1, 5, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+])
+def test_records_render_like_the_validated_model(monkeypatch, use_orjson, created_at):
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    record = dict(RECORD, created_at=created_at)
+    expected = ComplaintResponse(**record).model_dump_json()
+    assert json.loads(responses.dumps(record)) == json.loads(expected)
+    assert responses.dumps(np.float32(0.5)) == b"0.5"
+
+def test_complaint_and_forward_endpoints_return_the_stored_record():
+    created = client.post("/api/complaints", json={
+        "title": "Broken light", "description": "Street light not working near gate 4",
+        "category": "infrastructure", "location": {"lat": 12.3, "lon": 77.3},
+    })
+    assert created.headers["content-type"] == "application/json"
+    complaint = created.json()
+    fetched = client.get(f"/api/complaints/{complaint['complaint_id']}")
+    assert fetched.json() == complaint == json.loads(ComplaintResponse(**complaint).model_dump_json())
+
+    token, _ = asyncio.run(SESSIONS.create({"user_id": "OFFICER-9", "role": "admin"}))
+    forward = client.post("/api/complaints/forward", headers={"Authorization": f"Bearer {token}"}, json={
+        "complaint_id": complaint["complaint_id"], "recipient_department": "Electrical",
+        "recipient_officer_id": "OFF-9", "recipient_officer_name": "Officer", "remarks": "Fix",
+        "follow_up_date": "2025-12-31T10:00:00Z", "priority_level": "High",
+    }).json()
+    assert forward == json.loads(ForwardResponse(**forward).model_dump_json())
+    assert forward["follow_up_date"] == "2025-12-31T10:00:00Z" and forward["forwarded_by"] == "OFFICER-9"
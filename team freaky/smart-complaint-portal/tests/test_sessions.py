@@ -0,0 +1,120 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+import main_enhanced
+from main_enhanced import app
+from passwords import PasswordHasher
+from repository import InMemoryRepository, SQLiteRepository
+from sessions import InvalidSession, SessionManager, VerifiedTokenCache
+
+client = TestClient(app)
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class CountingRepository(InMemoryRepository):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    async def get_session(self, session_id):
+        self.lookups += 1
+        return await super().get_session(session_id)
+
+USER = {"user_id": "U1", "role": "user"}
+
+def test_cache_evicts_least_recently_used_and_expired():
+    clock = Clock()
+    cache = VerifiedTokenCache(max_size=2, ttl=10, clock=clock)
+    cache.put("a", {"sid": "A"})
+    cache.put("b", {"sid": "B"}, ttl=2)
+    assert cache.get("a") == {"sid": "A"}
+    cache.put("c", {"sid": "C"})  # evicts b, the least recently used
+    assert cache.get("b") is None and len(cache) == 2
+    clock.now = 11
+    assert cache.get("a") is None and cache.get("c") is None
+
+def test_verified_tokens_skip_the_database_until_revoked():
+    repository = CountingRepository()
+    sessions = SessionManager(repository, secret="test-secret")
+
+    async def run():
+        token, session = await sessions.create(USER)
+        claims = [await sessions.authenticate(token) for _ in range(5)]
+        lookups = repository.lookups
+        await sessions.revoke(session["session_id"])
+        with pytest.raises(InvalidSession):
+            await sessions.authenticate(token)
+        return claims, lookups
+
+    claims, lookups = asyncio.run(run())
+    assert lookups == 1
+    assert claims[0]["sub"] == "U1" and claims[0]["role"] == "user"
+    assert sessions.cache.hits == 4
+
+def test_revocation_during_verification_is_not_cached():
+    cache = VerifiedTokenCache(ttl=30)
+    cache.revoke("S1")
+    cache.put("token", {"sid": "S1"})
+    assert cache.get("token") is None
+
+def test_rejects_tampered_foreign_and_expired_tokens():
+    sessions = SessionManager(InMemoryRepository(), secret="test-secret")
+
+    async def run():
+        token, _ = await sessions.create(USER)
+        forged = jwt.encode(jwt.decode(token, options={"verify_signature": False}), "other", algorithm="HS256")
+        expired, _ = await sessions.create(USER, now=datetime.now() - timedelta(days=2))
+        for bad in (token[:-2] + "xx", forged, expired):
+            with pytest.raises(InvalidSession):
+                await sessions.authenticate(bad)
+
+    asyncio.run(run())
+
+def test_sessions_persist_in_sql_repository(tmp_path):
+    async def run():
+        repository = SQLiteRepository(str(tmp_path / "sessions.db"))
+        try:
+            token, session = await SessionManager(repository, secret="s").create(USER, ip_address="10.0.0.1")
+            # A fresh manager (e.g. another worker) verifies against the stored session
+            claims = await SessionManager(repository, secret="s").authenticate(token)
+            stored = await repository.get_session(session["session_id"])
+        finally:
+            await repository.close()
+        return token, claims, stored
+
+    token, claims, stored = asyncio.run(run())
+    assert claims["sub"] == "U1"
+    assert stored["ip_address"] == "10.0.0.1" and stored["token"] != token
+    assert isinstance(stored["expires_at"], datetime)
+
+def test_register_login_logout_flow(monkeypatch):
+    monkeypatch.setattr(main_enhanced, "PASSWORDS", PasswordHasher(rounds=4))
+    account = {"username": "meera", "email": "meera@example.com", "password": "pw-123", "full_name": "Meera"}
+    registered = client.post("/api/auth/register", json=account)
+    assert registered.status_code == 200
+    assert client.post("/api/auth/register", json=account).status_code == 409
+
+    assert client.post("/api/auth/login", json={"username": "meera", "password": "nope"}).status_code == 401
+    assert client.post("/api/auth/login", json={"username": "ghost", "password": "pw-123"}).status_code == 401
+    assert client.post("/api/auth/login", json={"username": "meera", "password": "pw-123",
+                                                "role": "admin"}).status_code == 403
+    login = client.post("/api/auth/login", json={"username": "meera@example.com", "password": "pw-123"}).json()
+    assert login["user_id"] == registered.json()["user_id"]
+
+    headers = {"Authorization": f"Bearer {login['token']}"}
+    assert client.get("/api/admin/users", headers=headers).status_code == 403
+    assert client.get("/api/admin/users").status_code == 401
+    assert client.post("/api/auth/logout", headers=headers).status_code == 204
+    assert client.post("/api/auth/logout", headers=headers).status_code == 401
@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+from datetime import datetime, timedelta
+from sla import SLAScheduler, calculate_sla_deadline, get_sla_status, get_sla_statuses
+
+NOW = datetime(2025, 11, 1, 12, 0)
+
+def forward(forward_id, priority_level, created=NOW, status="Pending"):
+    return {
+        "forward_id": forward_id,
+        "priority_level": priority_level,
+        "status": status,
+        "sla_deadline": calculate_sla_deadline(priority_level, created),
+    }
+
+def test_each_priority_uses_its_own_window():
+    # 20 hours into a 24 hour Urgent window is At-Risk; the same age is On-Track for Normal
+    later = NOW + timedelta(hours=20)
+    assert get_sla_status(calculate_sla_deadline("Urgent", NOW), "Urgent", later) == "At-Risk"
+    assert get_sla_status(calculate_sla_deadline("Normal", NOW), "Normal", later) == "On-Track"
+    assert get_sla_status(calculate_sla_deadline("High", NOW), "High", NOW + timedelta(days=3)) == "Breached"
+
+def test_vectorized_statuses_match_scalar():
+    levels = ["Urgent", "High", "Normal", "Unknown"]
+    deadlines = [calculate_sla_deadline(level, NOW) for level in levels]
+    for hours in (1, 20, 60, 150, 200):
+        later = NOW + timedelta(hours=hours)
+        expected = [get_sla_status(d, level, later) for d, level in zip(deadlines, levels)]
+        assert get_sla_statuses(deadlines, levels, later) == expected
+
+def test_scheduler_emits_only_transitions():
+    applied = []
+
+    async def apply(updates):
+        applied.append(sorted(updates))
+
+    scheduler = SLAScheduler(apply)
+    start = NOW.timestamp()
+    scheduler.track(forward("U", "Urgent"), now=start)
+    scheduler.track(forward("N", "Normal"), now=start)
+    scheduler.track(forward("R", "Urgent", status="Resolved"), now=start)
+    assert len(scheduler) == 2
+
+    async def ticks():
+        return [await scheduler.tick(now=start + hours * 3600) for hours in (1, 20, 21, 24, 140, 170)]
+
+    assert asyncio.run(ticks()) == [0, 1, 0, 1, 1, 1]
+    assert applied == [[("U", "At-Risk")], [("U", "Breached")], [("N", "At-Risk")], [("N", "Breached")]]
+    assert len(scheduler) == 0
+
+def test_late_tick_jumps_straight_to_breached():
+    applied = []
+
+    async def apply(updates):
+        applied.extend(updates)
+
+    scheduler = SLAScheduler(apply)
+    scheduler.track(forward("U", "Urgent"), now=NOW.timestamp())
+    asyncio.run(scheduler.tick(now=NOW.timestamp() + 48 * 3600))
+    assert applied == [("U", "Breached")]
+    assert len(scheduler) == 0
+
+def test_background_loop_wakes_for_earlier_deadlines():
+    applied = []
+
+    async def apply(updates):
+        applied.extend(updates)
+
+    async def scenario():
+        scheduler = SLAScheduler(apply, max_sleep=60)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        # Already inside the At-Risk band, due to breach in 50 ms
+        record = forward("U", "Urgent")
+        record["sla_deadline"] = datetime.now() + timedelta(milliseconds=50)
+        scheduler.track(record)
+        await asyncio.sleep(0.3)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert applied == [("U", "Breached")]
+
+def test_failed_updates_are_retried_by_the_background_loop():
+    applied, failures = [], []
+
+    async def apply(updates):
+        if not failures:
+            failures.append(updates)
+            raise RuntimeError("repository unavailable")
+        applied.extend(updates)
+
+    async def scenario():
+        scheduler = SLAScheduler(apply, max_sleep=60, retry_seconds=0.05)
+        record = forward("U", "Urgent")
+        record["sla_deadline"] = datetime.now() - timedelta(seconds=1)
+        # Tracked as of two seconds ago, so its breach is already due
+        scheduler.track(record, now=record["sla_deadline"].timestamp() - 1)
+        scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert failures == [[("U", "Breached")]]
+    assert applied == [("U", "Breached")]
+    assert len(scheduler) == 0 and scheduler.transitions == 1
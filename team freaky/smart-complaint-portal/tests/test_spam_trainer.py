@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ml'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+import json
+
+import numpy as np
+import pytest
+import generate_fixtures
+import train_spam_classifier
+from model_server import SpamModelServer
+
+@pytest.fixture(scope="module")
+def complaints(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("spam") / "complaints.jsonl")
+    generate_fixtures.main(["--output", path, "--count", "3000", "--spam-ratio", "0.1"])
+    return path
+
+def arguments(tmp_path, *inputs, extra=()):
+    return train_spam_classifier.build_parser().parse_args(
+        [*inputs, "--output", str(tmp_path / "model.pkl"), "--vectorizer-output", str(tmp_path / "vectorizer.pkl"),
+         "--n-features", "4096", "--chunk-size", "400", "--checkpoint-every", "2", "--workers", "1", *extra])
+
+def test_parallel_training_matches_serial_and_is_served(complaints, tmp_path):
+    serial = train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--epochs", "2"]))
+    parallel = train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--epochs", "2", "--workers", "2"]))
+    np.testing.assert_allclose(parallel.coef_, serial.coef_)
+    assert not os.path.exists(str(tmp_path / "model.pkl.checkpoint"))
+
+    server = SpamModelServer(str(tmp_path / "model.pkl"), str(tmp_path / "vectorizer.pkl"))
+    spam, ham = server.predict_spam_batch(["Free crypto for the first 100 customers, register here",
+                                           "Street light not working near the metro station"])
+    assert spam > 0.9 and ham < 0.1
+
+def test_resume_continues_where_the_interrupted_run_stopped(complaints, tmp_path, monkeypatch):
+    expected = train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--epochs", "2"])).coef_.copy()
+
+    saves = []
+
+    def crash_after_three(path, state):
+        saves.append(state["chunks"])
+        if len(saves) == 3:
+            raise KeyboardInterrupt
+        real_save(path, state)
+
+    real_save = train_spam_classifier.save_checkpoint
+    monkeypatch.setattr(train_spam_classifier, "save_checkpoint", crash_after_three)
+    with pytest.raises(KeyboardInterrupt):
+        train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--epochs", "2"]))
+    monkeypatch.setattr(train_spam_classifier, "save_checkpoint", real_save)
+
+    resumed = train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--epochs", "2", "--resume"]))
+    np.testing.assert_allclose(resumed.coef_, expected)
+
+def test_update_warm_starts_from_the_deployed_model(complaints, tmp_path):
+    model = train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--epochs", "1"]))
+    seen = model.t_
+    novel = "Exclusive membership perks await, reply with your bank details"
+    assert model.predict_proba(train_spam_classifier.hashing_vectorizer(4096, 2).transform([novel]))[0, 1] < 0.5
+
+    labelled = tmp_path / "labelled.jsonl"
+    labelled.write_text("".join(json.dumps({"complaint_id": f"N{i}", "description": text, "is_spam": spam}) + "\n"
+                                for i, (text, spam) in enumerate([(novel, True), ("Water logging at the bus stand", False)]
+                                                                 * 50)))
+    updated = train_spam_classifier.train(arguments(tmp_path, str(labelled), extra=["--update", "--epochs", "3"]))
+
+    assert updated.t_ > seen  # continued from the trained weights, not refitted
+    vectorizer = train_spam_classifier.hashing_vectorizer(4096, 2)
+    assert updated.predict_proba(vectorizer.transform([novel]))[0, 1] > 0.5
+    assert updated.predict(vectorizer.transform(["Garbage not collected for weeks near the market"]))[0] == 0
+
+def test_update_rejects_mismatched_hashing(complaints, tmp_path):
+    train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--epochs", "1"]))
+    with pytest.raises(SystemExit):
+        train_spam_classifier.train(arguments(tmp_path, complaints, extra=["--update", "--n-features", "8192"]))
+
+def test_rejects_zero_epochs_and_finishes_a_completed_resume(complaints, tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        arguments(tmp_path, complaints, extra=["--epochs", "0"])
+    assert "--epochs: must be at least 1" in capsys.readouterr().err
+
+    args = arguments(tmp_path, complaints, extra=["--epochs", "1", "--resume"])
+    model = train_spam_classifier.train(args)
+    # A checkpoint from a run that finished every epoch but was stopped before cleaning up
+    train_spam_classifier.save_checkpoint(str(tmp_path / "model.pkl.checkpoint"),
+                                          {"model": model, "epoch": 1, "chunks": 0, "rng": np.random.default_rng(0)})
+    resumed = train_spam_classifier.train(args)
+    np.testing.assert_allclose(resumed.coef_, model.coef_)
+    assert not os.path.exists(str(tmp_path / "model.pkl.checkpoint"))
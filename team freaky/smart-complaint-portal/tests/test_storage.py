@@ -0,0 +1,182 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from storage import ComplaintRow, ComplaintStore, ForwardStore
+
+def make_forward(forward_id, complaint_id, cluster_id=None, sla_status="On-Track"):
+    return {
+        "forward_id": forward_id,
+        "complaint_id": complaint_id,
+        "cluster_id": cluster_id,
+        "sla_status": sla_status,
+    }
+
+def test_lookup_by_indexed_fields():
+    store = ForwardStore()
+    store.add(make_forward("F1", "C1", cluster_id="K1"))
+    store.add(make_forward("F2", "C1", sla_status="At-Risk"))
+    store.add(make_forward("F3", "C2", cluster_id="K1"))
+
+    assert [f["forward_id"] for f in store.by_complaint("C1")] == ["F1", "F2"]
+    assert [f["forward_id"] for f in store.by_cluster("K1")] == ["F1", "F3"]
+    assert [f["forward_id"] for f in store.by_sla_status("At-Risk")] == ["F2"]
+    assert store.by_complaint("missing") == []
+    assert len(store) == 3
+
+def test_update_moves_record_between_buckets():
+    store = ForwardStore()
+    store.add(make_forward("F1", "C1"))
+    store.update("F1", sla_status="Breached")
+
+    assert store.by_sla_status("On-Track") == []
+    assert store.by_sla_status("Breached")[0]["forward_id"] == "F1"
+    assert store["F1"]["sla_status"] == "Breached"
+
+def test_replace_and_remove_keep_indexes_consistent():
+    store = ForwardStore()
+    store.add(make_forward("F1", "C1"))
+    store.add(make_forward("F1", "C2"))
+    assert store.by_complaint("C1") == []
+    assert store.count("complaint_id", "C2") == 1
+
+    store.remove("F1")
+    assert "F1" not in store
+    assert store.by_complaint("C2") == []
+
+def test_forward_added_again_after_removal_is_walked_once():
+    store = ForwardStore()
+    for i in range(4):
+        store.add(make_forward(f"F{i}", "C1"))
+    store.remove("F1")
+    store.add(make_forward("F1", "C2"))
+    store.add(make_forward("F2", "C3"))  # replacing keeps the original position
+
+    records, before = store.newest(10)
+    assert [f["forward_id"] for f in records] == ["F1", "F3", "F2", "F0"]
+    assert before == 0
+    assert [f["complaint_id"] for f in store.newest(10, complaint_id="C2")[0]] == ["C2"]
+
+def make_complaint(complaint_id, **fields):
+    created = datetime(2025, 3, 1, 9, 30, 15, 123456)
+    return dict({
+        "complaint_id": complaint_id, "title": "Overflowing drain", "description": "Drain near ward 7 — overflowing",
+        "category": "sanitation", "location": {"lat": 12.9716, "lon": 77.5946}, "attachments": [],
+        "language_tag": "en", "spam_score": 0.03, "predicted_class": "sanitation", "ml_confidence_score": 0.87,
+        "recurrence_flag": False, "cluster_id": None, "duplicate_similarity_score": 0.0,
+        "created_at": created, "updated_at": created, "submitted_by": None,
+    }, **fields)
+
+def test_complaint_store_round_trips_records():
+    store = ComplaintStore()
+    plain = make_complaint("C1")
+    unusual = make_complaint("C2", location={"lat": 1.5, "lon": 2.5, "address": "MG road"}, attachments=["a.jpg"],
+                             created_at=datetime(2025, 3, 1, 9, 0, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+                             spam_score=None, source="import")
+    store.add(plain)
+    store.add(unusual)
+
+    assert store.record("C1") == plain
+    assert store.record("C2") == unusual and store.record("C2")["created_at"].utcoffset() == timedelta(hours=5.5)
+    assert store.record("missing") is None
+    assert len(store) == 2 and "C1" in store and list(store) == ["C1", "C2"]
+    # Interned and packed: one stored copy of each category, scores in float32
+    assert store._columns["category"].values == [None, "sanitation"]
+    assert store._columns["spam_score"].values.itemsize == 4
+
+def test_float_scores_keep_seven_significant_digits():
+    store = ComplaintStore()
+    for i, score in enumerate([1.234567e-8, 0.87, 12345.67, 0.0]):
+        store.add(make_complaint(f"C{i}", duplicate_similarity_score=score, submitted_by=f"USER-{i}"))
+        assert store.record(f"C{i}")["duplicate_similarity_score"] == score
+    assert [r["complaint_id"] for r in store.page(5, submitted_by="USER-2")] == ["C2"]
+
+def test_complaint_rows_are_lazy_views_of_the_store():
+    from main_enhanced import ComplaintResponse
+
+    store = ComplaintStore()
+    store.add(make_complaint("C1"))
+    row = store["C1"]
+    assert isinstance(row, ComplaintRow) and row["cluster_id"] is None and row.get("nope") is None
+    assert ComplaintResponse(**row).ml_confidence_score == 0.87
+
+    later = datetime(2025, 3, 2)
+    store.update("C1", cluster_id="K1", recurrence_flag=True, updated_at=later)
+    assert (row["cluster_id"], row["recurrence_flag"], row["updated_at"]) == ("K1", True, later)
+    store.add(make_complaint("C1", title="Replaced"))
+    assert row["title"] == "Replaced" and row["cluster_id"] is None and len(store) == 1
+    assert dict(store.items())["C1"] == make_complaint("C1", title="Replaced")
+
+def test_listing_order_survives_out_of_order_inserts():
+    rng = random.Random(9)
+    start = datetime(2025, 1, 1)
+    records = [make_complaint(f"C{i:04d}", category=rng.choice(["roads", "water"]),
+                              created_at=start + timedelta(minutes=rng.randrange(300)))
+               for i in range(600)]
+    store = ComplaintStore()
+
+    def newest_first(records):
+        return [r["complaint_id"] for r in sorted(records, key=lambda r: (r["created_at"], r["complaint_id"]),
+                                                  reverse=True)]
+
+    # Single adds with reads in between, then a batch, then updates
+    for i, record in enumerate(records[:200]):
+        store.add(record)
+        if i % 17 == 0:
+            assert [r["complaint_id"] for r in store.page(5)] == newest_first(records[:i + 1])[:5]
+    store.add_many(records[200:])
+    assert not store._by_created._pending
+    moved = records[7]["complaint_id"]
+    store.update(moved, category="water", created_at=start - timedelta(days=1))
+    records[7] = dict(records[7], category="water", created_at=start - timedelta(days=1))
+
+    assert [r["complaint_id"] for r in store.page(len(records))] == newest_first(records)
+    water = [r for r in records if r["category"] == "water"]
+    assert [r["complaint_id"] for r in store.page(len(records), category="water")] == newest_first(water)
+    assert store.count(category="water") == len(water)
+
+def test_flag_updates_only_move_the_row_between_changed_buckets():
+    start = datetime(2025, 1, 1)
+    store = ComplaintStore()
+    store.add_many([make_complaint(f"C{i:03d}", created_at=start + timedelta(minutes=i)) for i in range(50)])
+
+    store.update("C010", recurrence_flag=True, cluster_id="K1", updated_at=start + timedelta(days=1))
+    assert not store._by_created._pending
+    assert not store._indexes["category"]["sanitation"]._pending
+    assert [r["complaint_id"] for r in store.page(50, recurrence_flag=True)] == ["C010"]
+    assert store.count(recurrence_flag=False) == 49
+    assert [r["complaint_id"] for r in store.page(3)] == ["C049", "C048", "C047"]
+
+def test_history_endpoint_uses_forward_index():
+    import asyncio
+    from fastapi.testclient import TestClient
+    from main_enhanced import app, SESSIONS
+
+    client = TestClient(app)
+    token, _ = asyncio.run(SESSIONS.create({"user_id": "USER-001", "role": "user"}))
+    complaint_id = client.post("/api/complaints", json={
+        "title": "Overflowing drain",
+        "description": "Drain overflowing onto the road",
+        "category": "sanitation",
+        "location": {"lat": 12.9, "lon": 77.6},
+    }).json()["complaint_id"]
+    for officer in ("OFF-001", "OFF-002"):
+        response = client.post("/api/complaints/forward",
+            json={
+                "complaint_id": complaint_id,
+                "recipient_department": "Sanitation Dept",
+                "recipient_officer_id": officer,
+                "recipient_officer_name": "Officer",
+                "remarks": "Please check",
+                "follow_up_date": "2025-12-31T10:00:00",
+                "priority_level": "Normal",
+            },
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+
+    history = client.get(f"/api/complaints/{complaint_id}/history").json()
+    assert [f["recipient_officer_id"] for f in history["forward_history"]] == ["OFF-001", "OFF-002"]
@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from users import InMemoryUserRepository, MongoUserRepository, UserExists
+
+def make_mongo():
+    mongomock = pytest.importorskip("mongomock")
+    return MongoUserRepository(collection=mongomock.MongoClient().smartcomplaint.users)
+
+@pytest.fixture(params=["memory", "mongo"])
+def users(request):
+    repository = InMemoryUserRepository() if request.param == "memory" else make_mongo()
+    asyncio.run(repository.ensure_indexes())
+    yield repository
+    asyncio.run(repository.close())
+
+def user(user_id, username, email):
+    now = datetime(2024, 1, 1)
+    return {"user_id": user_id, "username": username, "email": email, "password_hash": "$2b$04$hash",
+            "full_name": username.title(), "phone_number": None, "role": "user", "is_active": True,
+            "created_at": now, "updated_at": now}
+
+def test_username_and_email_are_unique(users):
+    async def run():
+        await users.create_user(user("U1", "asha", "asha@example.com"))
+        for duplicate in (user("U2", "asha", "other@example.com"), user("U3", "ravi", "asha@example.com")):
+            with pytest.raises(UserExists):
+                await users.create_user(duplicate)
+        await users.create_user(user("U4", "ravi", "ravi@example.com"))
+        with pytest.raises(UserExists):
+            await users.update_user("U4", email="asha@example.com")
+        return await users.count_users()
+
+    assert asyncio.run(run()) == 2
+
+def test_concurrent_registrations_of_one_username_admit_one(users):
+    async def run():
+        attempts = [users.create_user(user(f"U{i}", "asha", f"asha{i}@example.com")) for i in range(8)]
+        return await asyncio.gather(*attempts, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert results.count(None) == 1
+    assert all(isinstance(r, UserExists) for r in results if r is not None)
+
+def test_lookups_project_fields(users):
+    async def run():
+        await users.create_user(user("U1", "asha", "asha@example.com"))
+        return (await users.find_by_login("asha"), await users.find_by_login("asha@example.com"),
+                await users.find_by_login("nobody"), await users.get_user("U1"))
+
+    by_username, by_email, missing, public = asyncio.run(run())
+    assert by_username == by_email
+    assert by_username["password_hash"] == "$2b$04$hash" and "_id" not in by_username
+    assert missing is None
+    assert "password_hash" not in public and public["username"] == "asha"
+
+def test_mongo_indexes_are_unique():
+    users = make_mongo()
+    asyncio.run(users.ensure_indexes())
+    indexes = users.collection().index_information()
+    assert indexes["uniq_username"]["unique"] and indexes["uniq_email"]["unique"]
+
+def test_keyset_pages_cover_every_user_once(users):
+    base = datetime(2024, 1, 1)
+
+    async def run():
+        for i in range(25):
+            record = user(f"U{i:02d}", f"user{i}", f"user{i}@example.com")
+            record["created_at"] = base.replace(minute=i // 2)  # pairs share a created_at
+            record["role"] = "volunteer" if i % 3 == 0 else "user"
+            record["volunteer_status"] = "active" if i % 6 == 0 else None
+            await users.create_user(record)
+        pages, after = [], None
+        while True:
+            page = await users.list_users(7, after)
+            pages.append(page)
+            if len(page) < 7:
+                break
+            after = (page[-1]["created_at"], page[-1]["user_id"])
+        active = await users.list_users(100, role="volunteer", volunteer_status="active")
+        return pages, active, await users.count_users(role="volunteer")
+
+    pages, active, volunteers = asyncio.run(run())
+    listed = [u["user_id"] for page in pages for u in page]
+    assert listed == [f"U{i:02d}" for i in reversed(range(25))]
+    assert all("password_hash" not in u for page in pages for u in page)
+    assert [u["user_id"] for u in active] == ["U24", "U18", "U12", "U06", "U00"]
+    assert volunteers == 9